@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the 3DGS evaluation pipeline.
+
+Usage:
+    python benchmark.py iqa                      # Views/sec for BRISQUE and MANIQA, per-image vs. batched (CPU)
+    python benchmark.py iqa --batch-sizes 1 4 16 # Sweep batch sizes
+    python benchmark.py startup                  # Import time of evaluate.py (python -X importtime)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import yaml
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def benchmark_iqa(args, config: Dict):
+    """Compare one forward pass per view with batched inference for the pyiqa metrics."""
+    from src.metrics.cv_metrics import BRISQUEMetric, MANIQAMetric
+    from src.metrics.frame_cache import FrameCache
+
+    view_dir = Path(config.get("capture", {}).get("output_dir", "captured_views"))
+    view_paths = sorted(view_dir.glob(f"{args.render or '*'}/*.png"))[:args.max_views]
+    if not view_paths:
+        print(f"No captured views found under {view_dir}. Run evaluate.py first.")
+        return
+
+    # Decode every view up front so only inference is measured
+    frame_cache = FrameCache(max_frames=len(view_paths))
+    for path in view_paths:
+        frame_cache.tensor(path)
+    print(f"{len(view_paths)} views from {view_dir}\n")
+
+    for name, metric_cls in [("brisque", BRISQUEMetric), ("maniqa", MANIQAMetric)]:
+        metric = metric_cls(frame_cache=frame_cache)
+        # Warm up so one-time initialization is not measured
+        metric.compute_quality_score(view_paths[0])
+
+        start_time = time.time()
+        per_image = [metric.compute_quality_score(path) for path in view_paths]
+        per_image_seconds = time.time() - start_time
+        print(f"  {name} per-image: {len(view_paths) / per_image_seconds:.1f} views/sec ({per_image_seconds:.2f}s)")
+
+        for batch_size in args.batch_sizes:
+            metric.batch_size = batch_size
+            start_time = time.time()
+            batched = metric.compute_quality_scores(view_paths)
+            seconds = time.time() - start_time
+            # MANIQA scores random crops, so its scores differ between runs even unbatched
+            diff = np.nanmax(np.abs(np.array(per_image, dtype=float) - np.array(batched, dtype=float)))
+            print(
+                f"  {name} batch={batch_size}: {len(view_paths) / seconds:.1f} views/sec ({seconds:.2f}s), "
+                f"{per_image_seconds / seconds:.1f}x, max |diff| {diff:.3f}"
+            )
+        print()
+
+
+# Packages whose import cost dominates start-up
+HEAVY_MODULES = ["torch", "pyiqa", "openai", "playwright", "skimage"]
+
+
+def benchmark_startup(args, config: Dict):
+    """Report what importing the CLI costs before any backend is used."""
+    # The import-time report lives at the repository root, shared with the semantic-label benchmarks
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from importtime_report import print_import_report
+
+    print(f"import {args.module}\n")
+    print_import_report(f"import {args.module}", Path(__file__).parent, HEAVY_MODULES, args.top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="3DGS evaluation benchmarks")
+    parser.add_argument("--config", default="config.yaml", help="Path to configuration file")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    iqa_parser = subparsers.add_parser("iqa", help="Batched BRISQUE/MANIQA inference throughput")
+    iqa_parser.add_argument("--render", help="Render name under the screenshots directory (default: all)")
+    iqa_parser.add_argument("--max-views", type=int, default=24)
+    iqa_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+
+    startup_parser = subparsers.add_parser("startup", help="Import time of the CLI (python -X importtime)")
+    startup_parser.add_argument("--module", default="evaluate", help="Module to import (default: evaluate)")
+    startup_parser.add_argument("--top", type=int, default=10, help="Packages to list")
+
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    if args.benchmark == "iqa":
+        benchmark_iqa(args, config)
+    elif args.benchmark == "startup":
+        benchmark_startup(args, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ Usage:
     python evaluate.py --skip-capture           # Use existing captured views
     python evaluate.py --metrics cv             # Use only CV metrics
     python evaluate.py --metrics vlm            # Use only VLM metrics
+    python evaluate.py --viewer-dir DIR --offline  # Capture from a local viewer and cached assets
+    python evaluate.py --skip-capture --dry-run # List metric values that would be recomputed
 """
 
 import argparse
@@ -56,8 +58,14 @@ def parse_args():
         # Use only VLM metrics (requires OPENAI_API_KEY)
         python evaluate.py --metrics vlm
         
+        # Capture offline from a local viewer build and cached scene assets
+        python evaluate.py --viewer-dir ../viewer/dist --offline
+        
         # Evaluate specific URL
         python evaluate.py --url https://example.com/viewer --name "My Render"
+        
+        # Show which views and metrics a re-run would recompute
+        python evaluate.py --skip-capture --dry-run
         """
     )
     
@@ -111,6 +119,24 @@ def parse_args():
         help="Skip report generation"
     )
     
+    parser.add_argument(
+        "--viewer-dir",
+        type=str,
+        help="Serve a local build of the 3DGS viewer and capture from it instead of the hosted viewer"
+    )
+    
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Capture without network access; scene assets must already be in the asset cache"
+    )
+    
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the per-view metric values that would be recomputed for existing views, then exit"
+    )
+    
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -123,33 +149,51 @@ def parse_args():
 import http.server
 import socketserver
 import threading
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
+
+
+class ReusableTCPServer(socketserver.ThreadingTCPServer):
+    """Threading server that can rebind a port still in TIME_WAIT from a previous run."""
+    allow_reuse_address = True
+
 
 @contextmanager
-def serve_file(file_path: Path):
-    """Serve a file directory temporarily."""
-    port = 8086
-    dirname = file_path.parent
-    
+def serve_directory(directory: Path, port: int = 8086):
+    """Serve a directory over HTTP temporarily. Yields the base URL."""
     class Handler(http.server.SimpleHTTPRequestHandler):
         def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory=str(dirname), **kwargs)
+            super().__init__(*args, directory=str(directory), **kwargs)
             
         def log_message(self, format, *args):
             pass  # Silence logs
-            
-    httpd = socketserver.TCPServer(("", port), Handler)
+    
+    httpd = ReusableTCPServer(("", port), Handler)
     server_thread = threading.Thread(target=httpd.serve_forever, daemon=True)
     server_thread.start()
     
     try:
-        url = f"http://localhost:{port}/{file_path.name}"
-        yield url
+        yield f"http://localhost:{port}"
     finally:
         httpd.shutdown()
         httpd.server_close()
 
 
+@contextmanager
+def serve_file(file_path: Path):
+    """Serve a file directory temporarily."""
+    with serve_directory(file_path.parent) as base_url:
+        yield f"{base_url}/{file_path.name}"
+
+
+def with_origin(url: str, base_url: str) -> str:
+    """Point a viewer URL at another origin, keeping its path and query."""
+    from urllib.parse import urlparse
+    
+    parsed = urlparse(url)
+    base = urlparse(base_url)
+    return parsed._replace(scheme=base.scheme, netloc=base.netloc).geturl()
+
+
 async def main():
     """Main CLI entry point."""
     args = parse_args()
@@ -185,11 +229,30 @@ async def main():
     if args.output_dir:
         config["output"]["results_dir"] = args.output_dir
     
+    # Offline capture: scene assets only come from the asset cache
+    if args.offline:
+        asset_cache_config = config["capture"].setdefault("asset_cache", {})
+        asset_cache_config["enabled"] = True
+        asset_cache_config["offline"] = True
+        if not args.viewer_dir:
+            logger.warning("--offline without --viewer-dir: the hosted viewer page will be blocked")
+    
+    # Serve a local viewer build and point every render at it
+    servers = ExitStack()
+    if args.viewer_dir:
+        base_url = servers.enter_context(serve_directory(Path(args.viewer_dir)))
+        logger.info(f"Serving local viewer from {args.viewer_dir} at {base_url}")
+        for render in config.get("renders", []):
+            render["url"] = with_origin(render["url"], base_url)
+        if args.url:
+            args.url = with_origin(args.url, base_url)
+    
     # Save modified config temporarily
     temp_config_path = Path("temp_config.yaml")
     with open(temp_config_path, "w") as f:
         yaml.dump(config, f)
     
+    evaluator = None
     try:
         # Initialize evaluator
         logger.info("Initializing evaluator...")
@@ -197,6 +260,32 @@ async def main():
             config_path=str(temp_config_path)
         )
         
+        # Plan only: compare existing views against the metric ledger and the VLM judgement cache
+        if args.dry_run:
+            if args.url:
+                render_names = [args.name or "custom_render"]
+            elif args.run is not None:
+                renders = config.get("renders", [])
+                if args.run < 1 or args.run > len(renders):
+                    logger.error(f"Invalid run number: {args.run}. Must be 1-{len(renders)}")
+                    return 1
+                render_names = [renders[args.run - 1]["name"]]
+            else:
+                render_names = [render["name"] for render in config.get("renders", [])]
+            
+            print("\n" + "="*60)
+            print("DRY RUN: values to recompute")
+            print("="*60)
+            for name in render_names:
+                plan = evaluator.plan_render(name)
+                print(f"{name} ({plan['num_views']} views)")
+                for metric, view_files in plan["recompute"].items():
+                    print(f"  {metric}: {len(view_files)}/{plan['num_views']} views")
+                    for view_file in view_files:
+                        logger.debug(f"    {view_file}")
+            print("="*60 + "\n")
+            return 0
+        
         # Evaluate
         if args.url:
             # Evaluate direct URL
@@ -271,6 +360,10 @@ async def main():
         return 0
         
     finally:
+        if evaluator is not None:
+            await evaluator.close()
+        servers.close()
+        
         # Clean up temp config
         if temp_config_path.exists():
             temp_config_path.unlink()
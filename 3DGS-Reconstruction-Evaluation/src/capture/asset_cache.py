@@ -0,0 +1,163 @@
+"""
+On-disk cache for large 3DGS scene assets requested during capture.
+Intercepts .glb/.ksplat (and similar) requests in a browser context,
+serves them from disk when cached and stores them on first download.
+In offline mode, requests that cannot be served locally are aborted.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_EXTENSIONS = [".glb", ".ksplat", ".splat", ".ply"]
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+class AssetCache:
+    """URL-indexed, content-addressed store of scene assets with Playwright route interception."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "cache/assets",
+        extensions: Optional[List[str]] = None,
+        offline: bool = False
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for asset files and the URL index
+            extensions: File extensions to intercept
+            offline: Abort every non-local request that is not cached
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.extensions = extensions or DEFAULT_EXTENSIONS
+        self.offline = offline
+
+        suffixes = "|".join(re.escape(ext.lstrip(".")) for ext in self.extensions)
+        self.pattern = re.compile(rf"\.({suffixes})(\?.*)?$", re.IGNORECASE)
+
+        self.stats = {"hits": 0, "misses": 0, "bytes_served": 0, "bytes_downloaded": 0, "blocked": 0}
+        self._index: Dict[str, Dict] = self._load_index()
+        self._url_locks: Dict[str, asyncio.Lock] = {}
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def cached_path(self, url: str) -> Optional[Path]:
+        """Local file for a URL, if cached."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        path = self.cache_dir / entry["file"]
+        return path if path.exists() else None
+
+    def _write_asset(self, url: str, body: bytes) -> Path:
+        # Hashes and writes assets of hundreds of MB, so callers run it in a worker thread.
+        # It only touches the content-addressed file; the index is updated on the event loop.
+        digest = hashlib.sha256(body).hexdigest()
+        suffix = Path(urlparse(url).path).suffix
+        path = self.cache_dir / f"{digest}{suffix}"
+        if not path.exists():
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+        return path
+
+    async def _store(self, url: str, body: bytes, content_type: str) -> Path:
+        path = await asyncio.to_thread(self._write_asset, url, body)
+        # Back on the event loop, so concurrent downloads never update the index at once
+        self._index[url] = {"file": path.name, "size": len(body), "content_type": content_type}
+        self._save_index()
+        return path
+
+    async def _serve_from_disk(self, route: Route, url: str, path: Path):
+        entry = self._index[url]
+        self.stats["hits"] += 1
+        self.stats["bytes_served"] += entry["size"]
+        await route.fulfill(
+            path=str(path),
+            headers={
+                "Content-Type": entry.get("content_type", "application/octet-stream"),
+                "Access-Control-Allow-Origin": "*"
+            }
+        )
+
+    async def _handle_asset(self, route: Route):
+        url = route.request.url
+        lock = self._url_locks.setdefault(url, asyncio.Lock())
+
+        # Concurrent pages asking for the same asset wait for a single download
+        async with lock:
+            path = self.cached_path(url)
+            if path is not None:
+                await self._serve_from_disk(route, url, path)
+                return
+
+            if self.offline:
+                logger.error(f"Offline and not cached: {url}")
+                self.stats["blocked"] += 1
+                await route.abort("internetdisconnected")
+                return
+
+            logger.info(f"Downloading asset into cache: {url}")
+            response = await route.fetch()
+            body = await response.body()
+            # Only complete bodies are cached; response.ok also covers partial (206) responses
+            if response.status == 200:
+                await self._store(url, body, response.headers.get("content-type", "application/octet-stream"))
+                self.stats["misses"] += 1
+                self.stats["bytes_downloaded"] += len(body)
+            await route.fulfill(response=response, body=body)
+
+    async def _handle_offline(self, route: Route):
+        host = urlparse(route.request.url).hostname
+        if host in LOCAL_HOSTS:
+            await route.continue_()
+            return
+        if self.pattern.search(urlparse(route.request.url).path):
+            await self._handle_asset(route)
+            return
+        self.stats["blocked"] += 1
+        await route.abort("internetdisconnected")
+
+    async def attach(self, context: BrowserContext):
+        """Intercept asset requests (and, offline, all remote requests) in a browser context."""
+        if self.offline:
+            await context.route("**/*", self._handle_offline)
+        else:
+            await context.route(lambda url: bool(self.pattern.search(urlparse(url).path)), self._handle_asset)
+
+
+def asset_cache_from_config(capture_config: Dict) -> Optional[AssetCache]:
+    """Cache as configured under `capture.asset_cache`, or None when disabled."""
+    cache_config = capture_config.get("asset_cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+    return AssetCache(
+        cache_dir=cache_config.get("cache_dir", "cache/assets"),
+        extensions=cache_config.get("extensions"),
+        offline=cache_config.get("offline", False)
+    )
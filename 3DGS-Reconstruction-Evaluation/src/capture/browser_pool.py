@@ -0,0 +1,112 @@
+"""
+Shared Chromium pool for view capture.
+Launches one browser and hands out isolated browser contexts, with at
+most N contexts open at a time.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+
+LAUNCH_ARGS = [
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-gpu',
+    '--use-gl=swiftshader'
+]
+
+
+class BrowserPool:
+    """One headless Chromium with a bounded number of concurrent contexts."""
+
+    def __init__(
+        self,
+        max_contexts: int = 3,
+        headless: bool = True,
+        launch_args: Optional[List[str]] = None
+    ):
+        """
+        Initialize pool. The browser is launched on first use.
+
+        Args:
+            max_contexts: Maximum number of browser contexts open at once
+            headless: Run Chromium headless
+            launch_args: Chromium command-line flags
+        """
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else LAUNCH_ARGS
+
+        self.stats = {"launches": 0, "contexts_opened": 0, "peak_contexts": 0}
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._open_contexts = 0
+
+    async def start(self) -> Browser:
+        """Launch the browser if it is not running yet."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_contexts)
+
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                logger.info(f"Launching Chromium (max {self.max_contexts} contexts)")
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=self.launch_args
+                )
+                self.stats["launches"] += 1
+        return self._browser
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator[BrowserContext]:
+        """
+        Open an isolated browser context, waiting for a free slot.
+
+        Args:
+            **context_options: Options for `Browser.new_context` (e.g. viewport)
+        """
+        browser = await self.start()
+
+        async with self._slots:
+            context = await browser.new_context(**context_options)
+            self._open_contexts += 1
+            self.stats["contexts_opened"] += 1
+            self.stats["peak_contexts"] = max(self.stats["peak_contexts"], self._open_contexts)
+            try:
+                yield context
+            finally:
+                self._open_contexts -= 1
+                await context.close()
+
+    async def close(self):
+        """Close the browser and stop Playwright."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._start_lock = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+def browser_pool_from_config(config: Dict) -> BrowserPool:
+    """Pool sized by `capture.max_contexts`."""
+    return BrowserPool(max_contexts=config.get("capture", {}).get("max_contexts", 3))
@@ -0,0 +1,86 @@
+"""
+Camera poses encoded in 3DGS viewer URLs.
+The viewer reads the camera position (px, py, pz) and target (tx, ty, tz)
+from its query string, so an exact orbit pose can be requested per view.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import numpy as np
+
+
+POSITION_KEYS = ("px", "py", "pz")
+TARGET_KEYS = ("tx", "ty", "tz")
+
+
+class CameraPose:
+    """Camera position and look-at target."""
+
+    def __init__(self, position: np.ndarray, target: np.ndarray):
+        self.position = np.asarray(position, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+
+    def to_dict(self) -> Dict:
+        return {
+            "position": [float(v) for v in self.position],
+            "target": [float(v) for v in self.target]
+        }
+
+
+def parse_pose(url: str) -> Optional[CameraPose]:
+    """Read the camera pose from a viewer URL, or None if it does not carry one."""
+    params = dict(parse_qsl(urlparse(url).query))
+    try:
+        position = [float(params[k]) for k in POSITION_KEYS]
+        target = [float(params[k]) for k in TARGET_KEYS]
+    except (KeyError, ValueError):
+        return None
+    return CameraPose(np.array(position), np.array(target))
+
+
+def rotation_matrix(axis: str, degrees: float) -> np.ndarray:
+    """Rotation about a coordinate axis ("x", "y" or "z")."""
+    theta = math.radians(degrees)
+    c, s = math.cos(theta), math.sin(theta)
+    if axis == "x":
+        return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+    if axis == "y":
+        return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+    if axis == "z":
+        return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+    raise ValueError(f"Unknown rotation axis: {axis}")
+
+
+def orbit_pose(base: CameraPose, degrees: float, axis: str = "y") -> CameraPose:
+    """Orbit the camera around its target by an angle, as an orbit-controls drag would."""
+    offset = base.position - base.target
+    return CameraPose(base.target + rotation_matrix(axis, degrees) @ offset, base.target.copy())
+
+
+def orbit_poses(base: CameraPose, num_views: int, axis: str = "y") -> List[Tuple[float, CameraPose]]:
+    """(angle, pose) for num_views evenly spaced orbit angles, starting at the base pose."""
+    step = 360 / num_views
+    return [(i * step, orbit_pose(base, i * step, axis)) for i in range(num_views)]
+
+
+def with_pose(url: str, pose: CameraPose, precision: int = 4) -> str:
+    """Viewer URL with its camera parameters replaced by a pose."""
+    parsed = urlparse(url)
+    params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    for keys, values in [(POSITION_KEYS, pose.position), (TARGET_KEYS, pose.target)]:
+        for key, value in zip(keys, values):
+            params[key] = f"{value:.{precision}f}"
+    # Keep ':' and '/' readable in nested asset URLs
+    return urlunparse(parsed._replace(query=urlencode(params, safe=":/")))
+
+
+if __name__ == "__main__":
+    url = (
+        "https://3d-tour-demo-scene.vercel.app/?model=https://example.com/scene.glb"
+        "&splat=https://example.com/scene.ksplat&px=-3.5&py=0.082&pz=0.38&tx=-2.56&ty=0.007&tz=-0.218"
+    )
+    base = parse_pose(url)
+    for angle, pose in orbit_poses(base, 4):
+        print(f"{angle:5.1f}° -> {with_pose(url, pose)}")
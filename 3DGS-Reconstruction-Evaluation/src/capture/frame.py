@@ -0,0 +1,93 @@
+"""
+In-memory captured frames handed from capture to the metrics.
+A frame keeps the PNG bytes exactly as the browser produced them, decodes
+them at most once, and writes them to disk as an optional side output.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+
+class Frame:
+    """A captured view: the browser's PNG bytes plus a lazily decoded pixel buffer."""
+
+    def __init__(self, encoded: bytes, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize frame.
+
+        Args:
+            encoded: PNG bytes returned by the screenshot
+            path: Where the PNG is (or will be) persisted
+        """
+        self.encoded = encoded
+        self.path = Path(path) if path is not None else None
+        self.saved = False
+        self._bgr: Optional[np.ndarray] = None
+        self._decode_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.path.name if self.path is not None else "frame.png"
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """Decoded BGR pixels (OpenCV channel order), decoded on first access."""
+        with self._decode_lock:
+            if self._bgr is None:
+                self._bgr = cv2.imdecode(np.frombuffer(self.encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if self._bgr is None:
+                    raise ValueError(f"Could not decode frame: {self.name}")
+        return self._bgr
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """Decoded RGB pixels (a view of the BGR buffer)."""
+        return self.bgr[..., ::-1]
+
+    def release(self):
+        """Drop the decoded pixels; the PNG bytes are kept and decoded again on next access."""
+        with self._decode_lock:
+            self._bgr = None
+
+    def save(self):
+        """Write the original PNG bytes to `path`, without re-encoding."""
+        if self.path is None:
+            raise ValueError("Frame has no output path")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(self.encoded)
+        self.saved = True
+
+    async def save_async(self):
+        """Write the PNG in a worker thread so capture can continue."""
+        await asyncio.to_thread(self.save)
+
+    def __repr__(self) -> str:
+        return f"Frame({self.name}, {len(self.encoded)} bytes)"
+
+
+ImageInput = Union[str, Path, Frame]
+
+
+def image_name(image: ImageInput) -> str:
+    """File name of a frame or image path, used to match results to views."""
+    return image.name if isinstance(image, Frame) else Path(image).name
+
+
+def image_bytes(image: ImageInput) -> bytes:
+    """Encoded bytes of a frame or image file."""
+    return image.encoded if isinstance(image, Frame) else Path(image).read_bytes()
+
+
+def load_bgr(image: ImageInput) -> np.ndarray:
+    """BGR pixels of a frame (already decoded) or image file."""
+    if isinstance(image, Frame):
+        return image.bgr
+    bgr = cv2.imread(str(image))
+    if bgr is None:
+        raise ValueError(f"Could not load image: {image}")
+    return bgr
@@ -0,0 +1,172 @@
+"""
+Frame-stability readiness detection for 3DGS viewers.
+Samples low-resolution frames from the page and declares the view ready
+once consecutive frames stop changing, instead of sleeping a fixed time.
+A frame only counts as ready once enough of it differs from the background,
+so an empty canvas before the splats load is not mistaken for a stable view.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+
+def content_fraction(frame: np.ndarray, tolerance: float = 8.0) -> float:
+    """Fraction of pixels that differ from the frame's background (its median gray level)."""
+    return float(np.mean(np.abs(frame - np.median(frame)) > tolerance))
+
+
+class FrameStabilityDetector:
+    """Waits until the rendered frame stops changing, up to a maximum wait."""
+
+    def __init__(
+        self,
+        sample_width: int = 160,
+        threshold: float = 1.0,
+        consecutive: int = 2,
+        interval: float = 0.2,
+        min_wait: float = 0.0,
+        max_wait: float = 10.0,
+        min_content: float = 0.02
+    ):
+        """
+        Initialize detector.
+
+        Args:
+            sample_width: Width in pixels of the grayscale frames compared
+            threshold: Mean absolute pixel difference (0-255) below which two frames match
+            consecutive: Matching frame pairs required in a row
+            interval: Seconds between samples
+            min_wait: Seconds to wait before the view may be declared stable
+            max_wait: Seconds after which the view is used even if still changing
+            min_content: Fraction of non-background pixels a frame needs before it can be stable
+        """
+        self.sample_width = sample_width
+        self.threshold = threshold
+        self.consecutive = consecutive
+        self.interval = interval
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.min_content = min_content
+
+    async def _sample(self, page: Page, cdp) -> np.ndarray:
+        """Capture a small grayscale frame."""
+        if cdp is not None:
+            # Let Chromium render the screenshot at low resolution directly
+            viewport = page.viewport_size
+            result = await cdp.send("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": 70,
+                "clip": {
+                    "x": 0,
+                    "y": 0,
+                    "width": viewport["width"],
+                    "height": viewport["height"],
+                    "scale": self.sample_width / viewport["width"]
+                }
+            })
+            data = base64.b64decode(result["data"])
+        else:
+            data = await page.screenshot(type="jpeg", quality=70)
+
+        image = Image.open(io.BytesIO(data)).convert("L")
+        if image.width != self.sample_width:
+            height = max(1, round(image.height * self.sample_width / image.width))
+            image = image.resize((self.sample_width, height), Image.BILINEAR)
+        return np.asarray(image, dtype=np.float32)
+
+    async def wait_until_stable(
+        self,
+        page: Page,
+        min_wait: Optional[float] = None,
+        max_wait: Optional[float] = None
+    ) -> Dict:
+        """
+        Sample frames until they are stable or max_wait is reached.
+
+        Args:
+            page: Page showing the viewer
+            min_wait: Override for the minimum wait in seconds
+            max_wait: Override for the maximum wait in seconds
+
+        Returns:
+            Dictionary with waited_seconds, stable flag, sample count, last frame difference
+            and content fraction of the last frame
+        """
+        min_wait = self.min_wait if min_wait is None else min_wait
+        max_wait = self.max_wait if max_wait is None else max_wait
+
+        try:
+            cdp = await page.context.new_cdp_session(page)
+        except Exception:
+            cdp = None
+
+        start = time.time()
+        previous = None
+        matches = 0
+        samples = 0
+        diff = None
+        content = None
+        stable = False
+
+        try:
+            while True:
+                frame = await self._sample(page, cdp)
+                samples += 1
+                elapsed = time.time() - start
+
+                if previous is not None and previous.shape == frame.shape:
+                    diff = float(np.mean(np.abs(frame - previous)))
+                    matches = matches + 1 if diff < self.threshold else 0
+                previous = frame
+                content = content_fraction(frame)
+
+                # An unchanging blank canvas is not a loaded scene
+                if matches >= self.consecutive and elapsed >= min_wait and content >= self.min_content:
+                    stable = True
+                    break
+                if elapsed >= max_wait:
+                    if content < self.min_content:
+                        logger.warning(
+                            f"Frame still looks blank after {max_wait:.1f}s ({content:.1%} content), capturing anyway"
+                        )
+                    else:
+                        logger.warning(f"Frame still changing after {max_wait:.1f}s (diff {diff}), capturing anyway")
+                    break
+
+                await asyncio.sleep(self.interval)
+        finally:
+            if cdp is not None:
+                await cdp.detach()
+
+        return {
+            "waited_seconds": time.time() - start,
+            "stable": stable,
+            "samples": samples,
+            "last_diff": diff,
+            "content": content
+        }
+
+
+def readiness_detector_from_config(capture_config: Dict) -> Optional[FrameStabilityDetector]:
+    """Detector as configured under `capture.readiness`, or None for fixed sleeps."""
+    readiness_config = capture_config.get("readiness", {})
+    if not readiness_config.get("enabled", True):
+        return None
+    return FrameStabilityDetector(
+        sample_width=readiness_config.get("sample_width", 160),
+        threshold=readiness_config.get("threshold", 1.0),
+        consecutive=readiness_config.get("consecutive", 2),
+        interval=readiness_config.get("interval_ms", 200) / 1000,
+        max_wait=readiness_config.get("view_max_wait", 5.0),
+        min_content=readiness_config.get("min_content", 0.02)
+    )
@@ -7,11 +7,17 @@ import asyncio
 import json
 import math
 from pathlib import Path
-from typing import Dict, List, Optional
-from playwright.async_api import async_playwright, Page, Browser
+from typing import Dict, List, Optional, Tuple
+from playwright.async_api import Page
 from PIL import Image
 import logging
 
+from src.capture.browser_pool import BrowserPool, browser_pool_from_config
+from src.capture.readiness import readiness_detector_from_config
+from src.capture.asset_cache import asset_cache_from_config
+from src.capture.frame import Frame
+from src.capture.camera_pose import CameraPose, orbit_poses, parse_pose, with_pose
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -19,12 +25,13 @@ logger = logging.getLogger(__name__)
 class ViewCapturer:
     """Captures multiple views from 3DGS web viewer by rotating camera."""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, browser_pool: Optional[BrowserPool] = None):
         """
         Initialize view capturer with configuration.
         
         Args:
             config: Configuration dictionary with capture settings
+            browser_pool: Shared browser pool (created from config if not given)
         """
         self.config = config
         self.capture_config = config.get("capture", {})
@@ -34,6 +41,23 @@ class ViewCapturer:
         self.viewport_height = self.capture_config.get("viewport_height", 1080)
         self.output_dir = Path(self.capture_config.get("output_dir", "captured_views"))
         self.timeout = self.capture_config.get("timeout", 60000)  # Default 60s timeout
+        self.render_timeout = self.capture_config.get("render_timeout", 600)  # Seconds per render
+        self.capture_mode = self.capture_config.get("mode", "drag")  # "drag" or "pose"
+        self.rotation_axis = self.capture_config.get("rotation_axis", "y")
+        self.pose_parallel_pages = self.capture_config.get("pose_parallel_pages", 4)
+        
+        # Scene assets (.glb/.ksplat) are served from disk after the first download
+        self.asset_cache = asset_cache_from_config(self.capture_config)
+        self.browser_pool = browser_pool or browser_pool_from_config(config)
+        
+        # Wait for the frame to stop changing instead of fixed sleeps
+        self.readiness = readiness_detector_from_config(self.capture_config)
+        readiness_config = self.capture_config.get("readiness", {})
+        self.initial_min_wait = readiness_config.get("initial_min_wait", 0.5)
+        self.initial_max_wait = readiness_config.get("initial_max_wait", 30.0)
+        
+        # PNGs are a side output; metrics consume the in-memory frames
+        self.save_screenshots = config.get("output", {}).get("save_screenshots", True)
         
     async def capture_views(
         self, 
@@ -42,7 +66,7 @@ class ViewCapturer:
         output_subdir: Optional[str] = None
     ) -> List[Dict]:
         """
-        Capture multiple views from a 3DGS render.
+        Capture multiple views from a 3DGS render and save them as PNGs.
         
         Args:
             render_name: Name identifier for this render
@@ -52,74 +76,214 @@ class ViewCapturer:
         Returns:
             List of dictionaries containing view metadata and file paths
         """
+        views, _ = await self.capture_frames(render_name, url, output_subdir, save=True)
+        return views
+    
+    async def capture_frames(
+        self, 
+        render_name: str, 
+        url: str,
+        output_subdir: Optional[str] = None,
+        save: Optional[bool] = None
+    ) -> Tuple[List[Dict], List[Frame]]:
+        """
+        Capture multiple views from a 3DGS render as in-memory frames.
+        
+        Args:
+            render_name: Name identifier for this render
+            url: URL of the 3DGS viewer
+            output_subdir: Optional subdirectory for outputs
+            save: Write PNGs in the background (defaults to output.save_screenshots)
+            
+        Returns:
+            Tuple of (view metadata, frames in view order)
+        """
+        save = self.save_screenshots if save is None else save
+        pending_writes: List[asyncio.Task] = []
+        
         output_path = self.output_dir / (output_subdir or render_name)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        views = []
+        base_pose = None
+        if self.capture_mode == "pose":
+            base_pose = parse_pose(url)
+            if base_pose is None:
+                logger.warning(f"{render_name}: URL carries no camera pose, falling back to drag capture")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-web-security', 
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-gpu',
-                    '--use-gl=swiftshader'
-                ]
-            )
-            page = await browser.new_page(
+        try:
+            async with self.browser_pool.context(
                 viewport={"width": self.viewport_width, "height": self.viewport_height}
-            )
+            ) as context:
+                if self.asset_cache is not None:
+                    await self.asset_cache.attach(context)
+                writes = pending_writes if save else None
+                if base_pose is not None:
+                    capture = self._capture_poses(context, render_name, url, base_pose, output_path, writes)
+                else:
+                    page = await context.new_page()
+                    capture = self._capture_on_page(page, render_name, url, output_path, writes)
+                # Bound the whole render, not just individual navigation steps
+                captured = await asyncio.wait_for(capture, timeout=self.render_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Capture for {render_name} timed out after {self.render_timeout}s")
+            raise
+        except Exception as e:
+            logger.error(f"Error capturing views for {render_name}: {e}")
+            raise
+        finally:
+            # Let background PNG writes finish (or fail) before returning
+            await asyncio.gather(*pending_writes, return_exceptions=True)
+        
+        views = [view for view, _ in captured]
+        frames = [frame for _, frame in captured]
+        
+        total_wait = sum(v["ready_wait_seconds"] for v in views)
+        logger.info(f"[{render_name}] Waited {total_wait:.1f}s in total for frames to settle")
+        
+        # Save metadata alongside the PNGs, so --skip-capture can reuse them
+        if save:
+            metadata_path = output_path / "views_metadata.json"
+            with open(metadata_path, "w") as f:
+                json.dump(views, f, indent=2)
+        
+        logger.info(f"Captured {len(views)} views for {render_name}")
+        
+        return views, frames
+    
+    async def _screenshot(
+        self,
+        page: Page,
+        screenshot_path: Path,
+        pending_writes: Optional[List[asyncio.Task]]
+    ) -> Frame:
+        """Take a screenshot into memory, scheduling the PNG write if requested."""
+        data = await page.screenshot(full_page=False, timeout=self.timeout)
+        frame = Frame(data, screenshot_path)
+        if pending_writes is not None:
+            pending_writes.append(asyncio.create_task(frame.save_async()))
+        return frame
+    
+    async def _capture_on_page(
+        self,
+        page: Page,
+        render_name: str,
+        url: str,
+        output_path: Path,
+        pending_writes: Optional[List[asyncio.Task]] = None
+    ) -> List[Tuple[Dict, Frame]]:
+        """Load a render in a page and capture views around it."""
+        views = []
+        
+        logger.info(f"Loading {render_name} from {url}")
+        await page.goto(url, wait_until="networkidle", timeout=self.timeout)
+        
+        # Wait for initial scene load
+        readiness = await self._wait_for_frame(page, initial=True)
+        
+        # Capture views at different rotation angles
+        rotation_step = 360 / self.num_views
+        
+        for i in range(self.num_views):
+            angle = i * rotation_step
+            logger.info(f"[{render_name}] Capturing view {i+1}/{self.num_views} at {angle}°")
             
-            try:
-                logger.info(f"Loading {render_name} from {url}")
-                await page.goto(url, wait_until="networkidle", timeout=self.timeout)
-                
-                # Wait for initial scene load
-                await asyncio.sleep(self.wait_time / 1000)
-                
-                # Capture views at different rotation angles
-                rotation_step = 360 / self.num_views
-                
-                for i in range(self.num_views):
-                    angle = i * rotation_step
-                    logger.info(f"Capturing view {i+1}/{self.num_views} at {angle}°")
-                    
-                    # Rotate camera if not the first view
-                    if i > 0:
-                        await self._rotate_camera(page, rotation_step)
-                        await asyncio.sleep(1)  # Wait for scene to stabilize
+            # Rotate camera if not the first view
+            if i > 0:
+                await self._rotate_camera(page, rotation_step)
+                readiness = await self._wait_for_frame(page)  # Wait for scene to stabilize
+            
+            # Capture screenshot
+            screenshot_path = output_path / f"view_{i:03d}_{int(angle):03d}deg.png"
+            frame = await self._screenshot(page, screenshot_path, pending_writes)
+            
+            # Store metadata
+            view_data = {
+                "view_index": i,
+                "angle": angle,
+                "render_name": render_name,
+                "screenshot_path": str(screenshot_path),
+                "url": url,
+                "ready_wait_seconds": readiness["waited_seconds"],
+                "ready_stable": readiness["stable"]
+            }
+            views.append((view_data, frame))
+            
+            logger.info(f"Captured: {screenshot_path.name} (waited {readiness['waited_seconds']:.2f}s)")
+        
+        return views
+    
+    async def _capture_poses(
+        self,
+        context,
+        render_name: str,
+        url: str,
+        base_pose: CameraPose,
+        output_path: Path,
+        pending_writes: Optional[List[asyncio.Task]] = None
+    ) -> List[Tuple[Dict, Frame]]:
+        """
+        Capture each orbit angle from its own exact camera pose, in parallel pages.
+        Pages share the browser context, so assets loaded by the first view are reused.
+        """
+        poses = orbit_poses(base_pose, self.num_views, self.rotation_axis)
+        page_slots = asyncio.Semaphore(self.pose_parallel_pages)
+        
+        async def capture_view(i: int, angle: float, pose: CameraPose) -> Tuple[Dict, Frame]:
+            async with page_slots:
+                page = await context.new_page()
+                try:
+                    view_url = with_pose(url, pose)
+                    logger.info(f"[{render_name}] Capturing view {i+1}/{self.num_views} at {angle}° (pose)")
+                    await page.goto(view_url, wait_until="networkidle", timeout=self.timeout)
+                    readiness = await self._wait_for_frame(page, initial=True)
                     
-                    # Capture screenshot
                     screenshot_path = output_path / f"view_{i:03d}_{int(angle):03d}deg.png"
-                    await page.screenshot(path=str(screenshot_path), full_page=False, timeout=self.timeout)
-                    
-                    # Store metadata
-                    view_data = {
-                        "view_index": i,
-                        "angle": angle,
-                        "render_name": render_name,
-                        "screenshot_path": str(screenshot_path),
-                        "url": url
-                    }
-                    views.append(view_data)
-                    
-                    logger.info(f"Saved: {screenshot_path}")
-                
-                # Save metadata
-                metadata_path = output_path / "views_metadata.json"
-                with open(metadata_path, "w") as f:
-                    json.dump(views, f, indent=2)
-                
-                logger.info(f"Captured {len(views)} views for {render_name}")
-                
-            except Exception as e:
-                logger.error(f"Error capturing views for {render_name}: {e}")
-                raise
-            finally:
-                await browser.close()
+                    frame = await self._screenshot(page, screenshot_path, pending_writes)
+                    logger.info(f"Captured: {screenshot_path.name} (waited {readiness['waited_seconds']:.2f}s)")
+                finally:
+                    await page.close()
+            
+            view_data = {
+                "view_index": i,
+                "angle": angle,
+                "render_name": render_name,
+                "screenshot_path": str(screenshot_path),
+                "url": view_url,
+                "camera_pose": pose.to_dict(),
+                "ready_wait_seconds": readiness["waited_seconds"],
+                "ready_stable": readiness["stable"]
+            }
+            return view_data, frame
         
-        return views
+        # Load the first view alone to warm the context's asset cache
+        logger.info(f"Loading {render_name} from {url} ({self.num_views} poses)")
+        first = await capture_view(0, *poses[0])
+        rest = await asyncio.gather(*[
+            capture_view(i, angle, pose) for i, (angle, pose) in enumerate(poses) if i > 0
+        ])
+        return [first] + list(rest)
+    
+    async def _wait_for_frame(self, page: Page, initial: bool = False) -> Dict:
+        """
+        Wait until the rendered frame is ready to capture.
+        
+        Args:
+            page: Page showing the viewer
+            initial: Whether this is the first load of the scene
+            
+        Returns:
+            Dictionary with waited_seconds and stable flag (None for fixed sleeps)
+        """
+        if self.readiness is None:
+            delay = self.wait_time / 1000 if initial else 1.0
+            await asyncio.sleep(delay)
+            return {"waited_seconds": delay, "stable": None}
+        
+        if initial:
+            return await self.readiness.wait_until_stable(
+                page, min_wait=self.initial_min_wait, max_wait=self.initial_max_wait
+            )
+        return await self.readiness.wait_until_stable(page)
     
     async def _rotate_camera(self, page: Page, degrees: float):
         """
@@ -144,31 +308,6 @@ class ViewCapturer:
         await page.mouse.move(center_x + drag_distance, center_y, steps=10)
         await page.mouse.up()
     
-    async def capture_all_renders(self, renders: List[Dict]) -> Dict[str, List[Dict]]:
-        """
-        Capture views from all renders in the configuration.
-        
-        Args:
-            renders: List of render configurations
-            
-        Returns:
-            Dictionary mapping render names to their view metadata
-        """
-        all_views = {}
-        
-        for render in renders:
-            name = render["name"]
-            url = render["url"]
-            
-            try:
-                views = await self.capture_views(name, url)
-                all_views[name] = views
-            except Exception as e:
-                logger.error(f"Failed to capture {name}: {e}")
-                all_views[name] = []
-        
-        return all_views
-    
     def load_existing_views(self, render_name: str) -> List[Dict]:
         """
         Load metadata for previously captured views.
@@ -200,13 +339,18 @@ async def main():
     
     capturer = ViewCapturer(config)
     
-    # Test with first render
-    render = config["renders"][0]
-    views = await capturer.capture_views(render["name"], render["url"])
+    # Capture all renders concurrently through one browser, up to the pool's context limit
+    renders = config["renders"]
+    try:
+        captured = await asyncio.gather(*[capturer.capture_frames(r["name"], r["url"]) for r in renders])
+    finally:
+        await capturer.browser_pool.close()
     
-    print(f"\nCaptured {len(views)} views")
-    for view in views[:3]:  # Show first 3
-        print(f"  View {view['view_index']}: {view['angle']}° -> {view['screenshot_path']}")
+    for render, (views, _) in zip(renders, captured):
+        print(f"\n{render['name']}: captured {len(views)} views")
+        for view in views[:3]:  # Show first 3
+            print(f"  View {view['view_index']}: {view['angle']}° -> {view['screenshot_path']}")
+    print(f"\nBrowser pool: {capturer.browser_pool.stats}")
 
 
 if __name__ == "__main__":
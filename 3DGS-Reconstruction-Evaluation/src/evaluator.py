@@ -5,15 +5,25 @@ Orchestrates view capture, CV metrics, and VLM metrics.
 
 import json
 import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 import yaml
 import numpy as np
 
 from src.capture.view_capturer import ViewCapturer
-from src.metrics.cv_metrics import evaluate_all_cv_metrics
-from src.metrics.vlm_metrics import evaluate_all_vlm_metrics
+from src.capture.browser_pool import browser_pool_from_config
+from src.capture.frame import Frame
+from src.metrics.cv_metrics import cv_metric_settings, evaluate_all_cv_metrics, preload_cv_engines
+from src.metrics.cv_parallel import parallel_scorer_from_config
+from src.metrics.engine_registry import get_engine_registry
+from src.metrics.vlm_client import close_vlm_clients
+from src.metrics.vlm_metrics import VLMEvaluator, evaluate_all_vlm_metrics_async
+from src.ledger import fingerprint, get_ledger, image_hash
+from src.scheduler import render_scheduler_from_config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,8 +48,38 @@ class ReconstructionEvaluator:
         with open(self.config_path) as f:
             self.config = yaml.safe_load(f)
         
-        # Initialize components
-        self.view_capturer = ViewCapturer(self.config)
+        # CV worker processes are started before any other component starts threads
+        scorer = parallel_scorer_from_config(self.config.get("cv_metrics", {}))
+        if scorer is not None and scorer.kind == "process":
+            scorer.warm_up()
+            logger.info(f"Started {scorer.max_workers} CV worker processes")
+        
+        # Initialize components; one browser is shared by every capture
+        self.browser_pool = browser_pool_from_config(self.config)
+        self.view_capturer = ViewCapturer(self.config, browser_pool=self.browser_pool)
+        # CV metrics are CPU-bound; they run here so the event loop keeps serving VLM requests.
+        # Its size is the number of renders scoring CV metrics at once.
+        self.cv_executor = ThreadPoolExecutor(
+            max_workers=self.config.get("scheduler", {}).get("cpu_workers", 1),
+            thread_name_prefix="cv-stage"
+        )
+        
+        # Warm start: build the pyiqa models up front instead of inside the first render
+        if self.config.get("cv_metrics", {}).get("engines", {}).get("preload", False):
+            preload_cv_engines(self.config["cv_metrics"])
+        
+        # Per-view CV metric values, reused while the image and metric settings are unchanged;
+        # values stored under settings that have since changed are dropped. VLM judgements
+        # live in their own bounded cache (vlm_metrics.cache).
+        self.ledger = get_ledger(self.config)
+        if self.ledger is not None:
+            current = {
+                metric: fingerprint(metric_settings)
+                for metric, metric_settings in cv_metric_settings(self.config.get("cv_metrics", {})).items()
+            }
+            # Ledgers written by earlier versions also held VLM judgements
+            current["vlm"] = None
+            self.ledger.prune(current)
         
         # Output directory
         self.output_dir = Path(self.config.get("output", {}).get("results_dir", "results"))
@@ -51,7 +91,9 @@ class ReconstructionEvaluator:
         self, 
         render_name: str, 
         render_url: str,
-        skip_capture: bool = False
+        skip_capture: bool = False,
+        views: Optional[List[Dict]] = None,
+        frames: Optional[List[Frame]] = None
     ) -> Dict:
         """
         Evaluate a single 3DGS render.
@@ -60,6 +102,8 @@ class ReconstructionEvaluator:
             render_name: Name of the render
             render_url: URL of the 3DGS viewer
             skip_capture: Skip view capture and use existing images
+            views: Views captured beforehand (e.g. by the render scheduler)
+            frames: In-memory frames for `views`; metrics read the PNG files when omitted
             
         Returns:
             Dictionary with all evaluation results
@@ -68,28 +112,69 @@ class ReconstructionEvaluator:
         logger.info(f"Evaluating: {render_name}")
         logger.info(f"{'='*60}")
         
+        capture_start = time.perf_counter()
+        
         # Capture views or load existing
-        if skip_capture:
+        if views is not None:
+            logger.info("Using views captured beforehand")
+        elif skip_capture:
             logger.info("Skipping capture, loading existing views...")
             views = self.view_capturer.load_existing_views(render_name)
         else:
             logger.info("Capturing views...")
-            views = await self.view_capturer.capture_views(render_name, render_url)
+            views, frames = await self.view_capturer.capture_frames(render_name, render_url)
         
         if not views:
             logger.error(f"No views available for {render_name}")
             return {"error": "No views available"}
         
-        view_paths = [v["screenshot_path"] for v in views]
-        logger.info(f"Evaluating {len(view_paths)} views")
-        
-        # Run CV metrics
-        logger.info("\n--- Running CV Metrics ---")
-        cv_results = evaluate_all_cv_metrics(view_paths, self.config)
-        
-        # Run VLM metrics
-        logger.info("\n--- Running VLM Metrics ---")
-        vlm_results = evaluate_all_vlm_metrics(view_paths, self.config)
+        # Freshly captured frames are handed over in memory; PNGs on disk are only a side output
+        view_images = frames if frames else [v["screenshot_path"] for v in views]
+        logger.info(f"Evaluating {len(view_images)} views{' from memory' if frames else ''}")
+        
+        capture_seconds = time.perf_counter() - capture_start
+        
+        view_hashes = None
+        if self.ledger is not None:
+            view_hashes = await asyncio.to_thread(lambda: [image_hash(image) for image in view_images])
+        
+        # CV metrics (CPU-bound, in the executor) and VLM metrics (network-bound) run concurrently
+        async def run_cv():
+            logger.info("\n--- Running CV Metrics ---")
+            start_time = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self.cv_executor, evaluate_all_cv_metrics, view_images, self.config, self.ledger, view_hashes
+            )
+            return result, time.perf_counter() - start_time
+        
+        async def run_vlm():
+            logger.info("\n--- Running VLM Metrics ---")
+            start_time = time.perf_counter()
+            result = await evaluate_all_vlm_metrics_async(view_images, self.config, view_hashes)
+            return result, time.perf_counter() - start_time
+        
+        metrics_start = time.perf_counter()
+        (cv_results, cv_seconds), (vlm_results, vlm_seconds) = await asyncio.gather(run_cv(), run_vlm())
+        metrics_seconds = time.perf_counter() - metrics_start
+        
+        # CV metrics only update the ledger in memory; it is written once per render
+        if self.ledger is not None:
+            await asyncio.to_thread(self.ledger.save)
+        
+        timing = {
+            "capture_seconds": round(capture_seconds, 3),
+            "cv_seconds": round(cv_seconds, 3),
+            "vlm_seconds": round(vlm_seconds, 3),
+            "metrics_wall_seconds": round(metrics_seconds, 3),
+            "critical_path": "cv" if cv_seconds >= vlm_seconds else "vlm",
+            # Time saved against running the stages one after the other
+            "overlap_seconds": round(cv_seconds + vlm_seconds - metrics_seconds, 3)
+        }
+        logger.info(
+            f"Metrics took {metrics_seconds:.2f}s (CV {cv_seconds:.2f}s, VLM {vlm_seconds:.2f}s, "
+            f"critical path: {timing['critical_path']})"
+        )
         
         # Merge VLM per-view details into views list
         if isinstance(vlm_results, dict) and "image_details" in vlm_results:
@@ -107,7 +192,8 @@ class ReconstructionEvaluator:
                             "summary": detail.get("summary"),
                             "structural_defects": detail.get("structural_defects"),
                             "texture_artifacts": detail.get("texture_artifacts"),
-                            "subscores": detail.get("subscores")
+                            "subscores": detail.get("subscores"),
+                            "cached": detail.get("cached", False)
                         }
                 except Exception as e:
                     logger.warning(f"Failed to merge VLM details for view: {e}")
@@ -123,6 +209,7 @@ class ReconstructionEvaluator:
             "cv_metrics": cv_results,
             "vlm_metrics": vlm_results,
             "overall_score": overall_score,
+            "timing": timing,
             "views": views
         }
         
@@ -135,6 +222,42 @@ class ReconstructionEvaluator:
         
         return results
     
+    def plan_render(self, render_name: str) -> Dict:
+        """
+        List the per-view metric values a --skip-capture run would recompute.
+        
+        Args:
+            render_name: Name of the render with previously captured views
+            
+        Returns:
+            Dictionary with the number of views and, per metric, the view files to recompute
+        """
+        views = self.view_capturer.load_existing_views(render_name)
+        view_paths = [v["screenshot_path"] for v in views]
+        view_hashes = [image_hash(path) for path in view_paths]
+        
+        recompute = {}
+        for metric, metric_settings in cv_metric_settings(self.config.get("cv_metrics", {})).items():
+            if self.ledger is None:
+                todo = list(range(len(view_paths)))
+            else:
+                todo = self.ledger.missing(metric, fingerprint(metric_settings), view_hashes)
+            recompute[metric] = [Path(view_paths[i]).name for i in todo]
+        
+        # VLM judgements are looked up in the judgement cache
+        if self.config.get("vlm_metrics", {}).get("enabled", True):
+            try:
+                vlm_evaluator = VLMEvaluator(self.config)
+                cache = vlm_evaluator.judgement_cache
+                recompute["vlm"] = [
+                    Path(path).name for path, view_hash in zip(view_paths, view_hashes)
+                    if cache is None or not cache.contains(vlm_evaluator.cache_key(view_hash))
+                ]
+            except ImportError as e:
+                logger.warning(f"Cannot plan VLM metrics: {e}")
+        
+        return {"num_views": len(view_paths), "recompute": recompute}
+    
     def _compute_overall_score(self, cv_results: Dict, vlm_results: Dict) -> float:
         """
         Compute weighted overall quality score.
@@ -205,30 +328,26 @@ class ReconstructionEvaluator:
             Dictionary mapping render names to their results
         """
         renders = self.config.get("renders", [])
-        all_results = {}
         
-        for render in renders:
-            name = render["name"]
-            url = render["url"]
-            
-            try:
-                results = await self.evaluate_render(name, url, skip_capture)
-                all_results[name] = results
-            except Exception as e:
-                logger.error(f"Failed to evaluate {name}: {e}")
-                all_results[name] = {"error": str(e)}
+        # Renders are captured and scored concurrently; comparison.json fills in as they finish
+        logger.info(f"Evaluating {len(renders)} renders concurrently...")
+        scheduler = render_scheduler_from_config(self)
+        all_results = await scheduler.run(renders, skip_capture)
         
         # Generate comparative report
         self._generate_comparison(all_results)
         
         return all_results
     
-    def _generate_comparison(self, all_results: Dict[str, Dict]):
+    def _build_comparison(self, all_results: Dict[str, Dict]) -> Dict:
         """
-        Generate comparison report across all renders.
+        Rank the renders evaluated so far.
         
         Args:
-            all_results: Dictionary of all evaluation results
+            all_results: Dictionary of evaluation results
+            
+        Returns:
+            Comparison with renders sorted by overall score and their ranking
         """
         comparison = {
             "renders": [],
@@ -256,10 +375,43 @@ class ReconstructionEvaluator:
                 "score": render["overall_score"]
             })
         
-        # Save comparison
+        return comparison
+    
+    def write_comparison(
+        self, all_results: Dict[str, Dict], pending: Optional[List[str]] = None
+    ) -> Tuple[Path, Dict]:
+        """
+        Write comparison.json for the renders evaluated so far.
+        
+        Args:
+            all_results: Dictionary of evaluation results
+            pending: Renders still being evaluated; empty or None once all are done
+            
+        Returns:
+            Path of the comparison file and the comparison written to it
+        """
+        comparison = self._build_comparison(all_results)
+        comparison["status"] = "in_progress" if pending else "complete"
+        comparison["pending"] = list(pending or [])
+        comparison["failed"] = [name for name, results in all_results.items() if "error" in results]
+        
+        # Replace atomically so readers never see a half-written file
         comparison_file = self.output_dir / "comparison.json"
-        with open(comparison_file, "w") as f:
+        tmp_file = comparison_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
             json.dump(comparison, f, indent=2)
+        os.replace(tmp_file, comparison_file)
+        
+        return comparison_file, comparison
+    
+    def _generate_comparison(self, all_results: Dict[str, Dict]):
+        """
+        Generate comparison report across all renders.
+        
+        Args:
+            all_results: Dictionary of all evaluation results
+        """
+        comparison_file, comparison = self.write_comparison(all_results)
         
         logger.info(f"\nComparison saved to: {comparison_file}")
         
@@ -270,6 +422,13 @@ class ReconstructionEvaluator:
         for item in comparison["ranking"]:
             logger.info(f"{item['rank']}. {item['name']}: {item['score']:.2f}/100")
         logger.info("="*60 + "\n")
+    
+    async def close(self):
+        """Release the shared browser, VLM connections and the CV executor."""
+        await self.browser_pool.close()
+        await close_vlm_clients()
+        self.cv_executor.shutdown(wait=False)
+        get_engine_registry().log_report()
 
 
 async def main():
@@ -280,7 +439,10 @@ async def main():
     evaluator = ReconstructionEvaluator()
     
     # Evaluate all renders
-    results = await evaluator.evaluate_all_renders(skip_capture=False)
+    try:
+        results = await evaluator.evaluate_all_renders(skip_capture=False)
+    finally:
+        await evaluator.close()
     
     print("\nEvaluation complete!")
     print(f"Results saved to: {evaluator.output_dir}")
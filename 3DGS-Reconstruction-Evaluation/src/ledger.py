@@ -0,0 +1,213 @@
+"""
+Per-view, per-metric result ledger for incremental re-evaluation.
+Each stored value is keyed by the view's image hash and a fingerprint of
+the settings that affect that metric's per-view value, so a config change
+only invalidates the metrics it touches. Aggregate statistics are rebuilt
+from the stored per-view values. Values are kept in memory; the file is
+written once per render (save). Entries under outdated settings are
+dropped by prune, and each metric keeps at most max_entries values,
+least recently used first out, so values for old screenshots do not
+accumulate.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.capture.frame import ImageInput, image_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(settings: Dict) -> str:
+    """Stable short hash of a metric's settings."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def image_hash(image: ImageInput) -> str:
+    """Content hash of a view's encoded image."""
+    return hashlib.sha256(image_bytes(image)).hexdigest()
+
+
+class MetricLedger:
+    """JSON-backed store of per-view metric values."""
+
+    def __init__(self, path: Union[str, Path] = "cache/metric_ledger.json", max_entries: Optional[int] = 20000):
+        """
+        Initialize ledger.
+
+        Args:
+            path: JSON file holding {metric: {"<image hash>:<fingerprint>": value}}
+            max_entries: Values kept per metric; least recently used ones are dropped beyond it (None for no limit)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Serializes file writes, so the entries lock is not held during disk I/O
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def _key(view_hash: str, settings_fingerprint: str) -> str:
+        return f"{view_hash}:{settings_fingerprint}"
+
+    def get(self, metric: str, view_hash: str, settings_fingerprint: str) -> Optional[Any]:
+        """Stored per-view value, or None if missing or invalidated."""
+        key = self._key(view_hash, settings_fingerprint)
+        with self._lock:
+            entries = self._entries.get(metric, {})
+            if key not in entries:
+                return None
+            # Dicts keep insertion order (also through the JSON file), which serves as LRU order
+            entries[key] = value = entries.pop(key)
+            # Copies, so callers can annotate values without changing the ledger
+            return copy.deepcopy(value)
+
+    def put(self, metric: str, view_hash: str, settings_fingerprint: str, value: Any):
+        """Store a per-view value (call save() to persist)."""
+        key = self._key(view_hash, settings_fingerprint)
+        with self._lock:
+            entries = self._entries.setdefault(metric, {})
+            entries.pop(key, None)
+            entries[key] = copy.deepcopy(value)
+            if self.max_entries is not None:
+                while len(entries) > self.max_entries:
+                    del entries[next(iter(entries))]
+            self._dirty = True
+
+    def save(self):
+        """Persist the ledger atomically, if anything changed since the last save."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = json.dumps(self._entries)
+                self._dirty = False
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+    def prune(self, current: Dict[str, Optional[str]]) -> int:
+        """
+        Drop values stored under settings that are no longer current (call save() to persist).
+
+        Args:
+            current: Current settings fingerprint per metric (None drops all of a metric's values);
+                metrics not listed are left untouched
+
+        Returns:
+            Number of values removed
+        """
+        removed = 0
+        with self._lock:
+            for metric, settings_fingerprint in current.items():
+                entries = self._entries.get(metric, {})
+                stale = [
+                    key for key in entries
+                    if settings_fingerprint is None or not key.endswith(f":{settings_fingerprint}")
+                ]
+                for key in stale:
+                    del entries[key]
+                removed += len(stale)
+            if removed:
+                self._dirty = True
+        if removed:
+            logger.info(f"Pruned {removed} ledger values under outdated metric settings")
+        return removed
+
+    def missing(self, metric: str, settings_fingerprint: str, view_hashes: List[str]) -> List[int]:
+        """Indices of views whose value must be recomputed."""
+        return [i for i, h in enumerate(view_hashes) if self.get(metric, h, settings_fingerprint) is None]
+
+    def lookup(self, metric: str, settings_fingerprint: str, view_hashes: List[str]) -> Tuple[List[Optional[Any]], List[int]]:
+        """Stored value per view (None where missing) and the indices to recompute."""
+        values = [self.get(metric, h, settings_fingerprint) for h in view_hashes]
+        return values, [i for i, value in enumerate(values) if value is None]
+
+    def record(
+        self,
+        metric: str,
+        settings_fingerprint: str,
+        view_hashes: List[str],
+        values: List[Optional[Any]],
+        todo: List[int],
+        computed: List[Optional[Any]],
+        report: Optional[Dict] = None,
+        keep: Callable[[Any], bool] = lambda value: value is not None
+    ) -> List[Optional[Any]]:
+        """
+        Fill recomputed values in and store the valid ones (call save() to persist).
+
+        Args:
+            metric: Metric name
+            settings_fingerprint: Fingerprint of the metric's settings
+            view_hashes: Image hash per view
+            values: Per-view values from lookup()
+            todo: Indices that were recomputed
+            computed: New values for `todo`, in the same order
+            report: Optional dict receiving {metric: {"reused": n, "computed": m}}
+            keep: Which values to store; failures are left out so they are retried next run
+
+        Returns:
+            Value per view, in view order
+        """
+        for i, value in zip(todo, computed):
+            values[i] = value
+            if keep(value):
+                self.put(metric, view_hashes[i], settings_fingerprint, value)
+
+        logger.info(f"{metric}: {len(view_hashes) - len(todo)} views from ledger, {len(todo)} computed")
+        if report is not None:
+            report[metric] = {"reused": len(view_hashes) - len(todo), "computed": len(todo)}
+        return values
+
+    def resolve(
+        self,
+        metric: str,
+        settings_fingerprint: str,
+        view_hashes: List[str],
+        compute: Callable[[List[int]], List[Optional[Any]]],
+        report: Optional[Dict] = None
+    ) -> List[Optional[Any]]:
+        """
+        Per-view values for a metric, computing only the invalidated ones.
+
+        Args:
+            metric: Metric name
+            settings_fingerprint: Fingerprint of the metric's settings
+            view_hashes: Image hash per view
+            compute: Called with the indices to recompute; returns their values (None on failure)
+            report: Optional dict receiving {metric: {"reused": n, "computed": m}}
+
+        Returns:
+            Value per view, in view order; None where a view failed
+        """
+        values, todo = self.lookup(metric, settings_fingerprint, view_hashes)
+        computed = compute(todo) if todo else []
+        return self.record(metric, settings_fingerprint, view_hashes, values, todo, computed, report)
+
+
+_ledger: Optional[MetricLedger] = None
+
+
+def get_ledger(config: Dict) -> Optional[MetricLedger]:
+    """Process-wide ledger as configured under `ledger`, or None when disabled."""
+    global _ledger
+    ledger_config = config.get("ledger", {})
+    if not ledger_config.get("enabled", True):
+        return None
+    path = Path(ledger_config.get("path", "cache/metric_ledger.json"))
+    if _ledger is None or _ledger.path != path:
+        _ledger = MetricLedger(path, max_entries=ledger_config.get("max_entries", 20000))
+    return _ledger
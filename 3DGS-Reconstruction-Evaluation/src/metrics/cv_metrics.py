@@ -5,82 +5,173 @@ Includes blur detection, edge consistency, BRISQUE, and LPIPS metrics.
 
 import cv2
 import numpy as np
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 from PIL import Image
 import logging
+import time
 
-# MANIQA import
-try:
-    import pyiqa, torch
-    MANIQA_AVAILABLE = True
-except ImportError:
-    MANIQA_AVAILABLE = False
+from src.capture.frame import ImageInput, image_name
+from src.metrics.frame_cache import FrameCache, frame_cache_from_config, get_shared_frame_cache
+from src.metrics.engine_registry import get_engine_registry
+from src.metrics.cv_parallel import edge_density, laplacian_variance, parallel_scorer_from_config
+from src.ledger import MetricLedger, fingerprint, image_hash
+
+# MANIQA availability. pyiqa and torch are only located here; they are imported
+# when a model is first used, so blur/edge-only and VLM-only runs never load them.
+MANIQA_AVAILABLE = find_spec("pyiqa") is not None and find_spec("torch") is not None
+if not MANIQA_AVAILABLE:
     logging.warning("pyiqa not available. MANIQA metric will be unavailable.")
 
-# BRISQUE imports
-try:
-    from skimage.metrics import structural_similarity as ssim
-    import scipy.ndimage
-    BRISQUE_AVAILABLE = True
-except ImportError:
-    BRISQUE_AVAILABLE = False
+# BRISQUE availability
+BRISQUE_AVAILABLE = find_spec("skimage") is not None and find_spec("scipy") is not None
+if not BRISQUE_AVAILABLE:
     logging.warning("scikit-image not available. BRISQUE metric will be limited.")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def batched_inference(model, tensors: List, batch_size: int, min_side: int = 0) -> List[Optional[float]]:
+    """
+    Run a pyiqa model over [1, 3, H, W] view tensors in stacked batches.
+    Views are grouped by shape so each batch is one forward pass; a batch
+    that fails is scored one view at a time.
+    
+    Args:
+        model: pyiqa metric
+        tensors: Per-view tensors; None entries are skipped
+        batch_size: Views per forward pass
+        min_side: Views whose shorter side is below this are upscaled to it first
+        
+    Returns:
+        Raw model score per view, in view order; None where a view failed
+    """
+    import torch
+    
+    scores: List[Optional[float]] = [None] * len(tensors)
+    
+    groups: Dict[tuple, List[int]] = {}
+    for i, tensor in enumerate(tensors):
+        if tensor is None:
+            continue
+        height, width = tensor.shape[-2:]
+        if min(height, width) < min_side:
+            scale = min_side / min(height, width)
+            size = (max(min_side, round(height * scale)), max(min_side, round(width * scale)))
+            tensors[i] = tensor = torch.nn.functional.interpolate(tensor, size=size, mode="bilinear", align_corners=False)
+        groups.setdefault(tuple(tensor.shape[-2:]), []).append(i)
+    
+    with torch.inference_mode():
+        for indices in groups.values():
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                try:
+                    output = model(torch.cat([tensors[i] for i in chunk]))
+                    for i, score in zip(chunk, output.reshape(-1).tolist()):
+                        scores[i] = float(score)
+                except Exception as e:
+                    if len(chunk) == 1:
+                        logger.error(f"Inference failed for view {chunk[0]}: {e}")
+                        continue
+                    # Score the chunk view by view so one bad view does not fail the others
+                    logger.warning(f"Batched inference failed for {len(chunk)} views, retrying one at a time: {e}")
+                    for i in chunk:
+                        try:
+                            scores[i] = float(model(tensors[i]).reshape(-1)[0])
+                        except Exception as e:
+                            logger.error(f"Inference failed for view {i}: {e}")
+    
+    return scores
+
+
+def view_tensors(frame_cache: FrameCache, view_paths: List[ImageInput]) -> List:
+    """Model input tensor per view from the shared cache; None for views that fail to decode."""
+    tensors = []
+    for path in view_paths:
+        try:
+            tensors.append(frame_cache.tensor(path))
+        except Exception as e:
+            logger.error(f"Error processing {image_name(path)}: {e}")
+            tensors.append(None)
+    return tensors
+
+
 class BlurDetector:
     """Detects blur in images using Laplacian variance."""
     
-    def __init__(self, threshold: float = 100.0):
+    def __init__(self, threshold: float = 100.0, frame_cache: Optional[FrameCache] = None):
         """
         Initialize blur detector.
         
         Args:
             threshold: Laplacian variance threshold (lower = more blurred)
+            frame_cache: Decoded views shared with the other metrics (defaults to the process-wide cache)
         """
         self.threshold = threshold
+        self.frame_cache = frame_cache or get_shared_frame_cache()
     
-    def compute_blur_score(self, image_path: Union[str, Path]) -> float:
+    def compute_blur_score(self, image_path: ImageInput) -> float:
         """
         Compute blur score using Laplacian variance.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file or captured frame
             
         Returns:
             Blur score (higher = sharper, lower = more blurred)
         """
-        image = cv2.imread(str(image_path))
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-        
-        return float(laplacian_var)
+        return laplacian_variance(self.frame_cache.gray(image_path))
+    
+    def settings(self) -> Dict:
+        """Settings that change the per-view score (the threshold only affects reporting)."""
+        return {"metric": "blur_laplacian"}
     
-    def evaluate_views(self, view_paths: List[Union[str, Path]]) -> Dict:
+    def compute_blur_scores(self, view_paths: List[ImageInput]) -> List[Optional[float]]:
         """
-        Evaluate blur across multiple views.
+        Compute blur scores for many views.
         
         Args:
-            view_paths: List of image paths
+            view_paths: List of image paths or captured frames
             
         Returns:
-            Dictionary with blur statistics
+            Blur score per view, in view order; None where a view failed
         """
         scores = []
         
         for path in view_paths:
             try:
-                score = self.compute_blur_score(path)
-                scores.append(score)
+                scores.append(self.compute_blur_score(path))
             except Exception as e:
-                logger.error(f"Error processing {path}: {e}")
+                logger.error(f"Error processing {image_name(path)}: {e}")
+                scores.append(None)
+        
+        return scores
+    
+    def evaluate_views(self, view_paths: List[ImageInput]) -> Dict:
+        """
+        Evaluate blur across multiple views.
         
+        Args:
+            view_paths: List of image paths or captured frames
+            
+        Returns:
+            Dictionary with blur statistics
+        """
+        return self.summarize(self.compute_blur_scores(view_paths))
+    
+    def summarize(self, scores: List[Optional[float]]) -> Dict:
+        """
+        Aggregate per-view blur scores.
+        
+        Args:
+            scores: Laplacian variance per view; None entries (failed views) are skipped
+            
+        Returns:
+            Dictionary with blur statistics
+        """
+        scores = [score for score in scores if score is not None]
         if not scores:
             return {"error": "No valid scores computed"}
         
@@ -117,56 +208,79 @@ class BlurDetector:
 class EdgeConsistencyMetric:
     """Evaluates edge density and consistency across views."""
     
-    def __init__(self, canny_low: int = 50, canny_high: int = 150):
+    def __init__(self, canny_low: int = 50, canny_high: int = 150, frame_cache: Optional[FrameCache] = None):
         """
         Initialize edge consistency metric.
         
         Args:
             canny_low: Lower threshold for Canny edge detection
             canny_high: Upper threshold for Canny edge detection
+            frame_cache: Decoded views shared with the other metrics (defaults to the process-wide cache)
         """
         self.canny_low = canny_low
         self.canny_high = canny_high
+        self.frame_cache = frame_cache or get_shared_frame_cache()
     
-    def compute_edge_density(self, image_path: Union[str, Path]) -> float:
+    def compute_edge_density(self, image_path: ImageInput) -> float:
         """
         Compute edge density using Canny edge detection.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file or captured frame
             
         Returns:
             Edge density (percentage of edge pixels)
         """
-        image = cv2.imread(str(image_path))
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, self.canny_low, self.canny_high)
-        
-        edge_density = np.sum(edges > 0) / edges.size
-        return float(edge_density)
+        return edge_density(self.frame_cache.gray(image_path), self.canny_low, self.canny_high)
+    
+    def settings(self) -> Dict:
+        """Settings that change the per-view edge density."""
+        return {"metric": "edge_density", "canny_low": self.canny_low, "canny_high": self.canny_high}
     
-    def evaluate_views(self, view_paths: List[Union[str, Path]]) -> Dict:
+    def compute_edge_densities(self, view_paths: List[ImageInput]) -> List[Optional[float]]:
         """
-        Evaluate edge consistency across multiple views.
+        Compute edge densities for many views.
         
         Args:
-            view_paths: List of image paths
+            view_paths: List of image paths or captured frames
             
         Returns:
-            Dictionary with edge consistency statistics
+            Edge density per view, in view order; None where a view failed
         """
         densities = []
         
         for path in view_paths:
             try:
-                density = self.compute_edge_density(path)
-                densities.append(density)
+                densities.append(self.compute_edge_density(path))
             except Exception as e:
-                logger.error(f"Error processing {path}: {e}")
+                logger.error(f"Error processing {image_name(path)}: {e}")
+                densities.append(None)
+        
+        return densities
+    
+    def evaluate_views(self, view_paths: List[ImageInput]) -> Dict:
+        """
+        Evaluate edge consistency across multiple views.
+        
+        Args:
+            view_paths: List of image paths or captured frames
+            
+        Returns:
+            Dictionary with edge consistency statistics
+        """
+        return self.summarize(self.compute_edge_densities(view_paths))
+    
+    def summarize(self, densities: List[Optional[float]]) -> Dict:
+        """
+        Aggregate per-view edge densities.
         
+        Args:
+            densities: Edge density per view; None entries (failed views) are skipped
+            
+        Returns:
+            Dictionary with edge consistency statistics
+        """
+        densities = [density for density in densities if density is not None]
         if not densities:
             return {"error": "No valid densities computed"}
         
@@ -193,66 +307,107 @@ class BRISQUEMetric:
     Uses pyiqa implementation.
     """
     
-    def __init__(self):
-        """Initialize BRISQUE metric."""
+    def __init__(
+        self,
+        frame_cache: Optional[FrameCache] = None,
+        batch_size: int = 8,
+        device: str = "cpu",
+        lazy: bool = False
+    ):
+        """
+        Initialize BRISQUE metric.
+        
+        Args:
+            frame_cache: Decoded views shared with the other metrics (defaults to the process-wide cache)
+            batch_size: Views per forward pass in evaluate_views
+            device: Torch device for the model
+            lazy: Create the model on first use instead of now
+        """
         if not MANIQA_AVAILABLE: # Reusing the pyiqa availability check
             raise ImportError("BRISQUE via pyiqa requires pyiqa package")
         
-        self.device = torch.device("cpu")
-        try:
-            self.model = pyiqa.create_metric('brisque', device=self.device)
-            logger.info(f"BRISQUE initialized on {self.device} (via pyiqa)")
-        except Exception as e:
-            logger.error(f"Failed to initialize BRISQUE: {e}")
-            raise
+        self.frame_cache = frame_cache or get_shared_frame_cache()
+        self.batch_size = batch_size
+        self.device = device
+        # The model is created once per process and shared by every render
+        self.engine = get_engine_registry().get('brisque', device, lazy=lazy)
+    
+    @property
+    def model(self):
+        return self.engine.model
 
-    def compute_quality_score(self, image_path: Union[str, Path]) -> float:
+    def compute_quality_score(self, image_path: ImageInput) -> float:
         """
         Compute BRISQUE score for a single image.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file or captured frame
             
         Returns:
             Quality score (0-100, higher is better)
         """
         try:
-            # pyiqa handles image loading
+            # Views are passed as tensors from the shared cache rather than decoded by pyiqa
             # BRISQUE returns a score typically 0-100, where 0 is best and 100 is worst.
-            score = self.model(str(image_path))
+            score = self.model(self.frame_cache.tensor(image_path))
             
-            if torch.is_tensor(score):
+            if hasattr(score, "item"):
                 score = score.item()
-                
-            # Invert for "higher is better" consistency with other metrics
-            # 0 (best) -> 100, 100 (worst) -> 0
-            quality_score = max(0.0, 100.0 - float(score))
             
-            return quality_score
+            return self._to_quality(score)
             
         except Exception as e:
-            logger.error(f"Error computing BRISQUE for {image_path}: {e}")
+            logger.error(f"Error computing BRISQUE for {image_name(image_path)}: {e}")
             return 0.0
     
-    def evaluate_views(self, view_paths: List[Union[str, Path]]) -> Dict:
+    @staticmethod
+    def _to_quality(score: float) -> float:
+        # Invert for "higher is better" consistency with other metrics
+        # 0 (best) -> 100, 100 (worst) -> 0
+        return max(0.0, 100.0 - float(score))
+    
+    @staticmethod
+    def settings() -> Dict:
+        """Settings that change the per-view score."""
+        return {"metric": "brisque", "backend": "pyiqa"}
+    
+    def compute_quality_scores(self, view_paths: List[ImageInput]) -> List[Optional[float]]:
+        """
+        Compute BRISQUE scores for many views, batch_size views per forward pass.
+        
+        Args:
+            view_paths: List of image paths or captured frames
+            
+        Returns:
+            Quality score per view, in view order; None where a view failed
+        """
+        raw_scores = batched_inference(self.model, view_tensors(self.frame_cache, view_paths), self.batch_size)
+        return [self._to_quality(score) if score is not None else None for score in raw_scores]
+    
+    def evaluate_views(self, view_paths: List[ImageInput]) -> Dict:
         """
         Evaluate quality across multiple views.
         
         Args:
-            view_paths: List of image paths
+            view_paths: List of image paths or captured frames
             
         Returns:
             Dictionary with quality statistics
         """
-        scores = []
-        
-        for path in view_paths:
-            try:
-                score = self.compute_quality_score(path)
-                scores.append(score)
-            except Exception as e:
-                logger.error(f"Error processing {path}: {e}")
+        return self.summarize(self.compute_quality_scores(view_paths))
+    
+    @staticmethod
+    def summarize(scores: List[Optional[float]]) -> Dict:
+        """
+        Aggregate per-view BRISQUE quality scores.
         
+        Args:
+            scores: Quality score per view; failed views (None) count as 0, as in compute_quality_score
+            
+        Returns:
+            Dictionary with quality statistics
+        """
+        scores = [score if score is not None else 0.0 for score in scores]
         if not scores:
             return {"error": "No valid scores computed"}
         
@@ -270,53 +425,172 @@ class BRISQUEMetric:
         }
 
 
-def evaluate_all_cv_metrics(view_paths: List[Union[str, Path]], config: Dict) -> Dict:
+def cv_metric_settings(cv_config: Dict) -> Dict[str, Dict]:
+    """
+    Per-view settings of every enabled CV metric, keyed by ledger metric name.
+    
+    Args:
+        cv_config: The `cv_metrics` configuration section
+        
+    Returns:
+        Dictionary mapping metric names to the settings their per-view values depend on
+    """
+    settings = {}
+    if cv_config.get("blur", {}).get("enabled", True):
+        settings["blur"] = BlurDetector().settings()
+    if cv_config.get("edge_consistency", {}).get("enabled", True):
+        settings["edge_density"] = EdgeConsistencyMetric(
+            canny_low=cv_config.get("edge_consistency", {}).get("canny_low", 50),
+            canny_high=cv_config.get("edge_consistency", {}).get("canny_high", 150)
+        ).settings()
+    if cv_config.get("brisque", {}).get("enabled", True):
+        settings["brisque"] = BRISQUEMetric.settings()
+    if cv_config.get("maniqa", {}).get("enabled", True) and MANIQA_AVAILABLE:
+        settings["maniqa"] = MANIQAMetric.settings()
+    return settings
+
+
+def preload_cv_engines(cv_config: Dict):
+    """Create the enabled pyiqa models now, so the first render does not pay their start-up."""
+    device = cv_config.get("engines", {}).get("device", "cpu")
+    for metric_name in ["brisque", "maniqa"]:
+        if cv_config.get(metric_name, {}).get("enabled", True) and MANIQA_AVAILABLE:
+            get_engine_registry().get(metric_name, device)
+
+
+def evaluate_all_cv_metrics(
+    view_paths: List[ImageInput],
+    config: Dict,
+    ledger: Optional[MetricLedger] = None,
+    view_hashes: Optional[List[str]] = None
+) -> Dict:
     """
     Run all enabled CV metrics on a set of views.
+    Each view is decoded once into a frame cache shared by every metric.
+    With a ledger, per-view values whose image and metric settings are
+    unchanged are reused and only the invalidated ones are computed; the
+    caller saves the ledger.
     
     Args:
-        view_paths: List of image paths
+        view_paths: List of image paths or captured frames
         config: Configuration dictionary
+        ledger: Optional per-view result ledger
+        view_hashes: Image hash per view (computed when a ledger is given without them)
         
     Returns:
-        Dictionary with all metric results
+        Dictionary with all metric results, plus per-stage timing under "timing"
+        and, with a ledger, reused/computed counts under "ledger"
     """
     cv_config = config.get("cv_metrics", {})
     results = {}
+    frame_cache = frame_cache_from_config(cv_config)
+    settings = cv_metric_settings(cv_config)
+    stage_seconds = {}
+    ledger_report = {}
+    if ledger is not None and view_hashes is None:
+        view_hashes = [image_hash(path) for path in view_paths]
     
-    # Blur detection
-    if cv_config.get("blur", {}).get("enabled", True):
-        logger.info("Computing blur metrics...")
-        blur_detector = BlurDetector(
-            threshold=cv_config.get("blur", {}).get("threshold", 100)
-        )
-        results["blur"] = blur_detector.evaluate_views(view_paths)
+    def timed(stage: str, run):
+        start_time = time.perf_counter()
+        try:
+            return run()
+        finally:
+            stage_seconds[stage] = round(time.perf_counter() - start_time, 4)
     
-    # Edge consistency
-    if cv_config.get("edge_consistency", {}).get("enabled", True):
-        logger.info("Computing edge consistency...")
-        edge_metric = EdgeConsistencyMetric(
-            canny_low=cv_config.get("edge_consistency", {}).get("canny_low", 50),
-            canny_high=cv_config.get("edge_consistency", {}).get("canny_high", 150)
-        )
-        results["edge_consistency"] = edge_metric.evaluate_views(view_paths)
+    def subset(indices: List[int]) -> List[ImageInput]:
+        return [view_paths[i] for i in indices]
     
-    # BRISQUE
-    if cv_config.get("brisque", {}).get("enabled", True):
+    def pending(metric: str) -> List[int]:
+        if ledger is None:
+            return list(range(len(view_paths)))
+        return ledger.missing(metric, fingerprint(settings[metric]), view_hashes)
+    
+    def resolve(metric: str, compute) -> List[Optional[float]]:
+        # Per-view values, reusing ledger entries whose inputs are unchanged
+        if ledger is None:
+            return compute(list(range(len(view_paths))))
+        return ledger.resolve(metric, fingerprint(settings[metric]), view_hashes, compute, ledger_report)
+    
+    blur_enabled = "blur" in settings
+    edge_enabled = "edge_density" in settings
+    blur_detector = BlurDetector(
+        threshold=cv_config.get("blur", {}).get("threshold", 100),
+        frame_cache=frame_cache
+    )
+    edge_metric = EdgeConsistencyMetric(
+        canny_low=cv_config.get("edge_consistency", {}).get("canny_low", 50),
+        canny_high=cv_config.get("edge_consistency", {}).get("canny_high", 150),
+        frame_cache=frame_cache
+    )
+    
+    scorer = parallel_scorer_from_config(cv_config)
+    if scorer is not None and (blur_enabled or edge_enabled):
+        # Blur and edge density share one pass over the views, fanned out across the pool
+        todo = sorted(set(pending("blur") if blur_enabled else []) | set(pending("edge_density") if edge_enabled else []))
+        logger.info(f"Computing blur/edge metrics for {len(todo)} views on {scorer.max_workers} {scorer.kind} workers...")
+        canny = (edge_metric.canny_low, edge_metric.canny_high) if edge_enabled else None
+        view_scores = timed("blur_edge", lambda: scorer.score(subset(todo), frame_cache, blur_enabled, canny))
+        scored = {i: scores or {} for i, scores in zip(todo, view_scores)}
+        if blur_enabled:
+            blur_scores = resolve("blur", lambda indices: [scored[i].get("blur") for i in indices])
+            results["blur"] = blur_detector.summarize(blur_scores)
+        if edge_enabled:
+            densities = resolve("edge_density", lambda indices: [scored[i].get("edge_density") for i in indices])
+            results["edge_consistency"] = edge_metric.summarize(densities)
+    else:
+        # Blur detection
+        if blur_enabled:
+            logger.info("Computing blur metrics...")
+            blur_scores = timed("blur", lambda: resolve("blur", lambda indices: blur_detector.compute_blur_scores(subset(indices))))
+            results["blur"] = blur_detector.summarize(blur_scores)
+        
+        # Edge consistency
+        if edge_enabled:
+            logger.info("Computing edge consistency...")
+            densities = timed("edge_consistency", lambda: resolve(
+                "edge_density", lambda indices: edge_metric.compute_edge_densities(subset(indices))
+            ))
+            results["edge_consistency"] = edge_metric.summarize(densities)
+    
+    # BRISQUE (the model is only built when some view needs scoring)
+    if "brisque" in settings:
         logger.info("Computing BRISQUE quality...")
-        brisque_metric = BRISQUEMetric()
-        results["brisque"] = brisque_metric.evaluate_views(view_paths)
+        
+        def compute_brisque(indices: List[int]) -> List[Optional[float]]:
+            brisque_metric = BRISQUEMetric(
+                frame_cache=frame_cache,
+                batch_size=cv_config.get("brisque", {}).get("batch_size", 8),
+                device=cv_config.get("engines", {}).get("device", "cpu")
+            )
+            return brisque_metric.compute_quality_scores(subset(indices))
+        
+        results["brisque"] = BRISQUEMetric.summarize(timed("brisque", lambda: resolve("brisque", compute_brisque)))
     
     # MANIQA
-    if cv_config.get("maniqa", {}).get("enabled", True) and MANIQA_AVAILABLE:
+    if "maniqa" in settings:
         logger.info("Computing MANIQA quality...")
+        
+        def compute_maniqa(indices: List[int]) -> List[Optional[float]]:
+            maniqa_metric = MANIQAMetric(
+                frame_cache=frame_cache,
+                batch_size=cv_config.get("maniqa", {}).get("batch_size", 8),
+                device=cv_config.get("engines", {}).get("device", "cpu")
+            )
+            return maniqa_metric.compute_quality_scores(subset(indices))
+        
         try:
-            maniqa_metric = MANIQAMetric()
-            results["maniqa"] = maniqa_metric.evaluate_views(view_paths)
+            results["maniqa"] = MANIQAMetric.summarize(timed("maniqa", lambda: resolve("maniqa", compute_maniqa)))
         except Exception as e:
             logger.error(f"MANIQA evaluation failed: {e}")
             results["maniqa"] = {"error": str(e)}
     
+    # Stage times include the decode work done on first access; the cache splits it out
+    results["timing"] = {"stages": stage_seconds, "frame_cache": frame_cache.report()}
+    logger.info(f"CV timing: {results['timing']}")
+    if ledger is not None:
+        results["ledger"] = ledger_report
+    frame_cache.clear()
+    
     return results
 
 
@@ -326,35 +600,54 @@ class MANIQAMetric:
     Uses pyiqa implementation.
     """
     
-    def __init__(self):
-        """Initialize MANIQA metric."""
+    # MANIQA scores random 224x224 crops, so views must be at least that large
+    MIN_SIDE = 224
+    
+    def __init__(
+        self,
+        frame_cache: Optional[FrameCache] = None,
+        batch_size: int = 8,
+        device: str = "cpu",
+        lazy: bool = False
+    ):
+        """
+        Initialize MANIQA metric.
+        
+        Args:
+            frame_cache: Decoded views shared with the other metrics (defaults to the process-wide cache)
+            batch_size: Views per forward pass in evaluate_views
+            device: Torch device for the model
+            lazy: Create the model on first use instead of now
+        """
         if not MANIQA_AVAILABLE:
             raise ImportError("MANIQA requires pyiqa package")
         
-        self.device = torch.device("cpu")
-        try:
-            self.model = pyiqa.create_metric('maniqa', device=self.device)
-            logger.info(f"MANIQA initialized on {self.device}")
-        except Exception as e:
-            logger.error(f"Failed to initialize MANIQA: {e}")
-            raise
+        self.frame_cache = frame_cache or get_shared_frame_cache()
+        self.batch_size = batch_size
+        self.device = device
+        # The model is created once per process and shared by every render
+        self.engine = get_engine_registry().get('maniqa', device, lazy=lazy)
+    
+    @property
+    def model(self):
+        return self.engine.model
 
-    def compute_quality_score(self, image_path: Union[str, Path]) -> float:
+    def compute_quality_score(self, image_path: ImageInput) -> float:
         """
         Compute MANIQA score for a single image.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file or captured frame
             
         Returns:
             Quality score (normalized to 0-100)
         """
         try:
-            # pyiqa handles image loading
-            score = self.model(str(image_path))
+            # Views are passed as tensors from the shared cache rather than decoded by pyiqa
+            score = self.model(self.frame_cache.tensor(image_path))
             
             # MANIQA output is typically raw score, convert to float
-            if torch.is_tensor(score):
+            if hasattr(score, "item"):
                 score = score.item()
                 
             # Normalize: MANIQA scores roughly 0-1, verify scaling
@@ -362,28 +655,53 @@ class MANIQAMetric:
             return float(score * 100)
             
         except Exception as e:
-            logger.error(f"Error computing MANIQA for {image_path}: {e}")
+            logger.error(f"Error computing MANIQA for {image_name(image_path)}: {e}")
             raise
+    
+    def compute_quality_scores(self, view_paths: List[ImageInput]) -> List[Optional[float]]:
+        """
+        Compute MANIQA scores for many views, batch_size views per forward pass.
+        
+        Args:
+            view_paths: List of image paths or captured frames
+            
+        Returns:
+            Quality score per view (0-100), in view order; None where a view failed
+        """
+        raw_scores = batched_inference(
+            self.model, view_tensors(self.frame_cache, view_paths), self.batch_size, min_side=self.MIN_SIDE
+        )
+        return [float(score * 100) if score is not None else None for score in raw_scores]
+    
+    @staticmethod
+    def settings() -> Dict:
+        """Settings that change the per-view score."""
+        return {"metric": "maniqa", "backend": "pyiqa", "min_side": MANIQAMetric.MIN_SIDE}
 
-    def evaluate_views(self, view_paths: List[Union[str, Path]]) -> Dict:
+    def evaluate_views(self, view_paths: List[ImageInput]) -> Dict:
         """
         Evaluate MANIQA quality across multiple views.
         
         Args:
-            view_paths: List of image paths
+            view_paths: List of image paths or captured frames
             
         Returns:
             Dictionary with quality statistics
         """
-        scores = []
-        
-        for path in view_paths:
-            try:
-                score = self.compute_quality_score(path)
-                scores.append(score)
-            except Exception as e:
-                logger.error(f"Error processing {path}: {e}")
+        return self.summarize(self.compute_quality_scores(view_paths))
+    
+    @staticmethod
+    def summarize(scores: List[Optional[float]]) -> Dict:
+        """
+        Aggregate per-view MANIQA scores.
         
+        Args:
+            scores: Quality score per view; None entries (failed views) are skipped
+            
+        Returns:
+            Dictionary with quality statistics
+        """
+        scores = [score for score in scores if score is not None]
         if not scores:
             return {"error": "No valid scores computed"}
         
@@ -0,0 +1,198 @@
+"""
+Parallel per-view scoring for the pixel-level CV metrics (blur and edge density).
+Views fan out to a thread pool (OpenCV releases the GIL) or to a process
+pool that reads decoded frames from shared memory. Scores are returned in
+view order. No model libraries are imported here, which keeps worker
+processes cheap to start.
+
+With the process pool, decoding still happens in the parent (on a thread
+pool, through the shared FrameCache) and the pixels are copied into shared
+memory; only the Laplacian and Canny passes run in the workers, so only
+that part of the work scales with the worker count.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.capture.frame import ImageInput, image_name
+from src.metrics.frame_cache import FrameCache
+
+logger = logging.getLogger(__name__)
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """Blur score: variance of the Laplacian (higher = sharper)."""
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def edge_density(gray: np.ndarray, canny_low: int, canny_high: int) -> float:
+    """Fraction of pixels Canny marks as edges."""
+    edges = cv2.Canny(gray, canny_low, canny_high)
+    return float(np.count_nonzero(edges) / edges.size)
+
+
+def score_gray(gray: np.ndarray, blur: bool, canny: Optional[Tuple[int, int]]) -> Dict[str, float]:
+    """Blur and/or edge density of one grayscale view."""
+    scores = {}
+    if blur:
+        scores["blur"] = laplacian_variance(gray)
+    if canny is not None:
+        scores["edge_density"] = edge_density(gray, *canny)
+    return scores
+
+
+def _init_worker():
+    # One OpenCV thread per worker process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+
+
+def _noop():
+    """Task used to start worker processes."""
+
+
+def _score_shared(shm_name: str, shape: Tuple[int, ...], blur: bool, canny: Optional[Tuple[int, int]]) -> Dict[str, float]:
+    """Process-pool task: score a BGR frame held in a shared memory block."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        bgr = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        del bgr
+        return score_gray(gray, blur, canny)
+    finally:
+        shm.close()
+
+
+_executors: Dict[Tuple[str, int], Executor] = {}
+
+
+def _process_context():
+    # Forking a multithreaded parent (browser, VLM and CV-stage threads) can copy a
+    # held lock into the child and deadlock it, so workers are never plain forks
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def get_executor(kind: str, max_workers: int) -> Executor:
+    """Process-wide pool, created on first use and reused across renders."""
+    key = (kind, max_workers)
+    if key not in _executors:
+        if kind == "process":
+            _executors[key] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_process_context(), initializer=_init_worker
+            )
+        elif kind == "thread":
+            _executors[key] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cv-metrics")
+        else:
+            raise ValueError(f"Unknown CV executor: {kind}")
+    return _executors[key]
+
+
+class ParallelViewScorer:
+    """Scores views for blur and edge density across a worker pool."""
+
+    def __init__(self, executor: str = "thread", max_workers: Optional[int] = None):
+        """
+        Initialize scorer.
+
+        Args:
+            executor: "thread" or "process"
+            max_workers: Pool size; defaults to the CPU count
+        """
+        self.kind = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pool = get_executor(executor, self.max_workers)
+        # Decoding feeds the process pool from the parent, also off the GIL
+        self.decode_pool = get_executor("thread", self.max_workers) if executor == "process" else self.pool
+
+    def warm_up(self):
+        """
+        Start every worker process now instead of on the first render.
+
+        ProcessPoolExecutor only spawns a worker when a task arrives and none
+        is idle, so one no-op task per worker is submitted at once and awaited.
+        """
+        if self.kind != "process":
+            return
+        for future in [self.pool.submit(_noop) for _ in range(self.max_workers)]:
+            future.result()
+
+    def score(
+        self,
+        view_paths: List[ImageInput],
+        frame_cache: FrameCache,
+        blur: bool = True,
+        canny: Optional[Tuple[int, int]] = None
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Score every view.
+
+        Args:
+            view_paths: Image paths or captured frames
+            frame_cache: FrameCache the views are decoded through
+            blur: Compute the Laplacian blur score
+            canny: (low, high) thresholds to compute edge density, or None to skip
+
+        Returns:
+            Per-view score dicts in view order; None for views that failed
+        """
+        if self.kind == "thread":
+            def run(image):
+                return score_gray(frame_cache.gray(image), blur, canny)
+            futures = [self.pool.submit(run, image) for image in view_paths]
+            return self._collect(view_paths, futures)
+
+        blocks: List[Optional[shared_memory.SharedMemory]] = [None] * len(view_paths)
+
+        def stage(index: int):
+            # Decode, then copy the pixels into a block the workers attach to by name
+            bgr = frame_cache.bgr(view_paths[index])
+            shm = shared_memory.SharedMemory(create=True, size=bgr.nbytes)
+            blocks[index] = shm
+            np.ndarray(bgr.shape, dtype=np.uint8, buffer=shm.buf)[...] = bgr
+            return self.pool.submit(_score_shared, shm.name, bgr.shape, blur, canny)
+
+        try:
+            staged = [self.decode_pool.submit(stage, i) for i in range(len(view_paths))]
+            futures = []
+            for future in staged:
+                try:
+                    futures.append(future.result())
+                except Exception as e:
+                    futures.append(e)
+            return self._collect(view_paths, futures)
+        finally:
+            for shm in blocks:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+    @staticmethod
+    def _collect(view_paths: List[ImageInput], futures: List) -> List[Optional[Dict[str, float]]]:
+        results = []
+        for image, future in zip(view_paths, futures):
+            try:
+                if isinstance(future, Exception):
+                    raise future
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Error processing {image_name(image)}: {e}")
+                results.append(None)
+        return results
+
+
+def parallel_scorer_from_config(cv_config: Dict) -> Optional[ParallelViewScorer]:
+    """Scorer as configured under `cv_metrics.parallel`, or None for serial evaluation."""
+    parallel_config = cv_config.get("parallel", {})
+    if not parallel_config.get("enabled", False):
+        return None
+    return ParallelViewScorer(
+        executor=parallel_config.get("executor", "thread"),
+        max_workers=parallel_config.get("max_workers")
+    )
@@ -0,0 +1,152 @@
+"""
+Process-wide registry of pyiqa metric engines.
+Each (metric, device) model is created once and shared by every render, so
+BRISQUE and MANIQA weights are loaded a single time per process. Each
+engine reports its load time and the memory held by its weights (parameters
+and buffers), which is what a reload would cost again.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EngineHandle:
+    """A pyiqa metric, created on first use, with load statistics."""
+
+    def __init__(self, metric_name: str, device: str = "cpu"):
+        self.metric_name = metric_name
+        self.device = device
+        self.load_seconds: Optional[float] = None
+        self.weights_bytes = 0
+        self.requests = 0
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def model(self):
+        """The pyiqa metric, created on first access."""
+        with self._lock:
+            if self._model is None:
+                self._model = self._build()
+            return self._model
+
+    def load(self):
+        """Create the model now if it is not loaded yet."""
+        return self.model
+
+    def _build(self):
+        import pyiqa
+        import torch
+
+        start_time = time.time()
+        try:
+            model = pyiqa.create_metric(self.metric_name, device=torch.device(self.device))
+        except Exception as e:
+            logger.error(f"Failed to initialize {self.metric_name}: {e}")
+            raise
+        self.load_seconds = time.time() - start_time
+        self.weights_bytes = sum(
+            tensor.numel() * tensor.element_size() for tensor in itertools.chain(model.parameters(), model.buffers())
+        )
+        logger.info(
+            f"{self.metric_name} initialized on {self.device} (via pyiqa) in {self.load_seconds:.2f}s, "
+            f"{self.weights_bytes / (1024 ** 2):.1f} MB of weights"
+        )
+        return model
+
+    def release(self):
+        """Drop the model so its memory can be reclaimed; it is rebuilt on next access."""
+        with self._lock:
+            self._model = None
+
+    def stats(self) -> Dict:
+        """Load time, weight memory and reuse count for this engine."""
+        return {
+            "metric": self.metric_name,
+            "device": self.device,
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "weights_mb": self.weights_bytes / (1024 ** 2),
+            "requests": self.requests
+        }
+
+
+class EngineRegistry:
+    """Cache of pyiqa engines keyed by (metric, device)."""
+
+    def __init__(self):
+        self._handles: Dict[tuple, EngineHandle] = {}
+        self._lock = threading.Lock()
+
+    def get(self, metric_name: str, device: str = "cpu", lazy: bool = False) -> EngineHandle:
+        """
+        Return the shared engine for a metric.
+
+        Args:
+            metric_name: pyiqa metric name (e.g. "brisque", "maniqa")
+            device: Torch device string
+            lazy: Defer model creation until the model is first used
+
+        Returns:
+            Engine handle; `handle.model` is the pyiqa metric
+        """
+        key = (metric_name, device)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = EngineHandle(metric_name, device)
+                self._handles[key] = handle
+            handle.requests += 1
+        if not lazy:
+            handle.load()
+        return handle
+
+    def evict(self, metric_name: str, device: str = "cpu") -> bool:
+        """Release an engine's model. Returns True if it was loaded."""
+        with self._lock:
+            handle = self._handles.pop((metric_name, device), None)
+        if handle is None or not handle.loaded:
+            return False
+        handle.release()
+        logger.info(f"Evicted {metric_name} ({device})")
+        return True
+
+    def stats(self) -> List[Dict]:
+        """Statistics for every registered engine."""
+        with self._lock:
+            return [handle.stats() for handle in self._handles.values()]
+
+    def log_report(self):
+        """Log a short summary of the registered engines."""
+        for item in self.stats():
+            if not item["loaded"]:
+                continue
+            logger.info(
+                f"Engine {item['metric']} ({item['device']}): load {item['load_seconds']:.2f}s, "
+                f"weights {item['weights_mb']:.1f} MB, requested {item['requests']} time(s)"
+            )
+
+    def clear(self):
+        """Release every engine."""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            handle.release()
+
+
+_registry = EngineRegistry()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Return the process-wide engine registry."""
+    return _registry
@@ -0,0 +1,151 @@
+"""
+Decode-once frame cache shared by the CV metrics.
+Each view is decoded a single time; the BGR, grayscale and normalized
+tensor forms derived from it are kept per view and released
+least-recently-used beyond a frame budget. Metrics built without an
+explicit cache share the process-wide one, so no view is decoded twice.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+
+from src.capture.frame import Frame, ImageInput, load_bgr
+
+logger = logging.getLogger(__name__)
+
+
+class CachedFrame:
+    """Decoded forms of one view, derived lazily from its BGR pixels."""
+
+    def __init__(self, bgr: np.ndarray, source: Optional[Frame] = None):
+        self.bgr = bgr
+        self.gray: Optional[np.ndarray] = None
+        self.tensor = None
+        # Holding the frame keeps its id() from being reused while cached
+        self.source = source
+
+
+class FrameCache:
+    """LRU cache of decoded views with per-stage timing."""
+
+    def __init__(self, max_frames: int = 32):
+        """
+        Initialize cache.
+
+        Args:
+            max_frames: Number of views kept decoded; least recently used views are released beyond it
+        """
+        self.max_frames = max_frames
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.timing = {"decode": 0.0, "gray": 0.0, "tensor": 0.0}
+        self._entries: "OrderedDict[Hashable, CachedFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(image: ImageInput) -> Hashable:
+        if isinstance(image, Frame):
+            return ("frame", id(image))
+        path = Path(image).resolve()
+        # A re-captured view under the same name must not hit a stale entry
+        return ("path", str(path), path.stat().st_mtime_ns)
+
+    def _add_time(self, stage: str, start_time: float):
+        self.timing[stage] += time.perf_counter() - start_time
+
+    def _entry(self, image: ImageInput) -> CachedFrame:
+        key = self._key(image)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+
+        # Decode outside the lock so parallel workers decode different views concurrently
+        start_time = time.perf_counter()
+        entry = CachedFrame(load_bgr(image), image if isinstance(image, Frame) else None)
+
+        with self._lock:
+            self._add_time("decode", start_time)
+            self.stats["misses"] += 1
+            if key in self._entries:
+                # Another worker decoded the same view meanwhile; keep a single copy
+                entry = self._entries[key]
+                self._entries.move_to_end(key)
+                return entry
+
+            self._entries[key] = entry
+            while len(self._entries) > self.max_frames:
+                _, evicted = self._entries.popitem(last=False)
+                if evicted.source is not None:
+                    evicted.source.release()
+                self.stats["evictions"] += 1
+            return entry
+
+    def bgr(self, image: ImageInput) -> np.ndarray:
+        """BGR pixels (OpenCV channel order)."""
+        return self._entry(image).bgr
+
+    def gray(self, image: ImageInput) -> np.ndarray:
+        """Single-channel grayscale pixels."""
+        entry = self._entry(image)
+        if entry.gray is None:
+            start_time = time.perf_counter()
+            gray = cv2.cvtColor(entry.bgr, cv2.COLOR_BGR2GRAY)
+            with self._lock:
+                self._add_time("gray", start_time)
+                if entry.gray is None:
+                    entry.gray = gray
+        return entry.gray
+
+    def tensor(self, image: ImageInput):
+        """[1, 3, H, W] RGB float tensor in [0, 1], the input pyiqa builds when loading a file."""
+        import torch
+
+        entry = self._entry(image)
+        if entry.tensor is None:
+            start_time = time.perf_counter()
+            rgb = np.ascontiguousarray(entry.bgr[..., ::-1])
+            tensor = torch.from_numpy(rgb).permute(2, 0, 1).unsqueeze(0).float() / 255.0
+            with self._lock:
+                self._add_time("tensor", start_time)
+                if entry.tensor is None:
+                    entry.tensor = tensor
+        return entry.tensor
+
+    def clear(self):
+        """Release every cached view."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.source is not None:
+                    entry.source.release()
+            self._entries.clear()
+
+    def report(self) -> Dict:
+        """Cache counters and seconds spent in each decode stage."""
+        with self._lock:
+            return {
+                **self.stats,
+                **{f"{stage}_seconds": round(seconds, 4) for stage, seconds in self.timing.items()}
+            }
+
+
+_shared_cache = FrameCache()
+
+
+def get_shared_frame_cache() -> FrameCache:
+    """Return the process-wide cache used by metrics constructed without one."""
+    return _shared_cache
+
+
+def frame_cache_from_config(cv_config: Dict) -> FrameCache:
+    """Cache as configured under `cv_metrics.frame_cache`."""
+    cache_config = cv_config.get("frame_cache", {})
+    return FrameCache(max_frames=cache_config.get("max_frames", 32))
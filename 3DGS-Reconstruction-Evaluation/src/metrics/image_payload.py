@@ -0,0 +1,186 @@
+"""
+Upload preparation for VLM judgements of rendered views.
+Captured screenshots (PNG files or in-memory frames) are downscaled to the
+resolution the API uses for the configured detail tier and re-encoded as
+JPEG or WebP before upload, which cuts request size without changing what
+the model sees. Encoded payloads are cached per image content.
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from PIL import Image
+
+from src.capture.frame import ImageInput, image_bytes, image_name
+
+logger = logging.getLogger(__name__)
+
+
+MIME_TYPES = {
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+
+def detail_target_size(width: int, height: int, detail: str) -> Tuple[int, int]:
+    """
+    Size the API would downscale an image to for a detail tier.
+    "low" fits into 512x512; "high" fits into 2048x2048, then scales the
+    shorter side down to 768. Images are never upscaled.
+    """
+    if detail == "low":
+        scale = min(1.0, 512 / max(width, height))
+    else:
+        scale = min(1.0, 2048 / max(width, height))
+        short_side = min(width, height) * scale
+        if short_side > 768:
+            scale *= 768 / short_side
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class ImagePayload:
+    """An encoded image ready to send, with size and preparation time."""
+
+    def __init__(self, data: bytes, mime_type: str, source_bytes: int, prep_seconds: float, cached: bool):
+        self.data = data
+        self.mime_type = mime_type
+        self.source_bytes = source_bytes
+        self.prep_seconds = prep_seconds
+        self.cached = cached
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('utf-8')}"
+
+    @property
+    def num_bytes(self) -> int:
+        return len(self.data)
+
+
+class ImagePayloadPreparer:
+    """Resizes and re-encodes images for a detail tier, caching the results."""
+
+    def __init__(
+        self,
+        detail: str = "high",
+        image_format: str = "jpeg",
+        quality: int = 90,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_memory_items: int = 256
+    ):
+        """
+        Initialize preparer.
+
+        Args:
+            detail: API detail tier ("low" or "high") the images are sent with
+            image_format: Upload encoding ("jpeg" or "webp")
+            quality: Encoder quality (1-100)
+            cache_dir: Directory for encoded payloads, or None for in-memory caching only
+            max_memory_items: Payloads kept in memory (least recently used are dropped)
+        """
+        if image_format not in MIME_TYPES:
+            raise ValueError(f"Unsupported upload format: {image_format}")
+
+        self.detail = detail
+        self.image_format = image_format
+        self.quality = quality
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.stats = {"hits": 0, "misses": 0}
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.image_format]
+
+    def _key(self, source: bytes) -> str:
+        digest = hashlib.sha256(source).hexdigest()
+        settings = f"{digest}:{self.detail}:{self.image_format}:{self.quality}"
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Resize an image for the detail tier and encode it."""
+        image = image.convert("RGB")
+        size = detail_target_size(image.width, image.height, self.detail)
+        if size != image.size:
+            image = image.resize(size, Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format=self.image_format.upper(), quality=self.quality)
+        return buffer.getvalue()
+
+    def prepare(self, image_path: ImageInput) -> ImagePayload:
+        """Encoded payload for an image file or captured frame, from cache when available."""
+        start_time = time.time()
+        source = image_bytes(image_path)
+        key = self._key(source)
+        cache_path = self.cache_dir / f"{key}.{self.image_format}" if self.cache_dir else None
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is None and cache_path is not None and cache_path.exists():
+            data = cache_path.read_bytes()
+
+        cached = data is not None
+        if not cached:
+            with Image.open(BytesIO(source)) as image:
+                data = self.encode(image)
+            if cache_path is not None:
+                cache_path.write_bytes(data)
+
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+            self.stats["hits" if cached else "misses"] += 1
+
+        payload = ImagePayload(data, self.mime_type, len(source), time.time() - start_time, cached)
+        logger.info(
+            f"Prepared {image_name(image_path)}: {payload.source_bytes / 1024:.0f} KB -> "
+            f"{payload.num_bytes / 1024:.0f} KB in {payload.prep_seconds * 1000:.0f} ms"
+            f"{' (cached)' if cached else ''}"
+        )
+        return payload
+
+
+def payload_preparer_from_config(vlm_config: Dict) -> ImagePayloadPreparer:
+    """Preparer as configured under `vlm_metrics`."""
+    upload_config = vlm_config.get("upload", {})
+    return ImagePayloadPreparer(
+        detail=vlm_config.get("detail", "high"),
+        image_format=upload_config.get("format", "jpeg"),
+        quality=upload_config.get("quality", 90),
+        cache_dir=upload_config.get("cache_dir", "cache/vlm_payloads"),
+        max_memory_items=upload_config.get("memory_items", 256)
+    )
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = Path(tmp) / "view.png"
+        Image.new("RGB", (1920, 1080), color=(90, 80, 70)).save(image_path)
+
+        for detail in ["low", "high"]:
+            preparer = ImagePayloadPreparer(detail=detail, cache_dir=Path(tmp) / "payloads")
+            payload = preparer.prepare(image_path)
+            with Image.open(BytesIO(payload.data)) as encoded:
+                print(
+                    f"{detail}: {payload.source_bytes / 1024:.0f} KB PNG -> "
+                    f"{payload.num_bytes / 1024:.0f} KB {payload.mime_type} {encoded.size}"
+                )
@@ -0,0 +1,142 @@
+"""
+Persistent cache of per-image VLM judgements.
+Judgements are keyed by screenshot content, model, prompts and request
+options, stored as one JSON file each and evicted least-recently-used
+beyond an entry budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class JudgementCache:
+    """On-disk LRU cache of parsed VLM judgements."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "cache/vlm_judgements",
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per judgement
+            max_entries: Entry budget; least recently used entries are removed beyond it
+            ttl_seconds: Optional age after which an entry is treated as missing
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._count: Optional[int] = None  # Entries on disk, counted on the first put
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_digest: str, model: str, prompt: str, **options) -> str:
+        """Key from screenshot content hash (see ledger.image_hash), model, prompt hash and request options."""
+        payload = {
+            "image": image_digest,
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "options": options
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached judgement, or None if missing or expired."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.stats["misses"] += 1
+                return None
+
+            if self.ttl_seconds is not None and time.time() - entry["created"] > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                if self._count is not None:
+                    self._count -= 1
+                self.stats["misses"] += 1
+                return None
+
+            # Refresh recency for LRU eviction
+            os.utime(path)
+            self.stats["hits"] += 1
+            return entry["judgement"]
+
+    def contains(self, key: str) -> bool:
+        """Whether a judgement is cached and unexpired, without counting a hit or refreshing it."""
+        path = self._path(key)
+        try:
+            if self.ttl_seconds is None:
+                return path.exists()
+            with open(path, "r") as f:
+                return time.time() - json.load(f)["created"] <= self.ttl_seconds
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def put(self, key: str, judgement: Dict):
+        """Store a judgement and evict least recently used entries beyond the budget."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with self._lock:
+            is_new = not path.exists()
+            with open(tmp_path, "w") as f:
+                json.dump({"created": time.time(), "judgement": judgement}, f)
+            os.replace(tmp_path, path)
+
+            # The directory is only scanned when the running count exceeds the budget
+            if self._count is None:
+                self._count = sum(1 for _ in self.cache_dir.glob("*.json"))
+            elif is_new:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # Trim to 90% of the budget, so the next puts do not rescan straight away
+        entries = list(self.cache_dir.glob("*.json"))
+        keep = int(self.max_entries * 0.9)
+        if len(entries) <= keep:
+            self._count = len(entries)
+            return
+
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries.sort(key=last_used)
+        for path in entries[:len(entries) - keep]:
+            path.unlink(missing_ok=True)
+            self.stats["evictions"] += 1
+        self._count = keep
+
+
+def judgement_cache_from_config(vlm_config: Dict) -> Optional[JudgementCache]:
+    """Cache as configured under `vlm_metrics.cache`, or None when disabled."""
+    cache_config = vlm_config.get("cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+    ttl_hours = cache_config.get("ttl_hours")
+    return JudgementCache(
+        cache_dir=cache_config.get("cache_dir", "cache/vlm_judgements"),
+        max_entries=cache_config.get("max_entries", 5000),
+        ttl_seconds=ttl_hours * 3600 if ttl_hours is not None else None
+    )
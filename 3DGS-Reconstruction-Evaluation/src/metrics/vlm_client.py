@@ -0,0 +1,299 @@
+"""
+Asynchronous client layer for VLM requests.
+Shares token-bucket limits for requests/min and tokens/min across all
+callers, bounds the number of requests in flight and retries transient
+failures with jittered exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from importlib.util import find_spec
+from typing import Dict, Optional, Tuple
+
+# openai is imported when the first HTTP client is created, so CV-only runs skip it
+OPENAI_AVAILABLE = find_spec("openai") is not None
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+    Only touched from the event loop, so check-and-take needs no lock.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            per_minute: Refill rate in tokens per minute
+            capacity: Burst size (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until `amount` tokens are available and take them.
+        Requests larger than the capacity are let through from a full bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= min(amount, self.capacity):
+                self.tokens -= amount
+                return waited
+            delay = (min(amount, self.capacity) - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) tokens once the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Only transient API failures: connection errors, timeouts, 429s and 5xx.
+    # Anything else (including bugs such as TypeError) is raised immediately.
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):  # Includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncVLMClient:
+    """Rate-limited, retrying wrapper around the async OpenAI Responses API."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 200000,
+        max_in_flight: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        timeout: float = 120.0
+    ):
+        """
+        Initialize client.
+
+        Args:
+            base_url: OpenAI-compatible endpoint (None for the default API)
+            requests_per_minute: Request rate limit shared by all callers
+            tokens_per_minute: Token rate limit shared by all callers
+            max_in_flight: Maximum concurrent requests
+            max_retries: Retries for transient failures
+            backoff_base: First backoff delay in seconds
+            backoff_max: Upper bound for a backoff delay in seconds
+            timeout: Per-request timeout in seconds
+        """
+        if not OPENAI_AVAILABLE:
+            raise ImportError("openai package required for VLM metrics")
+
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+
+        # HTTP clients and semaphores belong to an event loop, so each loop gets its own
+        self._bindings: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple]" = weakref.WeakKeyDictionary()
+
+    def _bind_loop(self) -> Tuple:
+        loop = asyncio.get_running_loop()
+        binding = self._bindings.get(loop)
+        if binding is None:
+            from openai import AsyncOpenAI
+
+            # Retries are handled here, so the SDK's own retries are turned off
+            client = AsyncOpenAI(base_url=self.base_url, max_retries=0, timeout=self.timeout)
+            binding = (client, asyncio.Semaphore(self.max_in_flight))
+            self._bindings[loop] = binding
+        return binding
+
+    async def aclose(self):
+        """Close the HTTP client bound to the running loop, if any."""
+        binding = self._bindings.pop(asyncio.get_running_loop(), None)
+        if binding is not None:
+            await binding[0].close()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def create_response(self, estimated_tokens: int = 1000, **request):
+        """
+        Send one Responses API request within the shared limits.
+
+        Args:
+            estimated_tokens: Token cost charged up front, corrected from usage afterwards
+            **request: Arguments for `responses.create`
+
+        Returns:
+            The API response
+        """
+        client, in_flight = self._bind_loop()
+
+        for attempt in range(self.max_retries + 1):
+            throttled = await self.request_bucket.acquire(1)
+            throttled += await self.token_bucket.acquire(estimated_tokens)
+            self.stats["throttled_seconds"] += throttled
+
+            try:
+                async with in_flight:
+                    self.stats["requests"] += 1
+                    response = await client.responses.create(**request)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self.stats["failures"] += 1
+                    logger.error(f"VLM call failed after {attempt} retries: {e}")
+                    raise
+
+                delay = _retry_after(e) or self.backoff_delay(attempt)
+                self.stats["retries"] += 1
+                logger.warning(
+                    f"VLM call failed, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries}): {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(response, "usage", None)
+            total_tokens = getattr(usage, "total_tokens", None)
+            if total_tokens is not None:
+                self.token_bucket.adjust(estimated_tokens - total_tokens)
+            return response
+
+
+_clients: Dict[Tuple, AsyncVLMClient] = {}
+
+
+def get_vlm_client(vlm_config: Dict) -> AsyncVLMClient:
+    """Return the process-wide client for an endpoint, so all renders share its limits."""
+    key = (vlm_config.get("base_url"), vlm_config.get("model", "gpt-5-nano"))
+    if key not in _clients:
+        _clients[key] = AsyncVLMClient(
+            base_url=vlm_config.get("base_url"),
+            requests_per_minute=vlm_config.get("requests_per_minute", 500),
+            tokens_per_minute=vlm_config.get("tokens_per_minute", 200000),
+            max_in_flight=vlm_config.get("max_in_flight", 16),
+            max_retries=vlm_config.get("max_retries", 3),
+            backoff_base=vlm_config.get("backoff_base", 1.0),
+            backoff_max=vlm_config.get("backoff_max", 30.0),
+            timeout=vlm_config.get("request_timeout", 120.0)
+        )
+    return _clients[key]
+
+
+async def close_vlm_clients():
+    """Close every shared client's HTTP connections for the running loop."""
+    for client in list(_clients.values()):
+        await client.aclose()
+
+
+def run_sync(coro):
+    """Run a coroutine on a new event loop, closing the VLM connections it opened."""
+    async def run():
+        try:
+            return await coro
+        finally:
+            await close_vlm_clients()
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    # Exercise the client against a local mock of the Responses API that
+    # rejects some requests with 429, so throttling and retries are visible
+    import http.server
+    import json
+    import os
+    import socketserver
+    import threading
+
+    class MockHandler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(0.2)  # Simulated inference time
+
+            if random.random() < 0.2:
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b'{"error": {"message": "rate limited", "type": "rate_limit"}}')
+                return
+
+            body = json.dumps({
+                "id": "resp_mock",
+                "object": "response",
+                "created_at": int(time.time()),
+                "model": "mock",
+                "status": "completed",
+                "output": [{
+                    "type": "message",
+                    "id": "msg_mock",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": '{"overall_score": 7}', "annotations": []}]
+                }],
+                "usage": {"input_tokens": 900, "output_tokens": 100, "total_tokens": 1000}
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    async def run(base_url: str, num_requests: int = 40):
+        client = AsyncVLMClient(
+            base_url=base_url, requests_per_minute=600, max_in_flight=8, backoff_base=0.2
+        )
+        start = time.time()
+        responses = await asyncio.gather(*[
+            client.create_response(model="mock", input="ping") for _ in range(num_requests)
+        ])
+        elapsed = time.time() - start
+        print(f"{len(responses)} responses in {elapsed:.1f}s ({len(responses) / elapsed * 60:.0f}/min)")
+        print(f"Stats: {client.stats}")
+        await client.aclose()
+
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    with socketserver.ThreadingTCPServer(("127.0.0.1", 0), MockHandler) as httpd:
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        asyncio.run(run(f"http://127.0.0.1:{httpd.server_address[1]}/v1"))
+        httpd.shutdown()
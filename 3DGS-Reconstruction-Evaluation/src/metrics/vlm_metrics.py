@@ -3,27 +3,48 @@ Vision Language Model-based metrics for 3DGS reconstruction quality evaluation.
 Uses OpenAI Vision API (GPT-5-nano) for semantic quality assessment.
 """
 
+import asyncio
 import time
 import base64
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Optional
 import logging
 import re
 import os
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from src.metrics.vlm_client import OPENAI_AVAILABLE, get_vlm_client, run_sync
+
+if not OPENAI_AVAILABLE:
     logging.warning("openai not available. VLM metrics will be disabled.")
 
 import numpy as np
 
+from src.capture.frame import ImageInput, image_name
+from src.metrics.image_payload import payload_preparer_from_config
+from src.metrics.judgement_cache import JudgementCache, judgement_cache_from_config
+from src.ledger import image_hash
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+IMAGE_PROMPT = """
+        Analyze this 3D reconstruction image.
+        Provide the full evaluation as specified in the system instructions.
+        
+        Respond with a JSON object.
+        Example format:
+        {
+            "overall_score": 8,
+            "structural_defects": {...},
+            "texture_artifacts": {...},
+            "subscores": {...},
+            "summary": "Analysis..."
+        }
+        """
+
+
 class VLMEvaluator:
     """
     Evaluates 3DGS reconstruction quality using Vision Language Models.
@@ -43,11 +64,19 @@ class VLMEvaluator:
         self.config = config
         self.vlm_config = config.get("vlm_metrics", {})
         
-        self.client = OpenAI()
+        # Shared across evaluators, so rate limits hold for the whole process
+        self.client = get_vlm_client(self.vlm_config)
         
         self.model_name = self.vlm_config.get("model", "gpt-5-nano")
-        self.max_retries = self.vlm_config.get("max_retries", 3)
-        self.rate_limit_delay = self.vlm_config.get("rate_limit_delay", 1.0)
+        self.expected_output_tokens = self.vlm_config.get("expected_output_tokens", 2000)
+        self.detail = self.vlm_config.get("detail", "high")
+        self.reasoning_effort = self.vlm_config.get("reasoning_effort", "low")
+        
+        # Parsed judgements for unchanged screenshots are reused across runs
+        self.judgement_cache = judgement_cache_from_config(self.vlm_config)
+        
+        # Screenshots are resized to the detail tier and re-encoded before upload
+        self.payload_preparer = payload_preparer_from_config(self.vlm_config)
         
         self.system_prompt = \
         """
@@ -128,70 +157,71 @@ class VLMEvaluator:
         """
         logger.info(f"VLM Evaluator initialized with {self.model_name}")
     
-    def encode_image(self, image_path: Union[str, Path]) -> str:
-        """Encode image to base64 string."""
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
-
-    def call_vlm(self, prompt: str, image_path: Union[str, Path], retries: int = 0) -> str:
+    def encode_image(self, image_path: ImageInput) -> str:
+        """Encode image to base64 string, resized and re-encoded for upload."""
+        return base64.b64encode(self.payload_preparer.prepare(image_path).data).decode('utf-8')
+
+    def _estimate_tokens(self, prompt: str) -> int:
+        """Rough token cost of one request, charged against the tokens/min limit up front."""
+        # 85 base tokens plus 170 per 512px tile; a high-detail 768x1365 image has 6 tiles
+        image_tokens = 85 if self.detail == "low" else 85 + 170 * 6
+        text_tokens = (len(self.system_prompt) + len(prompt)) // 4
+        return image_tokens + text_tokens + self.expected_output_tokens
+
+    async def call_vlm_async(self, prompt: str, image_path: ImageInput) -> str:
         """
-        Call VLM API with retry logic for a single image.
+        Call VLM API for a single image through the shared rate-limited client.
         
         Args:
             prompt: Text prompt
-            image_path: Path to image
-            retries: Current retry count
+            image_path: Path to image or captured frame
             
         Returns:
             Model response text
         """
-        try:
-            # Encode image
-            base64_image = self.encode_image(image_path)
-            
-            # Prepare messages
-            messages = [
-                {
-                    "role": "developer",
-                    "content": self.system_prompt
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": prompt},
-                        {
-                            "type": "input_image",
-                            "image_url": f"data:image/jpeg;base64,{base64_image}",
-                            "detail": "high"
-                        }
-                    ]
-                }
-            ]
-            
-            # Generate response
-            response = self.client.responses.create(
-                model=self.model_name,
-                input=messages,
-                reasoning={ "effort": "low" },
-                max_output_tokens=10000,
-            )
-            
-            # Rate limiting
-            time.sleep(self.rate_limit_delay)
-            
-            result_text = response.output_text
-            # print(result_text) # Optional debug
-            
-            return result_text
-            
-        except Exception as e:
-            if retries < self.max_retries:
-                logger.warning(f"VLM call failed, retrying ({retries + 1}/{self.max_retries}): {e}")
-                time.sleep(2 ** retries)
-                return self.call_vlm(prompt, image_path, retries + 1)
-            else:
-                logger.error(f"VLM call failed after {self.max_retries} retries: {e}")
-                raise
+        # Resize and re-encode image for the detail tier, off the event loop
+        payload = await asyncio.to_thread(self.payload_preparer.prepare, image_path)
+        image_url = payload.data_url
+        
+        # Prepare messages
+        messages = [
+            {
+                "role": "developer",
+                "content": self.system_prompt
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "input_text", "text": prompt},
+                    {
+                        "type": "input_image",
+                        "image_url": image_url,
+                        "detail": self.detail
+                    }
+                ]
+            }
+        ]
+        
+        # Generate response
+        request_start = time.time()
+        response = await self.client.create_response(
+            estimated_tokens=self._estimate_tokens(prompt),
+            model=self.model_name,
+            input=messages,
+            reasoning={ "effort": self.reasoning_effort },
+            max_output_tokens=10000,
+        )
+        logger.info(
+            f"VLM request for {image_name(image_path)}: {len(image_url) / 1024:.0f} KB sent "
+            f"({payload.source_bytes / 1024:.0f} KB PNG, prepared in {payload.prep_seconds:.2f}s), "
+            f"response in {time.time() - request_start:.2f}s"
+        )
+        
+        return response.output_text
+
+    def call_vlm(self, prompt: str, image_path: ImageInput) -> str:
+        """Synchronous wrapper around call_vlm_async."""
+        return run_sync(self.call_vlm_async(prompt, image_path))
 
     def _extract_scores_from_json(self, response: str) -> Dict[str, any]:
         """
@@ -214,46 +244,101 @@ class VLMEvaluator:
             
         return {}
 
-    def evaluate_image_single(self, image_path: Union[str, Path]) -> Dict[str, any]:
+    async def evaluate_image_single_async(self, image_path: ImageInput, view_hash: Optional[str] = None) -> Dict[str, any]:
         """
         Evaluate a single image for all metrics.
         
         Args:
-            image_path: Path to image
+            image_path: Path to image or captured frame
+            view_hash: Content hash of the image, if already known (see ledger.image_hash)
             
         Returns:
             Dictionary with parsed results
         """
-        prompt = """
-        Analyze this 3D reconstruction image.
-        Provide the full evaluation as specified in the system instructions.
+        prompt = IMAGE_PROMPT
         
-        Respond with a JSON object.
-        Example format:
-        {
-            "overall_score": 8,
-            "structural_defects": {...},
-            "texture_artifacts": {...},
-            "subscores": {...},
-            "summary": "Analysis..."
-        }
-        """
+        cache_key = None
+        if self.judgement_cache is not None:
+            if view_hash is None:
+                # Hashing a full-size PNG is kept off the event loop
+                view_hash = await asyncio.to_thread(image_hash, image_path)
+            cache_key = self.cache_key(view_hash)
+            cached = await asyncio.to_thread(self.judgement_cache.get, cache_key)
+            if cached is not None:
+                logger.info(f"Using cached VLM judgement for {image_name(image_path)}")
+                cached["cached"] = True
+                return cached
         
         try:
-            response = self.call_vlm(prompt, image_path)
+            response = await self.call_vlm_async(prompt, image_path)
             # print(response)
             scores = self._extract_scores_from_json(response)
+            # Only cache parsed judgements, so failures are retried next run
+            if cache_key is not None and scores:
+                await asyncio.to_thread(self.judgement_cache.put, cache_key, scores)
             return scores
         except Exception as e:
             logger.error(f"Single image evaluation failed for {image_path}: {e}")
             return {}
 
-    def evaluate_views(self, view_paths: List[Union[str, Path]]) -> Dict:
+    def cache_key(self, view_hash: str) -> str:
+        """Judgement cache key of a view under the current model, prompts and request options."""
+        return JudgementCache.make_key(
+            view_hash,
+            self.model_name,
+            self.system_prompt + IMAGE_PROMPT,
+            reasoning_effort=self.reasoning_effort,
+            detail=self.detail,
+            upload_format=self.payload_preparer.image_format,
+            upload_quality=self.payload_preparer.quality
+        )
+
+    def evaluate_image_single(self, image_path: ImageInput) -> Dict[str, any]:
+        """Synchronous wrapper around evaluate_image_single_async."""
+        return run_sync(self.evaluate_image_single_async(image_path))
+
+    def settings(self) -> Dict:
+        """Settings that change a per-view judgement."""
+        return {
+            "model": self.model_name,
+            "prompt": hashlib.sha256((self.system_prompt + IMAGE_PROMPT).encode("utf-8")).hexdigest(),
+            "reasoning_effort": self.reasoning_effort,
+            "detail": self.detail,
+            "upload_format": self.payload_preparer.image_format,
+            "upload_quality": self.payload_preparer.quality
+        }
+
+    async def evaluate_view_async(self, path: ImageInput, view_hash: Optional[str] = None) -> Dict:
+        """
+        Judge one view, tagged with its file name.
+        
+        Args:
+            path: Path to image or captured frame
+            view_hash: Content hash of the image, if already known
+            
+        Returns:
+            Parsed judgement, or {"image_path", "error"} on failure
+        """
+        try:
+            logger.info(f"Processing view: {image_name(path)}")
+            res = await self.evaluate_image_single_async(path, view_hash)
+
+            # Add filename for reference
+            res["image_path"] = image_name(path)
+            return res
+        except Exception as e:
+            logger.error(f"Error processing {path}: {e}")
+            # Return empty detail on error
+            return {"image_path": image_name(path), "error": str(e)}
+
+    async def evaluate_views_async(self, view_paths: List[ImageInput], view_hashes: Optional[List[str]] = None) -> Dict:
         """
         Evaluate all VLM metrics across multiple views concurrently.
+        Requests are paced by the shared client's rate limits and in-flight window.
         
         Args:
-            view_paths: List of image paths
+            view_paths: List of image paths or captured frames
+            view_hashes: Image hash per view, if already computed
             
         Returns:
             Dictionary with aggregated VLM metrics
@@ -261,24 +346,32 @@ class VLMEvaluator:
         if not self.vlm_config.get("enabled", True):
             return {"error": "VLM metrics disabled in config"}
         
-        import concurrent.futures
+        logger.info(
+            f"Evaluating {len(view_paths)} views with VLM "
+            f"(async, max in flight={self.client.max_in_flight})..."
+        )
         
-        # Determine max workers (default to 5 or config)
-        max_workers = self.vlm_config.get("max_workers", 5)
-        logger.info(f"Evaluating {len(view_paths)} views with VLM (Concurrent, workers={max_workers})...")
+        # gather preserves order
+        hashes = view_hashes or [None] * len(view_paths)
+        details = await asyncio.gather(*[self.evaluate_view_async(path, h) for path, h in zip(view_paths, hashes)])
+        return self.summarize(details)
+
+    def summarize(self, details: List[Dict]) -> Dict:
+        """
+        Aggregate per-view judgements.
         
+        Args:
+            details: Judgement per view, as returned by evaluate_view_async
+            
+        Returns:
+            Dictionary with aggregated VLM metrics
+        """
         quality_scores = []
         artifact_scores = []
         structural_scores = []
         
-        def process_view(path):
+        for res in details:
             try:
-                logger.info(f"Processing view: {Path(path).name}")
-                res = self.evaluate_image_single(path)
-
-                # Add filename for reference
-                res["image_path"] = str(Path(path).name)
-                
                 # Extract scores (defaulting to 5.0 on error inside helper)
                 q = float(res.get("overall_score", 5.0))
                 
@@ -288,29 +381,23 @@ class VLMEvaluator:
                 artifact_severity = max(1.0, 11.0 - tex_score)
                 
                 geo_score = float(sub.get("geometry_score", 5.0))
-                
-                return q, artifact_severity, geo_score, res
             except Exception as e:
-                logger.error(f"Error processing {path}: {e}")
-                # Return empty detail on error
-                return 5.0, 5.0, 5.0, {"image_path": str(Path(path).name), "error": str(e)}
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # map preserves order
-            results_list = list(executor.map(process_view, view_paths))
+                logger.error(f"Error processing {res.get('image_path')}: {e}")
+                q, artifact_severity, geo_score = 5.0, 5.0, 5.0
             
-        detailed_evaluations = []
-        for q, a, s, detail in results_list:
             quality_scores.append(q)
-            artifact_scores.append(a)
-            structural_scores.append(s)
-            detailed_evaluations.append(detail)
+            artifact_scores.append(artifact_severity)
+            structural_scores.append(geo_score)
+        
+        detailed_evaluations = list(details)
         
         results = {
             "model": self.model_name,
-            "num_views": len(view_paths),
+            "num_views": len(details),
             "image_details": detailed_evaluations
         }
+        if self.judgement_cache is not None:
+            results["cached_views"] = sum(1 for d in detailed_evaluations if d.get("cached"))
         
         # Helper to compute stats
         def compute_stats(score_list):
@@ -350,17 +437,25 @@ class VLMEvaluator:
         
         return results
 
+    def evaluate_views(self, view_paths: List[ImageInput]) -> Dict:
+        """Synchronous wrapper around evaluate_views_async."""
+        return run_sync(self.evaluate_views_async(view_paths))
 
-def evaluate_all_vlm_metrics(
-    view_paths: List[Union[str, Path]], 
-    config: Dict
+
+async def evaluate_all_vlm_metrics_async(
+    view_paths: List[ImageInput], 
+    config: Dict,
+    view_hashes: Optional[List[str]] = None
 ) -> Dict:
     """
     Run all enabled VLM metrics on a set of views.
+    Judgements of unchanged views are reused from the bounded judgement
+    cache (`vlm_metrics.cache`) and only the rest are requested.
     
     Args:
-        view_paths: List of image paths
+        view_paths: List of image paths or captured frames
         config: Configuration dictionary
+        view_hashes: Image hash per view, if already computed (saves hashing them again)
         
     Returns:
         Dictionary with all VLM metric results
@@ -371,13 +466,20 @@ def evaluate_all_vlm_metrics(
     
     try:
         evaluator = VLMEvaluator(config)
-        results = evaluator.evaluate_views(view_paths)
-        return results
+        return await evaluator.evaluate_views_async(view_paths, view_hashes)
     except Exception as e:
         logger.error(f"VLM evaluation failed: {e}")
         return {"error": str(e)}
 
 
+def evaluate_all_vlm_metrics(
+    view_paths: List[ImageInput], 
+    config: Dict
+) -> Dict:
+    """Synchronous wrapper around evaluate_all_vlm_metrics_async."""
+    return run_sync(evaluate_all_vlm_metrics_async(view_paths, config))
+
+
 if __name__ == "__main__":
     # Test VLM evaluator
     import yaml
@@ -0,0 +1,102 @@
+"""
+Concurrent evaluation of many renders.
+Each render is captured, then scored, as soon as a slot is free. Capture
+slots (browser), CPU metric workers and VLM in-flight requests are limited
+separately, so a slow splat load only holds a capture slot while the other
+renders keep moving. comparison.json is rewritten as each render completes.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class RenderScheduler:
+    """Runs evaluate_render for many renders under separate capture and render limits."""
+
+    def __init__(self, evaluator, capture_slots: int = 2, max_concurrent_renders: int = 4):
+        """
+        Initialize scheduler.
+
+        CPU metric workers are bounded by the evaluator's CV executor and VLM
+        requests by the shared client's in-flight window (`vlm_metrics.max_in_flight`);
+        both are shared by every render in flight.
+
+        Args:
+            evaluator: ReconstructionEvaluator providing capture, metrics and result writing
+            capture_slots: Renders loading in the browser at once
+            max_concurrent_renders: Renders in flight at once (bounds frames held in memory)
+        """
+        self.evaluator = evaluator
+        self.capture_slots = asyncio.Semaphore(capture_slots)
+        self.render_slots = asyncio.Semaphore(max_concurrent_renders)
+        self.stats = {"completed": 0, "failed": 0}
+
+    async def _evaluate(self, render: Dict, skip_capture: bool) -> Dict:
+        name, url = render["name"], render["url"]
+        async with self.render_slots:
+            views, frames = None, None
+            if not skip_capture:
+                async with self.capture_slots:
+                    logger.info(f"Capturing {name}...")
+                    views, frames = await self.evaluator.view_capturer.capture_frames(name, url)
+            # Capture slot is released; metrics for this render overlap with the next captures
+            return await self.evaluator.evaluate_render(name, url, skip_capture, views=views, frames=frames)
+
+    async def run(self, renders: List[Dict], skip_capture: bool = False) -> Dict[str, Dict]:
+        """
+        Evaluate renders concurrently, streaming partial comparisons to disk.
+
+        Args:
+            renders: List of render configurations
+            skip_capture: Skip view capture and use existing images
+
+        Returns:
+            Dictionary mapping render names to their results, in configuration order
+
+        Raises:
+            ValueError: If two renders share a name (results and comparison.json are keyed by name)
+        """
+        names = [render["name"] for render in renders]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate render names: {', '.join(duplicates)}")
+
+        start_time = time.perf_counter()
+        all_results: Dict[str, Dict] = {}
+        pending = list(names)
+
+        async def run_render(render: Dict):
+            name = render["name"]
+            try:
+                results = await self._evaluate(render, skip_capture)
+            except Exception as e:
+                logger.error(f"Failed to evaluate {name}: {e}")
+                results = {"error": str(e)}
+
+            self.stats["failed" if "error" in results else "completed"] += 1
+            all_results[name] = results
+            pending.remove(name)
+            self.evaluator.write_comparison(all_results, pending=pending)
+            logger.info(
+                f"{name} done ({len(renders) - len(pending)}/{len(renders)}, "
+                f"{time.perf_counter() - start_time:.1f}s elapsed)"
+            )
+
+        await asyncio.gather(*[run_render(render) for render in renders])
+
+        return {render["name"]: all_results[render["name"]] for render in renders}
+
+
+def render_scheduler_from_config(evaluator) -> RenderScheduler:
+    """Scheduler as configured under `scheduler`."""
+    config = evaluator.config
+    scheduler_config = config.get("scheduler", {})
+    return RenderScheduler(
+        evaluator,
+        capture_slots=scheduler_config.get("capture_slots", config.get("capture", {}).get("max_contexts", 2)),
+        max_concurrent_renders=scheduler_config.get("max_concurrent_renders", 4)
+    )
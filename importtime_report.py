@@ -0,0 +1,63 @@
+"""
+Import-time report shared by the `startup` benchmarks of both projects.
+Runs a statement in a fresh interpreter under `python -X importtime` and
+summarizes total import time, which heavy packages got loaded and the
+slowest packages by self time.
+"""
+
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+
+def import_profile(
+    statement: str,
+    cwd: Union[str, Path],
+    heavy_modules: List[str]
+) -> Tuple[float, List[Tuple[str, int, int]], List[str]]:
+    """
+    Run a statement in a fresh interpreter under `python -X importtime`.
+    Returns (wall seconds, [(module, self_us, cumulative_us)], heavy modules loaded).
+    """
+    probe = f"{statement}; import sys; print(','.join(m for m in {heavy_modules!r} if m in sys.modules))"
+    start_time = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=str(cwd), capture_output=True, text=True
+    )
+    wall_seconds = time.time() - start_time
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        # Drop the separator space; the remaining indentation marks nested imports
+        entries.append((fields[2][1:].rstrip(), int(fields[0]), int(fields[1])))
+
+    loaded = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return wall_seconds, entries, loaded
+
+
+def print_import_report(statement: str, cwd: Union[str, Path], heavy_modules: List[str], top: int = 10):
+    """Print total import time, heavy modules loaded and the `top` slowest packages for a statement."""
+    wall_seconds, entries, loaded = import_profile(statement, cwd, heavy_modules)
+    # Top-level entries are not indented; their cumulative times add up to the whole import
+    total_us = sum(cumulative for name, _, cumulative in entries if not name.startswith(" "))
+    print(f"  Interpreter + imports: {wall_seconds:.2f}s wall, {total_us / 1e6:.2f}s importing {len(entries)} modules")
+    print(f"  Heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+    # Self time per top-level package, so a package's submodules are counted together
+    package_us: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in entries:
+        package_us[name.strip().split(".")[0]] += self_us
+    print("\n  Slowest packages (self time):")
+    for package, self_us in sorted(package_us.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {package:<24} {self_us / 1e3:8.1f} ms")
@@ -0,0 +1,216 @@
+"""
+Micro-benchmarks for the semantic labeling pipeline.
+
+Usage:
+    python benchmark.py evaluator            # Encoder passes and time per property
+    python benchmark.py siglip-classifier    # Images/sec, zero-shot pipeline vs. direct model path
+    python benchmark.py startup              # Import time of main.py with the configured backends
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import yaml
+
+
+def load_benchmark_properties(
+    results_path: str,
+    image_cache_dir: str,
+    max_properties: int
+) -> List[Tuple[str, List[str], List[str]]]:
+    """
+    Pair the labels from a previous results file with the cached images.
+    Returns list of (property_id, labels, image_paths) tuples.
+    """
+    with open(results_path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+
+    properties = []
+    for prop in results.get('properties', [])[:max_properties]:
+        property_id = prop['property_id']
+        image_paths = sorted(str(p) for p in (Path(image_cache_dir) / property_id).glob("*.jpg"))
+        if image_paths:
+            properties.append((property_id, prop['labels'], image_paths))
+
+    return properties
+
+
+def benchmark_evaluator(args, config: Dict):
+    """Compare per-metric encoding with the shared per-property embedding context."""
+    from evaluator import LabelEvaluator, PropertyEmbeddingContext
+
+    evaluator = LabelEvaluator(
+        config_path=args.config,
+        model_name=config['model']['name'],
+        pretrained=config['model']['pretrained'],
+        device=config['model']['device']
+    )
+    # Measure the encoders themselves, not the persistent embedding store
+    evaluator.embedding_store = None
+
+    properties = load_benchmark_properties(
+        args.results, config['optimization']['image_cache_dir'], args.max_properties
+    )
+    if not properties:
+        print("No cached images found. Run main.py or data_loader.py first.")
+        return
+
+    def encode_separately(metric_labels, image_paths):
+        # The pre-shared-context path: a fresh text and image encode for every call
+        return PropertyEmbeddingContext(
+            metric_labels,
+            evaluator.encode_images(image_paths),
+            evaluator.encode_text([f"a photo of {label}" for label in metric_labels])
+        )
+
+    def run_separate(labels, image_paths):
+        # Every metric and every label check encodes on its own
+        evaluator.compute_coverage(labels, image_paths, encode_separately(labels, image_paths))
+        evaluator.compute_redundancy(labels)
+        evaluator.compute_clip_consistency(labels, image_paths, encode_separately(labels, image_paths))
+        for label in labels:
+            evaluator.analyze_errors([label], image_paths, encode_separately([label], image_paths))
+
+    def run_shared(labels, image_paths):
+        context = evaluator.build_context(labels, image_paths)
+        evaluator.evaluate_property(labels, image_paths, context=context)
+        evaluator.analyze_errors(labels, image_paths, context=context)
+
+    rows = []
+    for property_id, labels, image_paths in properties:
+        row = {'property_id': property_id, 'num_labels': len(labels), 'num_images': len(image_paths)}
+        for mode, fn in [('separate', run_separate), ('shared', run_shared)]:
+            evaluator.encoder_stats = {'image_forward_passes': 0, 'text_forward_passes': 0}
+            start_time = time.time()
+            fn(labels, image_paths)
+            row[mode] = {
+                'seconds': time.time() - start_time,
+                **evaluator.encoder_stats
+            }
+        rows.append(row)
+        print(
+            f"  {property_id}: "
+            f"separate {row['separate']['seconds']:.2f}s "
+            f"({row['separate']['image_forward_passes']} image / {row['separate']['text_forward_passes']} text passes), "
+            f"shared {row['shared']['seconds']:.2f}s "
+            f"({row['shared']['image_forward_passes']} image / {row['shared']['text_forward_passes']} text passes)"
+        )
+
+    separate = np.mean([r['separate']['seconds'] for r in rows])
+    shared = np.mean([r['shared']['seconds'] for r in rows])
+    print(f"\nMean per property: separate {separate:.2f}s, shared {shared:.2f}s ({separate / shared:.1f}x)")
+
+
+def benchmark_siglip_classifier(args, config: Dict):
+    """Compare the transformers zero-shot pipeline with the direct SigLIP classifier path."""
+    from transformers import pipeline
+    from PIL import Image
+    from siglip_classifier import SigLIPSceneClassifier
+
+    model_name = config['scene_classifier'].get('siglip_model', 'google/siglip2-base-patch16-224')
+    batch_size = config['model']['batch_size']
+
+    image_paths = sorted(str(p) for p in Path(config['optimization']['image_cache_dir']).glob("*/*.jpg"))
+    image_paths = image_paths[:args.max_images]
+    if not image_paths:
+        print("No cached images found. Run main.py or data_loader.py first.")
+        return
+
+    classifier = SigLIPSceneClassifier(
+        model_name=model_name,
+        device="cpu",
+        preprocess_workers=args.workers
+    )
+    zero_shot = pipeline(task="zero-shot-image-classification", model=model_name, device=-1)
+
+    def run_pipeline():
+        predictions = []
+        for i in range(0, len(image_paths), batch_size):
+            images = [Image.open(p).convert('RGB') for p in image_paths[i:i + batch_size]]
+            outputs = zero_shot(images, candidate_labels=classifier.candidate_labels, batch_size=len(images))
+            for img_results in outputs:
+                top_idx = classifier.candidate_labels.index(img_results[0]['label'])
+                predictions.append("interior" if top_idx <= 1 else "exterior")
+        return predictions
+
+    def run_direct():
+        return [label for label, _ in classifier.classify_batch(image_paths, batch_size=batch_size)]
+
+    # Warm up both paths so one-time initialization is not measured
+    zero_shot(Image.open(image_paths[0]).convert('RGB'), candidate_labels=classifier.candidate_labels)
+    classifier.classify_batch(image_paths[:1])
+
+    timings = {}
+    predictions = {}
+    for mode, fn in [('pipeline', run_pipeline), ('direct', run_direct)]:
+        start_time = time.time()
+        predictions[mode] = fn()
+        timings[mode] = time.time() - start_time
+        print(f"  {mode}: {len(image_paths) / timings[mode]:.1f} images/sec ({timings[mode]:.2f}s)")
+
+    agreement = np.mean([a == b for a, b in zip(predictions['pipeline'], predictions['direct'])])
+    print(f"\nSpeedup: {timings['pipeline'] / timings['direct']:.1f}x, label agreement: {agreement:.1%}")
+
+
+# Packages whose import cost dominates start-up
+HEAVY_MODULES = ["torch", "open_clip", "transformers", "sklearn", "openai"]
+
+
+def benchmark_startup(args, config: Dict):
+    """Report what importing main.py and the configured backends costs."""
+    # The import-time report lives at the repository root, shared with the 3DGS benchmarks
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from importtime_report import print_import_report
+
+    classifier_type = args.classifier or config.get('scene_classifier', {}).get('type', 'clip')
+    generator_type = args.generator or config.get('labeling', {}).get('generator_type', 'clip')
+    statement = (
+        "import main; "
+        f"main.load_backend(main.SCENE_CLASSIFIERS, {classifier_type!r}); "
+        f"main.load_backend(main.LABEL_GENERATORS, {generator_type!r})"
+    )
+    print(f"Classifier: {classifier_type}, generator: {generator_type}\n")
+    print_import_report(statement, Path(__file__).parent, HEAVY_MODULES, args.top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic labeling benchmarks")
+    parser.add_argument("--config", default="../config.yaml", help="Path to configuration file")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    evaluator_parser = subparsers.add_parser("evaluator", help="Shared embedding context for LabelEvaluator")
+    evaluator_parser.add_argument("--results", default="results/semantic_labels_results.json",
+                                  help="Results file providing labels per property")
+    evaluator_parser.add_argument("--max-properties", type=int, default=3)
+
+    siglip_parser = subparsers.add_parser("siglip-classifier", help="SigLIP scene classifier throughput")
+    siglip_parser.add_argument("--max-images", type=int, default=64)
+    siglip_parser.add_argument("--workers", type=int, default=4, help="Preprocessing threads")
+
+    startup_parser = subparsers.add_parser("startup", help="Import time of main.py (python -X importtime)")
+    startup_parser.add_argument("--classifier", choices=["clip", "siglip"],
+                                help="Scene classifier backend (default: from config)")
+    startup_parser.add_argument("--generator", choices=["clip", "siglip", "openai"],
+                                help="Label generator backend (default: from config)")
+    startup_parser.add_argument("--top", type=int, default=10, help="Packages to list")
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    if args.benchmark == "evaluator":
+        benchmark_evaluator(args, config)
+    elif args.benchmark == "siglip-classifier":
+        benchmark_siglip_classifier(args, config)
+    elif args.benchmark == "startup":
+        benchmark_startup(args, config)
+
+
+if __name__ == "__main__":
+    main()
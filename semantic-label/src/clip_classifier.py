@@ -4,26 +4,35 @@ Filters images to identify interior photos only.
 """
 
 import torch
-import open_clip
-from PIL import Image
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import numpy as np
 from pathlib import Path
 
+from model_registry import DTYPES, get_clip_model
+from embedding_store import EmbeddingStore
+from image_store import load_rgb
+
 
 class ClipSceneClassifier:
     """CLIP-based interior/exterior classifier."""
     
-    def __init__(self, model_name: str = "ViT-B/32", pretrained: str = "openai", device: str = "cpu"):
+    def __init__(
+        self,
+        model_name: str = "ViT-B/32",
+        pretrained: str = "openai",
+        device: str = "cpu",
+        dtype: str = "float32",
+        embedding_store: Optional[EmbeddingStore] = None
+    ):
         self.device = device
-        print(f"Loading CLIP model: {model_name} ({pretrained}) on {device}...")
+        self.embedding_store = embedding_store
         
-        self.model, _, self.preprocess = open_clip.create_model_and_transforms(
-            model_name, pretrained=pretrained
-        )
-        self.tokenizer = open_clip.get_tokenizer(model_name)
-        self.model.to(device)
-        self.model.eval()
+        # Shared with the label generator and evaluator via the model registry
+        handle = get_clip_model(model_name, pretrained, device, dtype)
+        self.model = handle.model
+        self.preprocess = handle.preprocess
+        self.tokenizer = handle.tokenizer
+        self.dtype = DTYPES[dtype]
         
         # Define scene classification prompts
         self.scene_prompts = [
@@ -45,8 +54,8 @@ class ClipSceneClassifier:
         Returns (label, confidence_score).
         """
         try:
-            image = Image.open(image_path).convert('RGB')
-            image_input = self.preprocess(image).unsqueeze(0).to(self.device)
+            image = load_rgb(image_path)
+            image_input = self.preprocess(image).unsqueeze(0).to(self.device, dtype=self.dtype)
             
             with torch.no_grad():
                 image_features = self.model.encode_image(image_input)
@@ -54,7 +63,7 @@ class ClipSceneClassifier:
                 
                 # Calculate similarity scores
                 similarity = (image_features @ self.text_features.T).squeeze(0)
-                probs = similarity.softmax(dim=0).cpu().numpy()
+                probs = similarity.softmax(dim=0).float().cpu().numpy()
             
             label = "interior" if np.argmax(probs) <= 1 else "exterior"
             confidence = np.max(probs)
@@ -74,32 +83,22 @@ class ClipSceneClassifier:
         
         for i in range(0, len(image_paths), batch_size):
             batch_paths = image_paths[i:i + batch_size]
-            batch_images = []
-            valid_indices = []
             
-            # Load and preprocess batch
-            for idx, path in enumerate(batch_paths):
-                try:
-                    image = Image.open(path).convert('RGB')
-                    batch_images.append(self.preprocess(image))
-                    valid_indices.append(idx)
-                except Exception as e:
-                    print(f"Error loading {path}: {e}")
-                    results.append(("unknown", 0.0))
+            # Load, preprocess and encode batch (reusing stored embeddings if enabled)
+            if self.embedding_store is not None:
+                features, valid_indices = self.embedding_store.encode(batch_paths, self._encode_uncached)
+                image_features = torch.from_numpy(features).to(self.device, dtype=self.dtype)
+            else:
+                image_features, valid_indices = self._encode_uncached(batch_paths)
             
-            if not batch_images:
+            if not valid_indices:
+                results.extend([("unknown", 0.0)] * len(batch_paths))
                 continue
             
-            # Process batch
-            batch_tensor = torch.stack(batch_images).to(self.device)
-            
             with torch.no_grad():
-                image_features = self.model.encode_image(batch_tensor)
-                image_features /= image_features.norm(dim=-1, keepdim=True)
-                
                 # Calculate similarity scores
                 similarity = image_features @ self.text_features.T
-                probs = similarity.softmax(dim=-1).cpu().numpy()
+                probs = similarity.softmax(dim=-1).float().cpu().numpy()
             
             # Process results with same logic as classify_single_image
             labels = np.argmax(probs, axis=1)  # Get the index of max probability for each image
@@ -115,13 +114,39 @@ class ClipSceneClassifier:
             # Insert results at correct positions
             result_idx = 0
             for idx in range(len(batch_paths)):
-                print('path: {} label: {} confidence: {}'.format(batch_paths[idx], batch_results[result_idx][0], batch_results[result_idx][1]))
                 if idx in valid_indices:
+                    print('path: {} label: {} confidence: {}'.format(batch_paths[idx], batch_results[result_idx][0], batch_results[result_idx][1]))
                     results.append(batch_results[result_idx])
                     result_idx += 1
+                else:
+                    results.append(("unknown", 0.0))
         
         return results
     
+    def _encode_uncached(self, image_paths: List[str]) -> Tuple[torch.Tensor, List[int]]:
+        """Run the image encoder. Returns (features, indices of loaded images)."""
+        batch_images = []
+        valid_indices = []
+        
+        for idx, path in enumerate(image_paths):
+            try:
+                image = load_rgb(path)
+                batch_images.append(self.preprocess(image))
+                valid_indices.append(idx)
+            except Exception as e:
+                print(f"Error loading {path}: {e}")
+        
+        if not batch_images:
+            return torch.empty(0, self.model.visual.output_dim, dtype=self.dtype, device=self.device), valid_indices
+        
+        batch_tensor = torch.stack(batch_images).to(self.device, dtype=self.dtype)
+        
+        with torch.no_grad():
+            image_features = self.model.encode_image(batch_tensor)
+            image_features /= image_features.norm(dim=-1, keepdim=True)
+        
+        return image_features, valid_indices
+    
     def filter_interior_images(
         self, 
         image_paths: List[str], 
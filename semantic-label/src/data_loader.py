@@ -6,21 +6,36 @@ Handles JSON parsing, image downloading, and caching.
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
-from PIL import Image
-from io import BytesIO
-from tqdm import tqdm
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from downloader import ImageDownloader
+from image_store import PreprocessedImageStore
 
 
 class PropertyDataLoader:
     """Load and manage property data with image caching."""
     
-    def __init__(self, dataset_dir: str, cache_dir: str = "cache/images"):
+    def __init__(
+        self, 
+        dataset_dir: str, 
+        cache_dir: str = "cache/images",
+        max_workers: int = 32,
+        max_connections_per_host: int = 8,
+        image_store: Optional[PreprocessedImageStore] = None
+    ):
         self.dataset_dir = Path(dataset_dir)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.image_store = image_store
+        
+        # One pooled downloader shared by every property; new downloads are
+        # added to the image store from the saved file, the same way as backfilled
+        # images, so a stored copy does not depend on how the image arrived
+        self.downloader = ImageDownloader(
+            max_workers=max_workers,
+            max_connections_per_host=max_connections_per_host,
+            on_image=(lambda save_path, _: image_store.ingest(save_path)) if image_store is not None else None
+        )
         
     def load_property_data(self, json_path: str) -> Dict:
         """Load property data from JSON file."""
@@ -34,23 +49,12 @@ class PropertyDataLoader:
     
     def download_image(self, url: str, save_path: Path) -> bool:
         """Download a single image from URL."""
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Open and save image
-            img = Image.open(BytesIO(response.content))
-            img = img.convert('RGB')  # Ensure RGB format
-            img.save(save_path)
-            return True
-        except Exception as e:
-            print(f"Failed to download {url}: {e}")
-            return False
+        return self.downloader.download_image(url, save_path)
     
-    def download_images(self, property_data: Dict, max_workers: int = 8) -> List[str]:
+    def _plan_downloads(self, property_data: Dict) -> Tuple[List[Path], List[Tuple[str, Path]]]:
         """
-        Download all images for a property with parallel processing.
-        Returns list of local image paths.
+        Map a property's images to cache paths.
+        Returns (all local paths in listing order, (url, path) pairs still to download).
         """
         property_id = self.get_property_id(property_data)
         image_urls = property_data['listing']['picture_list']
@@ -59,41 +63,44 @@ class PropertyDataLoader:
         property_cache_dir = self.cache_dir / property_id
         property_cache_dir.mkdir(parents=True, exist_ok=True)
         
-        downloaded_paths = []
-        
-        # Check which images are already cached
+        local_paths = []
         download_tasks = []
         for idx, url in enumerate(image_urls):
             # Create filename from URL or use index
             filename = f"image_{idx:03d}.jpg"
             save_path = property_cache_dir / filename
+            local_paths.append(save_path)
             
-            if save_path.exists():
-                downloaded_paths.append(str(save_path))
-            else:
-                download_tasks.append((url, save_path, idx))
+            if not save_path.exists():
+                download_tasks.append((url, save_path))
+            elif self.image_store is not None:
+                # Cached before the image store existed, or changed since
+                self.image_store.ingest(str(save_path))
+        
+        return local_paths, download_tasks
+    
+    def download_images(self, property_data: Dict, max_workers: int = 8) -> List[str]:
+        """
+        Download all images for a property with parallel processing.
+        Returns list of local image paths.
+        
+        max_workers is kept for compatibility; concurrency is governed by the shared downloader.
+        """
+        property_id = self.get_property_id(property_data)
+        local_paths, download_tasks = self._plan_downloads(property_data)
         
         # Download missing images in parallel
         if download_tasks:
             print(f"Downloading {len(download_tasks)} images for property {property_id}...")
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(self.download_image, url, save_path): (save_path, idx)
-                    for url, save_path, idx in download_tasks
-                }
-                
-                for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading"):
-                    save_path, idx = futures[future]
-                    if future.result():
-                        downloaded_paths.append(str(save_path))
-        
-        # Sort by index to maintain order
-        downloaded_paths.sort()
-        return downloaded_paths
+            self.downloader.download_many(download_tasks)
+        
+        # Keep listing order; drop images that failed to download
+        return [str(path) for path in local_paths if path.exists()]
     
     def load_all_properties(self) -> List[Tuple[Dict, List[str]]]:
         """
         Load all properties from dataset directory.
+        Images for every property are fetched together through the shared downloader.
         Returns list of (property_data, image_paths) tuples.
         """
         json_files = sorted(self.dataset_dir.glob("property_*.json"))
@@ -103,17 +110,43 @@ class PropertyDataLoader:
         
         print(f"Found {len(json_files)} properties")
         
-        properties = []
+        planned = []
+        all_tasks = []
         for json_path in json_files:
-            print(f"\nLoading {json_path.name}...")
             property_data = self.load_property_data(json_path)
-            image_paths = self.download_images(property_data)
+            local_paths, download_tasks = self._plan_downloads(property_data)
+            planned.append((property_data, local_paths))
+            all_tasks.extend(download_tasks)
+        
+        if all_tasks:
+            print(f"Downloading {len(all_tasks)} images for {len(json_files)} properties...")
+            self.downloader.download_many(all_tasks)
+        
+        properties = []
+        for property_data, local_paths in planned:
+            image_paths = [str(path) for path in local_paths if path.exists()]
             properties.append((property_data, image_paths))
             print(f"  Property ID: {self.get_property_id(property_data)}")
             print(f"  Images: {len(image_paths)}")
         
         return properties
     
+    def iter_properties(self) -> Iterator[Tuple[Dict, List[str]]]:
+        """
+        Yield (property_data, image_paths) one property at a time,
+        downloading each property's images just before it is yielded.
+        """
+        json_files = sorted(self.dataset_dir.glob("property_*.json"))
+        
+        if not json_files:
+            raise ValueError(f"No property JSON files found in {self.dataset_dir}")
+        
+        print(f"Found {len(json_files)} properties")
+        
+        for json_path in json_files:
+            property_data = self.load_property_data(json_path)
+            yield property_data, self.download_images(property_data)
+    
     def get_property_metadata(self, property_data: Dict) -> Dict:
         """Extract useful metadata from property data."""
         listing = property_data['listing']
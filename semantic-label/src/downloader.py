@@ -0,0 +1,159 @@
+"""
+Connection-pooled image downloader shared across properties.
+Keeps HTTP connections alive, limits concurrency per host and reports
+progress for a whole dataset in a single bar.
+"""
+
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+from tqdm import tqdm
+
+
+class ImageDownloader:
+    """Download images over pooled keep-alive connections with per-host limits."""
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        max_connections_per_host: int = 8,
+        timeout: float = 10.0,
+        retries: int = 2,
+        on_image: Optional[Callable[[str, Image.Image], None]] = None
+    ):
+        """
+        Initialize downloader.
+
+        Args:
+            max_workers: Total concurrent downloads across all hosts
+            max_connections_per_host: Concurrent downloads (and pooled connections) per host
+            timeout: Per-request timeout in seconds
+            retries: Connection-level retries for failed requests
+            on_image: Called with (save_path, decoded RGB image) after each save,
+                so ingest steps can reuse the decode
+        """
+        self.max_workers = max_workers
+        self.on_image = on_image
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_connections_per_host,
+            max_retries=retries
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.max_connections_per_host)
+        )
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            return self._host_limits[host]
+
+    def fetch(self, url: str) -> bytes:
+        """Fetch a URL's body, holding one of its host's connection slots."""
+        with self._host_limit(url):
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
+
+    def download_image(self, url: str, save_path: Path) -> bool:
+        """Download a single image and save it as RGB."""
+        try:
+            content = self.fetch(url)
+
+            # Open and save image
+            img = Image.open(BytesIO(content))
+            img = img.convert('RGB')  # Ensure RGB format
+            img.save(save_path)
+
+            if self.on_image is not None:
+                self.on_image(str(save_path), img)
+            return True
+        except Exception as e:
+            print(f"Failed to download {url}: {e}")
+            return False
+
+    def download_many(
+        self,
+        tasks: List[Tuple[str, Path]],
+        desc: str = "Downloading"
+    ) -> List[bool]:
+        """
+        Download many (url, save_path) pairs concurrently.
+
+        Returns:
+            Success flag per task, in task order
+        """
+        results = [False] * len(tasks)
+        if not tasks:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.download_image, url, save_path): idx
+                for idx, (url, save_path) in enumerate(tasks)
+            }
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+                results[futures[future]] = future.result()
+
+        return results
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+
+if __name__ == "__main__":
+    # Exercise the downloader against a local HTTP stand-in server
+    import http.server
+    import socketserver
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = Path(tmp) / "source"
+        target_dir = Path(tmp) / "target"
+        source_dir.mkdir()
+        target_dir.mkdir()
+
+        for idx in range(20):
+            Image.new('RGB', (64, 48), color=(idx * 10, 100, 200)).save(source_dir / f"img_{idx:03d}.jpg")
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=str(source_dir), **kwargs)
+
+            def log_message(self, format, *args):
+                pass
+
+        with socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler) as httpd:
+            port = httpd.server_address[1]
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+            downloader = ImageDownloader(max_workers=8, max_connections_per_host=4)
+            tasks = [
+                (f"http://127.0.0.1:{port}/img_{idx:03d}.jpg", target_dir / f"image_{idx:03d}.jpg")
+                for idx in range(20)
+            ]
+            results = downloader.download_many(tasks)
+            downloader.close()
+            httpd.shutdown()
+
+        print(f"Downloaded {sum(results)}/{len(tasks)} images")
@@ -0,0 +1,241 @@
+"""
+Persistent, content-addressed store for image embeddings.
+Embeddings are keyed by image content hash per model and kept in a
+memory-mapped float16 array next to a small JSON index.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from image_store import image_source_id
+
+
+def content_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if it cannot be read."""
+    try:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class EmbeddingStore:
+    """On-disk embedding cache for a single model."""
+
+    def __init__(self, cache_dir: str, model_id: str):
+        """
+        Initialize the store.
+
+        Args:
+            cache_dir: Root directory for all embedding stores
+            model_id: Identity of the encoder (name, weights, dtype) and of the pixels it is fed
+        """
+        self.model_id = model_id
+        self.store_dir = Path(cache_dir) / re.sub(r'[^A-Za-z0-9._-]+', '_', model_id)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.store_dir / "index.json"
+        self.data_path = self.store_dir / "embeddings.f16"
+
+        self.dim = None
+        self.hashes: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+        self._memmap = None
+        self._lock = threading.Lock()
+
+        self._load_index()
+
+    def _load_index(self):
+        index = None
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+
+        if index is None or index.get('model_id') != self.model_id:
+            # Rows without a usable index cannot be attributed to any image
+            self.data_path.unlink(missing_ok=True)
+            return
+
+        self.dim = index['dim']
+        # Only trust rows that were fully written to the data file
+        available = self.data_path.stat().st_size // (2 * self.dim) if self.data_path.exists() else 0
+        self.hashes = index['hashes'][:available]
+        self.rows = {h: i for i, h in enumerate(self.hashes)}
+        # Drop rows appended after the index was last saved (interrupted put_many)
+        if self.data_path.exists():
+            os.truncate(self.data_path, len(self.hashes) * 2 * self.dim)
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'model_id': self.model_id, 'dim': self.dim, 'hashes': self.hashes}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _array(self) -> np.ndarray:
+        if self._memmap is None or self._memmap.shape[0] != len(self.hashes):
+            self._memmap = np.memmap(
+                self.data_path, dtype=np.float16, mode='r', shape=(len(self.hashes), self.dim)
+            )
+        return self._memmap
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for a content hash, if present."""
+        with self._lock:
+            row = self.rows.get(key)
+            if row is None:
+                return None
+            return np.asarray(self._array()[row], dtype=np.float32)
+
+    def put_many(self, keys: List[str], features: np.ndarray):
+        """Append embeddings for content hashes not yet in the store."""
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(features.shape[1])
+
+            new_keys, new_rows = [], []
+            for key, feature in zip(keys, features):
+                if key not in self.rows and key not in new_keys:
+                    new_keys.append(key)
+                    new_rows.append(feature)
+
+            if not new_keys:
+                return
+
+            self._memmap = None
+            with open(self.data_path, 'ab') as f:
+                # Row numbers are file offsets: cut anything not covered by the index first
+                f.truncate(len(self.hashes) * 2 * self.dim)
+                f.write(np.asarray(new_rows, dtype=np.float16).tobytes())
+
+            for key in new_keys:
+                self.rows[key] = len(self.hashes)
+                self.hashes.append(key)
+            self._save_index()
+
+    def encode(
+        self,
+        image_paths: List[str],
+        encode_fn: Callable[[List[str]], Tuple[object, List[int]]]
+    ) -> Tuple[np.ndarray, List[int]]:
+        """
+        Encode images, running the encoder only for images not in the store.
+
+        Args:
+            image_paths: Image file paths
+            encode_fn: Encoder for uncached paths, returning (features, loaded_indices)
+                where features has one row per successfully loaded path
+
+        Returns:
+            Tuple of (float32 features for loaded images, indices of loaded images)
+        """
+        keys = [content_hash(path) for path in image_paths]
+        features: List[Optional[np.ndarray]] = [None] * len(image_paths)
+
+        missing = []
+        for idx, key in enumerate(keys):
+            if key is None:
+                print(f"Error loading {image_paths[idx]}: file not readable")
+                continue
+            cached = self.get(key)
+            if cached is not None:
+                features[idx] = cached
+            else:
+                missing.append(idx)
+
+        with self._lock:
+            self.stats['hits'] += len(image_paths) - len(missing)
+            self.stats['misses'] += len(missing)
+
+        if missing:
+            encoded, loaded = encode_fn([image_paths[idx] for idx in missing])
+            encoded = encoded.float().cpu().numpy()
+            new_keys = []
+            for row, local_idx in enumerate(loaded):
+                idx = missing[local_idx]
+                features[idx] = encoded[row]
+                new_keys.append(keys[idx])
+            if new_keys:
+                self.put_many(new_keys, encoded)
+
+        loaded_indices = [idx for idx, feature in enumerate(features) if feature is not None]
+        if not loaded_indices:
+            return np.empty((0, self.dim or 0), dtype=np.float32), []
+        return np.stack([features[idx] for idx in loaded_indices]), loaded_indices
+
+
+_stores: Dict[Tuple[str, str], EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(cache_dir: str, model_id: str) -> EmbeddingStore:
+    """Return the process-wide store for a model, so writers never race on its files."""
+    key = (str(Path(cache_dir).resolve()), model_id)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = EmbeddingStore(cache_dir, model_id)
+        return _stores[key]
+
+
+def embedding_store_from_config(config: Dict, model_id: str) -> Optional[EmbeddingStore]:
+    """
+    Store for a model as configured under `optimization`, or None when caching is off.
+    Entries are keyed by the original file's content hash, so the image preprocessing
+    settings are folded into the model id; toggling them opens a separate store.
+    """
+    optimization = config.get('optimization', {})
+    if not optimization.get('use_caching', False):
+        return None
+    return get_embedding_store(
+        optimization.get('embedding_cache_dir', 'cache/embeddings'),
+        f"{model_id}:{image_source_id(config)}"
+    )
+
+
+def embedding_store_stats() -> List[Dict]:
+    """Hit/miss counters and sizes of every store opened in this process."""
+    with _stores_lock:
+        return [
+            {'model_id': store.model_id, 'entries': len(store), **store.stats}
+            for store in _stores.values()
+        ]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Simulate a crash between appending rows and saving the index, then reopen
+    with tempfile.TemporaryDirectory() as tmp:
+        features = np.random.rand(4, 8).astype(np.float32)
+        store = EmbeddingStore(tmp, "demo")
+        store.put_many(["a", "b"], features[:2])
+        with open(store.data_path, 'ab') as f:
+            f.write(np.asarray(features[2:3], dtype=np.float16).tobytes())
+
+        store = EmbeddingStore(tmp, "demo")
+        store.put_many(["d"], features[3:4])
+        store = EmbeddingStore(tmp, "demo")
+        for key, row in [("a", 0), ("b", 1), ("d", 3)]:
+            assert np.allclose(store.get(key), features[row], atol=1e-2), key
+        print(f"Crash window: {len(store)} entries, rows match their keys")
+
+        # A data file without an index is discarded
+        store.index_path.unlink()
+        store = EmbeddingStore(tmp, "demo")
+        assert len(store) == 0 and not store.data_path.exists()
+        print("Orphaned data file removed")
@@ -3,16 +3,47 @@ Evaluator for semantic labeling system.
 Computes quantitative metrics and performs error analysis.
 """
 
+import threading
 import torch
-import open_clip
-from PIL import Image
 import numpy as np
 from typing import List, Dict, Tuple
 from collections import Counter
 from itertools import combinations
-from sklearn.metrics.pairwise import cosine_similarity
 import yaml
 
+from model_registry import DTYPES, clip_model_id, get_clip_model
+from embedding_store import embedding_store_from_config
+from image_store import load_rgb
+
+
+class PropertyEmbeddingContext:
+    """
+    Embeddings for one property's labels and images.
+    Images are encoded once and all labels once as a batch, then shared
+    by every metric and error check for that property.
+    """
+    
+    def __init__(self, labels: List[str], image_features: torch.Tensor, label_features: torch.Tensor):
+        self.labels = labels
+        self.image_features = image_features
+        self.label_features = label_features
+        self._similarity = None
+    
+    @property
+    def has_images(self) -> bool:
+        return self.image_features.shape[0] > 0
+    
+    def check_labels(self, labels: List[str]):
+        """Raise if this context was built for a different label list (rows are indexed by position)."""
+        if list(labels) != list(self.labels):
+            raise ValueError("Embedding context was built for a different label list")
+    
+    def label_image_similarity(self) -> np.ndarray:
+        """Similarity matrix [num_labels, num_images], computed on first use."""
+        if self._similarity is None:
+            self._similarity = (self.label_features @ self.image_features.T).float().cpu().numpy()
+        return self._similarity
+
 
 class LabelEvaluator:
     """Evaluate quality of generated semantic labels."""
@@ -22,7 +53,8 @@ class LabelEvaluator:
         config_path: str = "../config.yaml",
         model_name: str = "ViT-B/32",
         pretrained: str = "openai",
-        device: str = "cpu"
+        device: str = "cpu",
+        dtype: str = "float32"
     ):
         self.device = device
         
@@ -30,17 +62,27 @@ class LabelEvaluator:
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
-        # Load CLIP model for evaluation
-        print(f"Loading CLIP model for evaluation...")
-        self.model, _, self.preprocess = open_clip.create_model_and_transforms(
-            model_name, pretrained=pretrained
+        # Shared CLIP model for evaluation
+        handle = get_clip_model(model_name, pretrained, device, dtype)
+        self.model = handle.model
+        self.preprocess = handle.preprocess
+        self.tokenizer = handle.tokenizer
+        self.dtype = DTYPES[dtype]
+        
+        # Persistent image embedding cache (optimization.use_caching)
+        self.embedding_store = embedding_store_from_config(
+            self.config, clip_model_id(model_name, pretrained, dtype)
         )
-        self.tokenizer = open_clip.get_tokenizer(model_name)
-        self.model.to(device)
-        self.model.eval()
+        
+        # Encoder forward pass counters (see benchmark.py)
+        self.encoder_stats = {'image_forward_passes': 0, 'text_forward_passes': 0}
+        # Streaming mode runs components from several threads
+        self._stats_lock = threading.Lock()
     
     def encode_text(self, texts: List[str]) -> torch.Tensor:
         """Encode text labels to embeddings."""
+        with self._stats_lock:
+            self.encoder_stats['text_forward_passes'] += 1
         with torch.no_grad():
             text_tokens = self.tokenizer(texts).to(self.device)
             text_features = self.model.encode_text(text_tokens)
@@ -49,28 +91,76 @@ class LabelEvaluator:
     
     def encode_images(self, image_paths: List[str]) -> torch.Tensor:
         """Encode images to embeddings."""
+        if self.embedding_store is not None:
+            features, _ = self.embedding_store.encode(image_paths, self._encode_uncached)
+            if features.shape[0] == 0:
+                return torch.empty(0, 512, dtype=self.dtype, device=self.device)
+            return torch.from_numpy(features).to(self.device, dtype=self.dtype)
+        
+        image_features, _ = self._encode_uncached(image_paths)
+        return image_features
+    
+    def _encode_uncached(self, image_paths: List[str]) -> Tuple[torch.Tensor, List[int]]:
+        """Run the image encoder. Returns (features, indices of loaded images)."""
         images = []
-        for path in image_paths:
+        loaded_indices = []
+        for idx, path in enumerate(image_paths):
             try:
-                img = Image.open(path).convert('RGB')
+                img = load_rgb(path)
                 images.append(self.preprocess(img))
+                loaded_indices.append(idx)
             except Exception as e:
                 print(f"Error loading {path}: {e}")
         
         if not images:
-            return torch.empty(0, 512).to(self.device)
+            return torch.empty(0, 512, dtype=self.dtype, device=self.device), loaded_indices
         
-        batch = torch.stack(images).to(self.device)
+        batch = torch.stack(images).to(self.device, dtype=self.dtype)
+        with self._stats_lock:
+            self.encoder_stats['image_forward_passes'] += 1
         with torch.no_grad():
             image_features = self.model.encode_image(batch)
             image_features /= image_features.norm(dim=-1, keepdim=True)
         
-        return image_features
+        return image_features, loaded_indices
     
-    def compute_coverage(
+    def build_context(
         self, 
         labels: List[str], 
         image_paths: List[str]
+    ) -> PropertyEmbeddingContext:
+        """
+        Encode a property's images and labels once for reuse across metrics.
+        """
+        if image_paths:
+            image_features = self.encode_images(image_paths)
+        else:
+            image_features = torch.empty(0, 512, dtype=self.dtype, device=self.device)
+        
+        if labels:
+            label_features = self.encode_text([f"a photo of {label}" for label in labels])
+        else:
+            label_features = torch.empty(0, 512, dtype=self.dtype, device=self.device)
+        
+        return PropertyEmbeddingContext(labels, image_features, label_features)
+    
+    def _context_for(
+        self,
+        labels: List[str],
+        image_paths: List[str],
+        context: PropertyEmbeddingContext = None
+    ) -> PropertyEmbeddingContext:
+        """Build a context if none is given, otherwise check it matches the labels."""
+        if context is None:
+            return self.build_context(labels, image_paths)
+        context.check_labels(labels)
+        return context
+    
+    def compute_coverage(
+        self, 
+        labels: List[str], 
+        image_paths: List[str],
+        context: PropertyEmbeddingContext = None
     ) -> float:
         """
         Coverage: How well labels cover the semantic content of images.
@@ -79,14 +169,13 @@ class LabelEvaluator:
         if not labels or not image_paths:
             return 0.0
         
-        label_features = self.encode_text([f"a photo of {label}" for label in labels])
-        image_features = self.encode_images(image_paths)
+        context = self._context_for(labels, image_paths, context)
         
-        if image_features.shape[0] == 0:
+        if not context.has_images:
             return 0.0
         
         # Similarity matrix: [num_labels, num_images]
-        similarity = (label_features @ image_features.T).cpu().numpy()
+        similarity = context.label_image_similarity()
         
         # For each label, find max similarity with any image
         max_similarities = similarity.max(axis=1)
@@ -110,7 +199,11 @@ class LabelEvaluator:
         
         return float(specificity)
     
-    def compute_redundancy(self, labels: List[str]) -> float:
+    def compute_redundancy(
+        self, 
+        labels: List[str],
+        context: PropertyEmbeddingContext = None
+    ) -> float:
         """
         Redundancy: Degree of duplicate/overlapping labels.
         Measured as mean pairwise cosine similarity between label embeddings.
@@ -119,10 +212,15 @@ class LabelEvaluator:
         if len(labels) < 2:
             return 0.0
         
-        label_features = self.encode_text([f"a photo of {label}" for label in labels])
-        label_features_np = label_features.cpu().numpy()
+        if context is not None:
+            context.check_labels(labels)
+            label_features = context.label_features
+        else:
+            label_features = self.encode_text([f"a photo of {label}" for label in labels])
+        label_features_np = label_features.float().cpu().numpy()
         
         # Compute pairwise similarities
+        from sklearn.metrics.pairwise import cosine_similarity
         similarities = cosine_similarity(label_features_np)
         
         # Get upper triangle (excluding diagonal)
@@ -163,7 +261,8 @@ class LabelEvaluator:
     def compute_clip_consistency(
         self, 
         labels: List[str], 
-        image_paths: List[str]
+        image_paths: List[str],
+        context: PropertyEmbeddingContext = None
     ) -> float:
         """
         CLIP Consistency: Label-image alignment.
@@ -172,12 +271,14 @@ class LabelEvaluator:
         if not labels or not image_paths:
             return 0.0
         
-        label_features = self.encode_text([f"a photo of {label}" for label in labels])
-        image_features = self.encode_images(image_paths)
+        context = self._context_for(labels, image_paths, context)
         
-        if image_features.shape[0] == 0:
+        if not context.has_images:
             return 0.0
         
+        label_features = context.label_features
+        image_features = context.image_features
+        
         # Mean label embedding
         mean_label_features = label_features.mean(dim=0, keepdim=True)
         mean_label_features /= mean_label_features.norm(dim=-1, keepdim=True)
@@ -194,19 +295,27 @@ class LabelEvaluator:
     def evaluate_property(
         self, 
         labels: List[str], 
-        image_paths: List[str]
+        image_paths: List[str],
+        context: PropertyEmbeddingContext = None
     ) -> Dict[str, float]:
         """
         Evaluate labels for a single property.
         
+        Args:
+            labels: Labels generated for the property
+            image_paths: Interior image paths
+            context: Optional pre-built embedding context (see build_context)
+        
         Returns:
             Dictionary of metric scores
         """
+        context = self._context_for(labels, image_paths, context)
+        
         metrics = {
-            'coverage': self.compute_coverage(labels, image_paths),
+            'coverage': self.compute_coverage(labels, image_paths, context),
             'specificity': self.compute_specificity(labels),
-            'redundancy': self.compute_redundancy(labels),
-            'clip_consistency': self.compute_clip_consistency(labels, image_paths),
+            'redundancy': self.compute_redundancy(labels, context),
+            'clip_consistency': self.compute_clip_consistency(labels, image_paths, context),
             'num_labels': len(labels),
             'num_images': len(image_paths)
         }
@@ -258,11 +367,17 @@ class LabelEvaluator:
     def analyze_errors(
         self, 
         labels: List[str], 
-        image_paths: List[str]
+        image_paths: List[str],
+        context: PropertyEmbeddingContext = None
     ) -> Dict[str, List[str]]:
         """
         Categorize potential errors in labels.
         
+        Args:
+            labels: Labels generated for the property
+            image_paths: Interior image paths
+            context: Optional pre-built embedding context (see build_context)
+        
         Returns:
             Dictionary mapping error categories to example labels
         """
@@ -285,7 +400,10 @@ class LabelEvaluator:
             'balcony', 'garage', 'hallway', 'study', 'office', 'gym', 'pool'
         }
         
-        for label in labels:
+        if image_paths:
+            context = self._context_for(labels, image_paths, context)
+        
+        for label_idx, label in enumerate(labels):
             label_lower = label.lower()
             words = label_lower.split()
             
@@ -298,12 +416,8 @@ class LabelEvaluator:
 
             # Check visual grounding (Hallucination / Wrong Room Type)
             if image_paths:
-                label_features = self.encode_text([f"a photo of {label}"])
-                image_features = self.encode_images(image_paths)
-                
-                if image_features.shape[0] > 0:
-                    similarity = (label_features @ image_features.T).cpu().numpy()
-                    max_sim = float(similarity.max())
+                if context.has_images:
+                    max_sim = float(context.label_image_similarity()[label_idx].max())
                     
                     # Thresholds
                     # Room types usually have higher CLIP alignment than abstract features
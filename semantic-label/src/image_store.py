@@ -0,0 +1,263 @@
+"""
+Store of downsampled, model-ready copies of listing images.
+Each image is decoded and resized once at ingest, then kept as raw uint8
+RGB pixels in a packed shard per property (`<property_id>.bin`) with a
+small JSON index of offsets and shapes (`<property_id>.json`). Shards are
+rewritten without superseded records once most of their bytes are stale.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from PIL import Image
+
+
+class PreprocessedImageStore:
+    """Packed per-property shards of downsampled RGB images."""
+
+    def __init__(
+        self,
+        store_dir: str = "cache/preprocessed",
+        short_side: int = 256,
+        max_stale_fraction: float = 0.5
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            store_dir: Directory holding one shard and index per property
+            short_side: Target length of the shorter image side in pixels
+            max_stale_fraction: Compact a shard once more than this fraction of it is stale
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.short_side = short_side
+        self.max_stale_fraction = max_stale_fraction
+
+        self.stats = {'hits': 0, 'misses': 0, 'ingested': 0, 'compactions': 0}
+        self._indexes: Dict[str, Dict] = {}
+        self._shards: Dict[str, np.memmap] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(image_path: str):
+        # Images are cached as <image_cache_dir>/<property_id>/<filename>
+        path = Path(image_path)
+        return path.parent.name, path.name
+
+    @staticmethod
+    def _source_signature(image_path: str) -> Optional[Dict]:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return {'source_size': stat.st_size, 'source_mtime': stat.st_mtime}
+
+    def _index(self, property_id: str) -> Dict:
+        if property_id not in self._indexes:
+            index_path = self.store_dir / f"{property_id}.json"
+            index = {'short_side': self.short_side, 'entries': {}}
+            if index_path.exists():
+                with open(index_path, 'r') as f:
+                    stored = json.load(f)
+                # A different target size makes the whole shard stale
+                if stored.get('short_side') == self.short_side:
+                    index = stored
+                else:
+                    # Keep appending to the same shard file; compaction reclaims the old records
+                    index.update({k: stored[k] for k in ('shard', 'generation') if k in stored})
+            self._indexes[property_id] = index
+        return self._indexes[property_id]
+
+    def _save_index(self, property_id: str):
+        index_path = self.store_dir / f"{property_id}.json"
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._indexes[property_id], f)
+        os.replace(tmp_path, index_path)
+
+    def _shard_path(self, property_id: str) -> Path:
+        # Compaction writes a new generation, so the index names its shard file
+        return self.store_dir / self._index(property_id).get('shard', f"{property_id}.bin")
+
+    def _shard(self, property_id: str) -> np.memmap:
+        if property_id not in self._shards:
+            self._shards[property_id] = np.memmap(
+                self._shard_path(property_id), dtype=np.uint8, mode='r'
+            )
+        return self._shards[property_id]
+
+    def _compact(self, property_id: str):
+        """Rewrite a shard with only the current record of each image."""
+        index = self._index(property_id)
+        old_path = self._shard_path(property_id)
+        generation = index.get('generation', 0) + 1
+        new_name = f"{property_id}.{generation}.bin"
+
+        old_shard = np.memmap(old_path, dtype=np.uint8, mode='r')
+        entries, offset = {}, 0
+        with open(self.store_dir / new_name, 'wb') as f:
+            for name, entry in index['entries'].items():
+                size = entry['height'] * entry['width'] * 3
+                f.write(old_shard[entry['offset']:entry['offset'] + size].tobytes())
+                entries[name] = {**entry, 'offset': offset}
+                offset += size
+        del old_shard
+
+        # The new index is saved before the old shard goes, so a crash leaves a consistent pair
+        self._indexes[property_id] = {**index, 'entries': entries, 'shard': new_name, 'generation': generation}
+        self._shards.pop(property_id, None)
+        self._save_index(property_id)
+        old_path.unlink(missing_ok=True)
+        self.stats['compactions'] += 1
+
+    def downsample(self, image: Image.Image) -> Image.Image:
+        """Resize so the shorter side equals short_side; smaller images are kept as-is."""
+        width, height = image.size
+        scale = self.short_side / min(width, height)
+        if scale >= 1:
+            return image
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return image.resize(size, Image.BICUBIC)
+
+    def contains(self, image_path: str) -> bool:
+        """Whether an up-to-date copy of the image is stored."""
+        property_id, name = self._key(image_path)
+        with self._lock:
+            entry = self._index(property_id)['entries'].get(name)
+        if entry is None:
+            return False
+        signature = self._source_signature(image_path)
+        return signature is not None and all(entry[k] == v for k, v in signature.items())
+
+    def put(self, image_path: str, image: Image.Image):
+        """Downsample an already decoded image and append it to its property's shard."""
+        signature = self._source_signature(image_path)
+        if signature is None:
+            return
+
+        pixels = np.asarray(self.downsample(image.convert('RGB')), dtype=np.uint8)
+        property_id, name = self._key(image_path)
+
+        with self._lock:
+            index = self._index(property_id)
+            shard_path = self._shard_path(property_id)
+            offset = shard_path.stat().st_size if shard_path.exists() else 0
+            with open(shard_path, 'ab') as f:
+                f.write(pixels.tobytes())
+
+            index['entries'][name] = {
+                'offset': offset,
+                'height': int(pixels.shape[0]),
+                'width': int(pixels.shape[1]),
+                **signature
+            }
+            self._shards.pop(property_id, None)
+            self._save_index(property_id)
+            self.stats['ingested'] += 1
+
+            # Re-ingested images leave their old records behind
+            shard_bytes = offset + pixels.nbytes
+            live_bytes = sum(e['height'] * e['width'] * 3 for e in index['entries'].values())
+            if shard_bytes - live_bytes > self.max_stale_fraction * shard_bytes:
+                self._compact(property_id)
+
+    def ingest(self, image_path: str) -> bool:
+        """Add a file that is on disk but not yet stored. Returns True if it was added."""
+        if self.contains(image_path):
+            return False
+        try:
+            image = Image.open(image_path)
+            # Let the JPEG decoder skip detail the store would discard anyway
+            image.draft('RGB', (self.short_side, self.short_side))
+            self.put(image_path, image)
+            return True
+        except Exception as e:
+            print(f"Error preprocessing {image_path}: {e}")
+            return False
+
+    def backfill(self, image_paths: Iterable[str]) -> int:
+        """Store images cached before the store existed. Returns the number added."""
+        return sum(self.ingest(str(path)) for path in image_paths)
+
+    def get(self, image_path: str) -> Optional[Image.Image]:
+        """Return the stored RGB copy of an image, or None if it is missing or stale."""
+        if not self.contains(image_path):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        property_id, name = self._key(image_path)
+        with self._lock:
+            entry = self._index(property_id)['entries'][name]
+            size = entry['height'] * entry['width'] * 3
+            pixels = np.array(self._shard(property_id)[entry['offset']:entry['offset'] + size])
+            self.stats['hits'] += 1
+
+        return Image.fromarray(pixels.reshape(entry['height'], entry['width'], 3), 'RGB')
+
+
+_store: Optional[PreprocessedImageStore] = None
+
+
+def configure_image_store(config: Dict) -> Optional[PreprocessedImageStore]:
+    """Set up the process-wide store from `optimization`, or disable it."""
+    global _store
+    optimization = config.get('optimization', {})
+    if optimization.get('use_preprocessed_images', True):
+        _store = PreprocessedImageStore(
+            optimization.get('preprocessed_image_dir', 'cache/preprocessed'),
+            optimization.get('preprocessed_short_side', 256)
+        )
+    else:
+        _store = None
+    return _store
+
+
+def image_source_id(config: Dict) -> str:
+    """Identity of the pixels the encoders see under `optimization`, e.g. 'preprocessed256' or 'original'."""
+    optimization = config.get('optimization', {})
+    if optimization.get('use_preprocessed_images', True):
+        return f"preprocessed{optimization.get('preprocessed_short_side', 256)}"
+    return 'original'
+
+
+def get_image_store() -> Optional[PreprocessedImageStore]:
+    """Return the process-wide store, if configured."""
+    return _store
+
+
+def load_rgb(image_path: str) -> Image.Image:
+    """Load an image for model input, preferring the preprocessed copy."""
+    if _store is not None:
+        image = _store.get(image_path)
+        if image is not None:
+            return image
+    return Image.open(image_path).convert('RGB')
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        property_dir = Path(tmp) / "images" / "demo_property"
+        property_dir.mkdir(parents=True)
+        paths = []
+        for idx in range(8):
+            path = property_dir / f"image_{idx:03d}.jpg"
+            Image.new('RGB', (3000, 2000), color=(idx * 30, 120, 200)).save(path)
+            paths.append(str(path))
+
+        configure_image_store({'optimization': {'preprocessed_image_dir': str(Path(tmp) / "preprocessed")}})
+        store = get_image_store()
+        print(f"Backfilled {store.backfill(paths)} images")
+
+        for label, loader in [('full decode', lambda p: Image.open(p).convert('RGB')), ('store', load_rgb)]:
+            start_time = time.time()
+            sizes = [loader(p).size for p in paths]
+            print(f"  {label}: {time.time() - start_time:.3f}s, size {sizes[0]}")
@@ -4,14 +4,16 @@ Generates property-level keyword labels from interior images.
 """
 
 import torch
-import open_clip
-from PIL import Image
 from typing import List, Dict, Tuple
 import numpy as np
 from pathlib import Path
 from collections import Counter
 import yaml
 
+from model_registry import DTYPES, clip_model_id, get_clip_model
+from embedding_store import embedding_store_from_config
+from image_store import load_rgb
+
 
 class LabelGenerator:
     """Generate semantic labels for properties using CLIP."""
@@ -21,7 +23,8 @@ class LabelGenerator:
         config_path: str = "../config.yaml",
         model_name: str = "ViT-B/32", 
         pretrained: str = "openai", 
-        device: str = "cpu"
+        device: str = "cpu",
+        dtype: str = "float32"
     ):
         self.device = device
         
@@ -29,13 +32,16 @@ class LabelGenerator:
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
-        print(f"Loading CLIP model: {model_name} ({pretrained}) on {device}...")
-        self.model, _, self.preprocess = open_clip.create_model_and_transforms(
-            model_name, pretrained=pretrained
+        handle = get_clip_model(model_name, pretrained, device, dtype)
+        self.model = handle.model
+        self.preprocess = handle.preprocess
+        self.tokenizer = handle.tokenizer
+        self.dtype = DTYPES[dtype]
+        
+        # Persistent image embedding cache (optimization.use_caching)
+        self.embedding_store = embedding_store_from_config(
+            self.config, clip_model_id(model_name, pretrained, dtype)
         )
-        self.tokenizer = open_clip.get_tokenizer(model_name)
-        self.model.to(device)
-        self.model.eval()
         
         # Load label vocabularies from config
         self.room_types = self.config['labeling']['room_types']
@@ -75,21 +81,40 @@ class LabelGenerator:
     
     def encode_images(self, image_paths: List[str], batch_size: int = 16) -> torch.Tensor:
         """Encode images to CLIP embeddings with batching."""
+        if self.embedding_store is not None:
+            features, _ = self.embedding_store.encode(
+                image_paths, lambda paths: self._encode_uncached(paths, batch_size)
+            )
+            if features.shape[0] == 0:
+                return torch.empty(0, self.model.visual.output_dim, dtype=self.dtype, device=self.device)
+            return torch.from_numpy(features).to(self.device, dtype=self.dtype)
+        
+        features, _ = self._encode_uncached(image_paths, batch_size)
+        return features
+    
+    def _encode_uncached(
+        self, 
+        image_paths: List[str], 
+        batch_size: int = 16
+    ) -> Tuple[torch.Tensor, List[int]]:
+        """Run the image encoder. Returns (features, indices of loaded images)."""
         all_features = []
+        loaded_indices = []
         
         for i in range(0, len(image_paths), batch_size):
             batch_paths = image_paths[i:i + batch_size]
             batch_images = []
             
-            for path in batch_paths:
+            for offset, path in enumerate(batch_paths):
                 try:
-                    image = Image.open(path).convert('RGB')
+                    image = load_rgb(path)
                     batch_images.append(self.preprocess(image))
+                    loaded_indices.append(i + offset)
                 except Exception as e:
                     print(f"Error loading {path}: {e}")
             
             if batch_images:
-                batch_tensor = torch.stack(batch_images).to(self.device)
+                batch_tensor = torch.stack(batch_images).to(self.device, dtype=self.dtype)
                 
                 with torch.no_grad():
                     features = self.model.encode_image(batch_tensor)
@@ -97,9 +122,9 @@ class LabelGenerator:
                     all_features.append(features)
         
         if all_features:
-            return torch.cat(all_features, dim=0)
+            return torch.cat(all_features, dim=0), loaded_indices
         else:
-            return torch.empty(0, self.model.visual.output_dim).to(self.device)
+            return torch.empty(0, self.model.visual.output_dim, dtype=self.dtype, device=self.device), loaded_indices
     
     def extract_labels_from_category(
         self, 
@@ -120,7 +145,7 @@ class LabelGenerator:
         similarity = image_features @ text_features.T  # [num_images, num_labels]
         
         # Aggregate across images (mean similarity)
-        mean_similarity = similarity.mean(dim=0).cpu().numpy()
+        mean_similarity = similarity.mean(dim=0).float().cpu().numpy()
         
         # Get top-k labels above threshold
         top_indices = np.argsort(mean_similarity)[::-1]
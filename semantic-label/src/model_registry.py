@@ -0,0 +1,220 @@
+"""
+Process-wide model registry for the semantic labeling pipeline.
+Loads each set of weights once and hands the same instance to every component.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import torch
+
+
+DTYPES = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+}
+
+
+def _resident_memory_bytes() -> Optional[int]:
+    """Current resident set size of this process, if the platform exposes it."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _model_memory_bytes(model: torch.nn.Module) -> int:
+    """Bytes held by a model's parameters and buffers."""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelHandle:
+    """A loaded model together with its preprocessing and load statistics."""
+
+    def __init__(
+        self,
+        key: tuple,
+        model: torch.nn.Module,
+        preprocess=None,
+        tokenizer=None,
+        load_seconds: float = 0.0,
+        rss_delta_bytes: Optional[int] = None
+    ):
+        self.key = key
+        self.model = model
+        self.preprocess = preprocess
+        self.tokenizer = tokenizer
+        self.load_seconds = load_seconds
+        self.rss_delta_bytes = rss_delta_bytes
+        self.model_bytes = _model_memory_bytes(model)
+        self.requests = 1
+
+    def stats(self) -> Dict:
+        """Load time, memory footprint and reuse count for this handle."""
+        family, model_name, pretrained, device, dtype = self.key
+        return {
+            'family': family,
+            'model_name': model_name,
+            'pretrained': pretrained,
+            'device': device,
+            'dtype': dtype,
+            'load_seconds': self.load_seconds,
+            'model_memory_mb': self.model_bytes / (1024 ** 2),
+            'rss_delta_mb': (
+                self.rss_delta_bytes / (1024 ** 2)
+                if self.rss_delta_bytes is not None else None
+            ),
+            'requests': self.requests
+        }
+
+
+class ModelRegistry:
+    """Cache of loaded models keyed by (family, model_name, pretrained, device, dtype)."""
+
+    def __init__(self):
+        self._handles: Dict[tuple, ModelHandle] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_load(self, key: tuple, loader) -> ModelHandle:
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                handle.requests += 1
+                return handle
+
+            rss_before = _resident_memory_bytes()
+            start_time = time.time()
+            model, preprocess, tokenizer = loader()
+            load_seconds = time.time() - start_time
+            rss_after = _resident_memory_bytes()
+
+            rss_delta = None
+            if rss_before is not None and rss_after is not None:
+                rss_delta = rss_after - rss_before
+
+            handle = ModelHandle(key, model, preprocess, tokenizer, load_seconds, rss_delta)
+            self._handles[key] = handle
+            print(
+                f"  Loaded {key[1]} ({key[2]}) in {load_seconds:.2f}s, "
+                f"{handle.model_bytes / (1024 ** 2):.1f} MB"
+            )
+            return handle
+
+    def get_clip(
+        self,
+        model_name: str = "ViT-B/32",
+        pretrained: str = "openai",
+        device: str = "cpu",
+        dtype: str = "float32"
+    ) -> ModelHandle:
+        """Return the shared open_clip model, loading it on first use."""
+        key = ('open_clip', model_name, pretrained, device, dtype)
+
+        def load():
+            import open_clip
+
+            print(f"Loading CLIP model: {model_name} ({pretrained}) on {device}...")
+            model, _, preprocess = open_clip.create_model_and_transforms(
+                model_name, pretrained=pretrained
+            )
+            tokenizer = open_clip.get_tokenizer(model_name)
+            model.to(device=device, dtype=DTYPES[dtype])
+            model.eval()
+            return model, preprocess, tokenizer
+
+        return self._get_or_load(key, load)
+
+    def get_siglip(
+        self,
+        model_name: str = "google/siglip2-base-patch16-224",
+        device: str = "cpu",
+        dtype: str = "float32"
+    ) -> ModelHandle:
+        """Return the shared HuggingFace SigLIP model and processor, loading them on first use."""
+        key = ('transformers', model_name, 'hf', device, dtype)
+
+        def load():
+            from transformers import AutoModel, AutoProcessor
+
+            print(f"Loading SigLIP model: {model_name} on {device}...")
+            model = AutoModel.from_pretrained(model_name, torch_dtype=DTYPES[dtype])
+            processor = AutoProcessor.from_pretrained(model_name)
+            model.to(device)
+            model.eval()
+            return model, processor, processor.tokenizer
+
+        return self._get_or_load(key, load)
+
+    def stats(self) -> List[Dict]:
+        """Statistics for every loaded handle."""
+        with self._lock:
+            return [handle.stats() for handle in self._handles.values()]
+
+    def print_report(self):
+        """Print a short summary of the loaded models."""
+        print("Model registry:")
+        for item in self.stats():
+            rss = f"{item['rss_delta_mb']:.1f} MB" if item['rss_delta_mb'] is not None else "n/a"
+            print(
+                f"  {item['model_name']} ({item['pretrained']}, {item['device']}, {item['dtype']}): "
+                f"load {item['load_seconds']:.2f}s, weights {item['model_memory_mb']:.1f} MB, "
+                f"RSS +{rss}, shared by {item['requests']} component(s)"
+            )
+
+    def clear(self):
+        """Drop all cached handles so their memory can be reclaimed."""
+        with self._lock:
+            self._handles.clear()
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    return _registry
+
+
+def clip_model_id(model_name: str, pretrained: str, dtype: str = "float32") -> str:
+    """Identity string for a CLIP encoder, used to key cached embeddings."""
+    return f"open_clip:{model_name}:{pretrained}:{dtype}"
+
+
+def siglip_model_id(model_name: str, dtype: str = "float32") -> str:
+    """Identity string for a SigLIP encoder, used to key cached embeddings."""
+    return f"hf:{model_name}:{dtype}"
+
+
+def get_clip_model(
+    model_name: str = "ViT-B/32",
+    pretrained: str = "openai",
+    device: str = "cpu",
+    dtype: str = "float32"
+) -> ModelHandle:
+    """Shortcut for the process-wide registry's CLIP loader."""
+    return _registry.get_clip(model_name, pretrained, device, dtype)
+
+
+def get_siglip_model(
+    model_name: str = "google/siglip2-base-patch16-224",
+    device: str = "cpu",
+    dtype: str = "float32"
+) -> ModelHandle:
+    """Shortcut for the process-wide registry's SigLIP loader."""
+    return _registry.get_siglip(model_name, device, dtype)
+
+
+if __name__ == "__main__":
+    # Loading the same model twice should hit the cache
+    first = get_clip_model(device="cpu")
+    second = get_clip_model(device="cpu")
+    print(f"Same instance: {first.model is second.model}")
+    get_registry().print_report()
@@ -6,6 +6,10 @@ from typing import List, Dict
 from openai import OpenAI
 import time
 
+from embedding_store import content_hash
+from response_cache import ResponseCache, response_cache_from_config
+from upload_prep import upload_preparer_from_config
+
 class OpenAILabelGenerator:
     """Generates semantic labels for properties using OpenAI's Vision API."""
     
@@ -30,11 +34,37 @@ class OpenAILabelGenerator:
              print("WARNING: system_prompt not found in config. Using fallback default.")
              # Fallback default prompt if config is missing
              self.system_prompt = "You are an expert real estate agent. Analyze these interior photos and generate at least 10 descriptive semantic tags (e.g., room types, features, style)."
+        
+        self.reasoning_effort = "low"
+        self.image_detail = "low"  # Use low detail for speed and cost efficiency
+        
+        # Images are downscaled to the detail tier's resolution before upload
+        self.upload_preparer = upload_preparer_from_config(
+            self.config.get('labeling', {}).get('upload', {}),
+            self.image_detail
+        )
+        
+        # Responses keyed on image content and prompt; bypass for real latency benchmarking
+        self.response_cache = response_cache_from_config(
+            self.config.get('labeling', {}).get('response_cache', {})
+        )
+    
+    def cache_key(self, image_paths: List[str]) -> str:
+        """Response cache key for a request over these images, in order."""
+        image_hashes = [content_hash(path) or path for path in image_paths]
+        return ResponseCache.make_key(
+            image_hashes,
+            self.model,
+            self.system_prompt,
+            reasoning_effort=self.reasoning_effort,
+            detail=self.image_detail,
+            upload_format=self.upload_preparer.image_format,
+            upload_quality=self.upload_preparer.quality
+        )
 
     def encode_image(self, image_path: str) -> str:
-        """Encode image to base64 string."""
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        """Encode image to base64 string, resized and re-encoded for upload."""
+        return base64.b64encode(self.upload_preparer.prepare(image_path).data).decode('utf-8')
 
     def generate_labels(self, image_paths: List[str]) -> Dict:
         """
@@ -53,6 +83,15 @@ class OpenAILabelGenerator:
         # We take evenly spaced images to get a good distribution
         selected_paths = image_paths
 
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.cache_key(selected_paths)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                print(f"  Using cached OpenAI response for {len(selected_paths)} images")
+                # Flagged so latency statistics can leave cache hits out
+                return {**cached, "cached": True}
+
         print(f"  Sending {len(selected_paths)} images to OpenAI ({self.model})...")
         
         messages = [
@@ -61,16 +100,27 @@ class OpenAILabelGenerator:
         
         user_content = [{"type": "input_text", "text": "Analyze these property images and provide semantic tags."}]
         
+        prep_start = time.time()
+        source_bytes = 0
+        request_bytes = 0
         for img_path in selected_paths:
             try:
-                base64_image = self.encode_image(img_path)
+                payload = self.upload_preparer.prepare(img_path)
+                image_url = payload.data_url
                 user_content.append({
                     "type": "input_image",
-                    "image_url": f"data:image/jpeg;base64,{base64_image}",
-                    "detail": "low" # Use low detail for speed and cost efficiency
+                    "image_url": image_url,
+                    "detail": self.image_detail
                 })
+                source_bytes += payload.source_bytes
+                request_bytes += len(image_url)
             except Exception as e:
                 print(f"  Warning: Could not encode {img_path}: {e}")
+        
+        print(
+            f"  Prepared images in {time.time() - prep_start:.2f}s: "
+            f"{source_bytes / 1024:.0f} KB on disk -> {request_bytes / 1024:.0f} KB in request"
+        )
                 
         messages.append({"role": "user", "content": user_content})
 
@@ -79,11 +129,11 @@ class OpenAILabelGenerator:
             response = self.client.responses.create(
                 model=self.model,
                 input=messages,
-                reasoning={ "effort": "low" },
+                reasoning={ "effort": self.reasoning_effort },
                 max_output_tokens=10000,
             )
             elapsed = time.time() - start_time
-            print(f"  OpenAI response received in {elapsed:.2f}s")
+            print(f"  OpenAI response received in {elapsed:.2f}s (upload and inference, {request_bytes / 1024:.0f} KB sent)")
            
             result_text = response.output_text.replace("\n", ",")
             print(f"  Raw response: {result_text}")
@@ -99,10 +149,16 @@ class OpenAILabelGenerator:
             # Remove empty strings
             tags = [t for t in tags if t]
             
-            return {
+            result = {
                 "labels": tags
             }
             
+            # Only cache usable answers, so a bad response is retried next time
+            if cache_key is not None and tags:
+                self.response_cache.put(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             print(f"  ERROR calling OpenAI API: {e}")
             import traceback
@@ -0,0 +1,128 @@
+"""
+On-disk cache for vision-language model responses.
+Entries are keyed by the ordered content hashes of the images sent plus
+everything else that shapes the answer (model, prompt, request options),
+expire after a TTL and are evicted oldest-first beyond a size budget.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def prompt_hash(text: str) -> str:
+    """SHA-256 of a prompt's text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """JSON file per response with TTL and size-based eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/openai_responses",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 50 * 1024 ** 2
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per response
+            ttl_seconds: Age after which an entry is treated as missing
+            max_bytes: Total size budget; the oldest entries are removed beyond it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_hashes: List[str], model: str, system_prompt: str, **options) -> str:
+        """Key from ordered image hashes, model, prompt hash and any request options."""
+        payload = {
+            'images': image_hashes,
+            'model': model,
+            'system_prompt': prompt_hash(system_prompt),
+            'options': options
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached response, or None if it is missing or expired."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.stats['misses'] += 1
+                return None
+
+            if time.time() - entry['created'] > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            self.stats['hits'] += 1
+            return entry['response']
+
+    def put(self, key: str, response: Dict):
+        """Store a response and evict old entries beyond the size budget."""
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'response': response}, f)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats['evictions'] += 1
+
+
+def response_cache_from_config(section: Dict) -> Optional[ResponseCache]:
+    """Cache as configured by a `response_cache` section, or None when bypassed."""
+    if section.get('bypass', False):
+        return None
+    return ResponseCache(
+        cache_dir=section.get('cache_dir', 'cache/openai_responses'),
+        ttl_seconds=section.get('ttl_hours', 168) * 3600,
+        max_bytes=int(section.get('max_size_mb', 50) * 1024 ** 2)
+    )
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, ttl_seconds=60, max_bytes=1024)
+        key = ResponseCache.make_key(["abc", "def"], "gpt-5-nano", "prompt", effort="low")
+        print(f"First lookup: {cache.get(key)}")
+        cache.put(key, {'labels': ["open plan", "natural lighting"]})
+        print(f"Second lookup: {cache.get(key)}")
+        print(f"Stats: {cache.stats}")
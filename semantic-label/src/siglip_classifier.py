@@ -4,10 +4,11 @@ Uses google/siglip2-base-patch16-224 for interior/exterior classification.
 """
 
 import torch
-from transformers import pipeline
-from PIL import Image
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+
+from siglip_engine import SigLIPEngine
+from embedding_store import EmbeddingStore
 
 
 class SigLIPSceneClassifier:
@@ -16,7 +17,10 @@ class SigLIPSceneClassifier:
     def __init__(
         self,
         model_name: str = "google/siglip2-base-patch16-224",
-        device: str = "cpu"
+        device: str = "cpu",
+        dtype: str = "float32",
+        embedding_store: Optional[EmbeddingStore] = None,
+        preprocess_workers: int = 4
     ):
         """
         Initialize SigLIP classifier.
@@ -24,18 +28,23 @@ class SigLIPSceneClassifier:
         Args:
             model_name: HuggingFace model identifier
             device: Device to run model on (cpu/cuda)
+            dtype: Model dtype name
+            embedding_store: Optional persistent image embedding cache
+            preprocess_workers: Threads used to decode and preprocess images
         """
         self.model_name = model_name
-        self.device = 0 if device == "cuda" else -1  # pipeline uses 0 for cuda, -1 for cpu
+        self.device = device
         
         print(f"Loading SigLIP model: {model_name} on {device}...")
         
         try:
-            # Initialize zero-shot image classification pipeline
-            self.pipeline = pipeline(
-                task="zero-shot-image-classification",
-                model=model_name,
-                device=self.device
+            # Direct model path: text prompts encoded once, one vision forward per batch
+            self.engine = SigLIPEngine(
+                model_name=model_name,
+                device=device,
+                dtype=dtype,
+                embedding_store=embedding_store,
+                preprocess_workers=preprocess_workers
             )
             
             # Define scene classification labels (same as CLIP)
@@ -45,6 +54,7 @@ class SigLIPSceneClassifier:
                 "a photo of an exterior building",
                 "a photo of outdoor scenery",
             ]
+            self.text_features = self.engine.encode_texts(self.candidate_labels)
             
             print("✓ SigLIP model loaded successfully!")
             
@@ -53,6 +63,18 @@ class SigLIPSceneClassifier:
             print("Make sure to install: pip install transformers pillow torch")
             raise
     
+    def _classify_features(self, image_features: torch.Tensor) -> List[Tuple[str, float]]:
+        """Map image embeddings to (label, confidence) using the cached prompt embeddings."""
+        probs = self.engine.probabilities(self.engine.logits(image_features, self.text_features))
+        top_scores, top_indices = probs.max(dim=-1)
+        
+        results = []
+        for top_label_idx, score in zip(top_indices.tolist(), top_scores.tolist()):
+            # Interior if index 0 or 1 (same logic as CLIP)
+            label = "interior" if top_label_idx <= 1 else "exterior"
+            results.append((label, float(score)))
+        return results
+    
     def classify_single_image(self, image_path: str) -> Tuple[str, float]:
         """
         Classify a single image as interior or exterior.
@@ -64,21 +86,11 @@ class SigLIPSceneClassifier:
             Tuple of (label, confidence)
         """
         try:
-            # Load image
-            image = Image.open(image_path).convert('RGB')
-            
-            # Run classification
-            results = self.pipeline(image, candidate_labels=self.candidate_labels)
-            
-            # Get top prediction
-            top_result = results[0]
-            top_label_idx = self.candidate_labels.index(top_result['label'])
+            image_features, loaded = self.engine.encode_images([image_path])
+            if not loaded:
+                raise ValueError("image could not be loaded")
             
-            # Interior if index 0 or 1 (same logic as CLIP)
-            label = "interior" if top_label_idx <= 1 else "exterior"
-            confidence = top_result['score']
-            
-            return label, confidence
+            return self._classify_features(image_features)[0]
             
         except Exception as e:
             print(f"Error classifying {image_path}: {e}")
@@ -99,55 +111,14 @@ class SigLIPSceneClassifier:
         Returns:
             List of (label, confidence) tuples
         """
-        results = []
+        results = [("exterior", 0.0)] * len(image_paths)
         
-        for i in range(0, len(image_paths), batch_size):
-            batch_paths = image_paths[i:i + batch_size]
-            
-            # Load images
-            images = []
-            valid_indices = []
-            
-            for idx, path in enumerate(batch_paths):
-                try:
-                    img = Image.open(path).convert('RGB')
-                    images.append(img)
-                    valid_indices.append(idx)
-                except Exception as e:
-                    print(f"Error loading {path}: {e}")
-            
-            if not images:
-                # All images failed to load
-                results.extend([("exterior", 0.0)] * len(batch_paths))
-                continue
-            
-            # Process batch
-            batch_results_raw = self.pipeline(
-                images,
-                candidate_labels=self.candidate_labels,
-                batch_size=len(images)
-            )
-            
-            # Process results
-            batch_results = []
-            for img_results in batch_results_raw:
-                # Get top prediction for this image
-                top_result = img_results[0]
-                top_label_idx = self.candidate_labels.index(top_result['label'])
-                
-                # Interior if index 0 or 1
-                label = "interior" if top_label_idx <= 1 else "exterior"
-                confidence = top_result['score']
-                batch_results.append((label, confidence))
-            
-            # Insert results at correct positions
-            result_idx = 0
-            for idx in range(len(batch_paths)):
-                if idx in valid_indices:
-                    results.append(batch_results[result_idx])
-                    result_idx += 1
-                else:
-                    results.append(("exterior", 0.0))
+        # One vision forward per batch; images that fail to load stay "exterior"
+        image_features, loaded = self.engine.encode_images(image_paths, batch_size=batch_size)
+        
+        if loaded:
+            for idx, result in zip(loaded, self._classify_features(image_features)):
+                results[idx] = result
         
         return results
     
@@ -0,0 +1,172 @@
+"""
+Direct SigLIP scoring engine.
+Replaces the transformers zero-shot pipeline with cached text embeddings,
+batched image encoding and a single similarity matmul per batch.
+"""
+
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from model_registry import DTYPES, get_siglip_model
+from embedding_store import EmbeddingStore
+from image_store import load_rgb
+
+
+class SigLIPEngine:
+    """Scores images against candidate texts with a shared SigLIP model."""
+
+    def __init__(
+        self,
+        model_name: str = "google/siglip2-base-patch16-224",
+        device: str = "cpu",
+        dtype: str = "float32",
+        hypothesis_template: str = "This is a photo of {}.",
+        embedding_store: Optional[EmbeddingStore] = None,
+        preprocess_workers: int = 4
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            model_name: HuggingFace model identifier
+            device: Device to run model on (cpu/cuda)
+            dtype: Model dtype name (see model_registry.DTYPES)
+            hypothesis_template: Prompt template, same default as the zero-shot pipeline
+            embedding_store: Optional persistent image embedding cache
+            preprocess_workers: Threads used to decode and preprocess images
+        """
+        self.device = device
+        self.dtype = DTYPES[dtype]
+        self.hypothesis_template = hypothesis_template
+        self.embedding_store = embedding_store
+        self.preprocess_workers = preprocess_workers
+
+        handle = get_siglip_model(model_name, device, dtype)
+        self.model = handle.model
+        self.processor = handle.preprocess
+        self.tokenizer = handle.tokenizer
+
+        # SigLIP scores each label independently (sigmoid); CLIP-style models use softmax
+        self.uses_sigmoid = "siglip" in self.model.config.model_type
+        self.embed_dim = (
+            getattr(self.model.config, 'projection_dim', None)
+            or self.model.config.text_config.hidden_size
+        )
+        self._text_cache: Dict[str, torch.Tensor] = {}
+
+    def encode_texts(self, labels: List[str]) -> torch.Tensor:
+        """Encode candidate labels once; later calls reuse the cached embeddings."""
+        missing = [label for label in dict.fromkeys(labels) if label not in self._text_cache]
+
+        if missing:
+            prompts = [self.hypothesis_template.format(label) for label in missing]
+            if self.uses_sigmoid:
+                # SigLIP was trained on max_length padding, as the pipeline does
+                text_inputs = self.tokenizer(
+                    prompts, padding="max_length", max_length=64, truncation=True, return_tensors="pt"
+                )
+            else:
+                text_inputs = self.tokenizer(prompts, padding=True, return_tensors="pt")
+
+            with torch.no_grad():
+                text_features = self.model.get_text_features(**text_inputs.to(self.device))
+                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+
+            for label, features in zip(missing, text_features):
+                self._text_cache[label] = features
+
+        return torch.stack([self._text_cache[label] for label in labels])
+
+    def load_image(self, image_path: str) -> torch.Tensor:
+        """Load and preprocess a single image into pixel values [3, H, W]."""
+        image = load_rgb(image_path)
+        return self.processor(images=image, return_tensors="pt")['pixel_values'][0]
+
+    def _try_load_image(self, image_path: str) -> Optional[torch.Tensor]:
+        try:
+            return self.load_image(image_path)
+        except Exception as e:
+            print(f"Error loading {image_path}: {e}")
+            return None
+
+    def preprocess_images(self, image_paths: List[str]) -> Tuple[Optional[torch.Tensor], List[int]]:
+        """
+        Decode and preprocess images in a thread pool into one contiguous batch tensor.
+
+        Returns:
+            Tuple of (pixel values [N, 3, H, W] or None, indices of loaded images)
+        """
+        if self.preprocess_workers > 1 and len(image_paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.preprocess_workers) as executor:
+                loaded = list(executor.map(self._try_load_image, image_paths))
+        else:
+            loaded = [self._try_load_image(path) for path in image_paths]
+
+        loaded_indices = [idx for idx, pixels in enumerate(loaded) if pixels is not None]
+
+        if not loaded_indices:
+            return None, loaded_indices
+
+        return torch.stack([loaded[idx] for idx in loaded_indices]), loaded_indices
+
+    def _encode_uncached(self, image_paths: List[str]) -> Tuple[torch.Tensor, List[int]]:
+        """Run one vision forward over the images. Returns (features, indices of loaded images)."""
+        pixel_values, loaded_indices = self.preprocess_images(image_paths)
+
+        if pixel_values is None:
+            return torch.empty(0, self.embed_dim, dtype=self.dtype, device=self.device), loaded_indices
+
+        with torch.no_grad():
+            image_features = self.model.get_image_features(
+                pixel_values=pixel_values.to(self.device, dtype=self.dtype)
+            )
+            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+
+        return image_features, loaded_indices
+
+    def encode_images(
+        self,
+        image_paths: List[str],
+        batch_size: int = 16
+    ) -> Tuple[torch.Tensor, List[int]]:
+        """
+        Encode images in batches, reusing stored embeddings when available.
+
+        Returns:
+            Tuple of (normalized features [N_loaded, D], indices of loaded images)
+        """
+        all_features = []
+        all_indices = []
+
+        for i in range(0, len(image_paths), batch_size):
+            batch_paths = image_paths[i:i + batch_size]
+
+            if self.embedding_store is not None:
+                features, loaded = self.embedding_store.encode(batch_paths, self._encode_uncached)
+                features = torch.from_numpy(features).to(self.device, dtype=self.dtype)
+            else:
+                features, loaded = self._encode_uncached(batch_paths)
+
+            if loaded:
+                all_features.append(features)
+                all_indices.extend(i + idx for idx in loaded)
+
+        if not all_features:
+            return torch.empty(0, self.embed_dim, dtype=self.dtype, device=self.device), []
+
+        return torch.cat(all_features, dim=0), all_indices
+
+    def logits(self, image_features: torch.Tensor, text_features: torch.Tensor) -> torch.Tensor:
+        """Image-text logits [num_images, num_texts], as computed by the model's forward."""
+        with torch.no_grad():
+            logits = (image_features @ text_features.T) * self.model.logit_scale.exp()
+            if getattr(self.model, 'logit_bias', None) is not None:
+                logits = logits + self.model.logit_bias
+        return logits
+
+    def probabilities(self, logits: torch.Tensor) -> torch.Tensor:
+        """Per-label probabilities over the last dimension (sigmoid or softmax)."""
+        if self.uses_sigmoid:
+            return torch.sigmoid(logits)
+        return logits.softmax(dim=-1)
@@ -4,13 +4,15 @@ Uses zero-shot image classification with probability-based filtering.
 """
 
 import torch
-from transformers import pipeline
-from PIL import Image
 from pathlib import Path
 from typing import List, Dict, Tuple
 import yaml
 import numpy as np
 
+from siglip_engine import SigLIPEngine
+from model_registry import siglip_model_id
+from embedding_store import embedding_store_from_config
+
 
 class SigLIPLabelGenerator:
     """Generate semantic labels using SigLIP zero-shot classification."""
@@ -19,7 +21,8 @@ class SigLIPLabelGenerator:
         self,
         config_path: str = "../config.yaml",
         model_name: str = "google/siglip2-base-patch16-224",
-        device: str = "cpu"
+        device: str = "cpu",
+        dtype: str = "float32"
     ):
         """
         Initialize SigLIP label generator.
@@ -28,20 +31,23 @@ class SigLIPLabelGenerator:
             config_path: Path to config file
             model_name: HuggingFace model identifier
             device: Device to run model on
+            dtype: Model dtype name
         """
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
-        self.device = 0 if device == "cuda" else -1
+        self.device = device
         self.model_name = model_name
         
         print(f"Loading SigLIP model for label generation: {model_name}...")
         
-        # Initialize zero-shot classification pipeline
-        self.pipeline = pipeline(
-            task="zero-shot-image-classification",
-            model=model_name,
-            device=self.device
+        # Direct model path shared with the scene classifier via the model registry
+        self.engine = SigLIPEngine(
+            model_name=model_name,
+            device=device,
+            dtype=dtype,
+            embedding_store=embedding_store_from_config(self.config, siglip_model_id(model_name, dtype)),
+            preprocess_workers=self.config.get('optimization', {}).get('parallel_workers', 4)
         )
         
         # Load label vocabularies from config
@@ -55,11 +61,17 @@ class SigLIPLabelGenerator:
         # Create full candidate label list
         self.all_labels = []
         self.label_to_category = {}
+        self.category_slices = {}
         
         for category, labels in self.label_vocab.items():
+            start = len(self.all_labels)
             for label in labels:
                 self.all_labels.append(label)
                 self.label_to_category[label] = category
+            self.category_slices[category] = slice(start, len(self.all_labels))
+        
+        # Pre-encode the whole vocabulary once
+        self.label_embeddings = self.engine.encode_texts(self.all_labels)
         
         print(f"✓ Loaded {len(self.all_labels)} candidate labels from {len(self.label_vocab)} categories")
     
@@ -76,19 +88,54 @@ class SigLIPLabelGenerator:
             candidate_labels: List of candidate label strings
             
         Returns:
-            List of dicts with 'label' and 'score'
+            List of dicts with 'label' and 'score', sorted by score
         """
-        try:
-            image = Image.open(image_path).convert('RGB')
-            results = self.pipeline(image, candidate_labels=candidate_labels)
-            return results
-        except Exception as e:
-            print(f"Error classifying {image_path}: {e}")
+        image_features, loaded = self.engine.encode_images([image_path])
+        if not loaded:
+            print(f"Error classifying {image_path}")
             return []
+        
+        text_features = self.engine.encode_texts(candidate_labels)
+        probs = self.engine.probabilities(self.engine.logits(image_features, text_features))[0]
+        
+        results = [
+            {'label': label, 'score': float(score)}
+            for label, score in zip(candidate_labels, probs.float().cpu().numpy())
+        ]
+        results.sort(key=lambda x: x['score'], reverse=True)
+        return results
+    
+    def score_categories(self, image_paths: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Score every category in one pass over the images.
+        
+        Each image batch is encoded once and scored against the whole vocabulary
+        with a single matmul; probabilities are then taken per category.
+        
+        Returns:
+            Dictionary mapping category to probabilities [num_loaded_images, num_labels]
+        """
+        image_features, loaded = self.engine.encode_images(
+            image_paths,
+            batch_size=self.config['model']['batch_size']
+        )
+        
+        if not loaded:
+            return {
+                category: np.zeros((0, len(labels)))
+                for category, labels in self.label_vocab.items()
+            }
+        
+        logits = self.engine.logits(image_features, self.label_embeddings)
+        
+        return {
+            category: self.engine.probabilities(logits[:, label_slice]).float().cpu().numpy()
+            for category, label_slice in self.category_slices.items()
+        }
     
     def extract_labels_from_category(
         self,
-        image_paths: List[str],
+        category_probs: np.ndarray,
         category: str,
         top_k: int = 3,
         threshold: float = 0.2
@@ -97,7 +144,7 @@ class SigLIPLabelGenerator:
         Extract top-k labels from a specific category across all images.
         
         Args:
-            image_paths: List of interior image paths
+            category_probs: Probabilities [num_images, num_labels] for this category
             category: Category name ('room_types', 'style', 'features', 'condition')
             top_k: Maximum number of labels to return
             threshold: Minimum probability threshold
@@ -110,26 +157,15 @@ class SigLIPLabelGenerator:
         if not candidate_labels:
             return []
         
-        # Accumulate probabilities across all images
-        label_scores = {label: [] for label in candidate_labels}
+        # Calculate mean probability for each label across images
+        if category_probs.shape[0] > 0:
+            mean_probs = category_probs.mean(axis=0)
+        else:
+            mean_probs = np.zeros(len(candidate_labels))
         
-        for image_path in image_paths:
-            results = self.classify_image_with_labels(image_path, candidate_labels)
-            
-            # Store scores for each label
-            for result in results:
-                label = result['label']
-                score = result['score']
-                if label in label_scores:
-                    label_scores[label].append(score)
-        
-        # Calculate mean probability for each label
         mean_scores = {}
-        for label, scores in label_scores.items():
-            if scores:
-                mean_scores[label] = np.mean(scores)
-            else:
-                mean_scores[label] = 0.0
+        for label, score in zip(candidate_labels, mean_probs):
+            mean_scores[label] = float(score)
         
         # Sort by mean score and filter by threshold
         sorted_labels = sorted(
@@ -183,18 +219,21 @@ class SigLIPLabelGenerator:
         threshold = 0.0005  # SigLIP scores are typically 0.001-0.01 range
         max_per_category = self.config['labeling']['max_labels_per_category']
         
+        # Encode images once and score all categories together
+        category_probs = self.score_categories(image_paths)
+        
         labels_by_category = {
             'room_types': self.extract_labels_from_category(
-                image_paths, 'room_types', top_k=max_per_category, threshold=threshold
+                category_probs['room_types'], 'room_types', top_k=max_per_category, threshold=threshold
             ),
             'style': self.extract_labels_from_category(
-                image_paths, 'style', top_k=max_per_category, threshold=threshold
+                category_probs['style'], 'style', top_k=max_per_category, threshold=threshold
             ),
             'features': self.extract_labels_from_category(
-                image_paths, 'features', top_k=max_per_category * 2, threshold=threshold
+                category_probs['features'], 'features', top_k=max_per_category * 2, threshold=threshold
             ),
             'condition': self.extract_labels_from_category(
-                image_paths, 'condition', top_k=2, threshold=threshold
+                category_probs['condition'], 'condition', top_k=2, threshold=threshold
             ),
         }
         
@@ -0,0 +1,178 @@
+"""
+Prepares property photos for upload to the OpenAI label generator.
+Each photo is resized to the resolution of the requested detail tier and
+re-encoded as JPEG or WebP. Encoded payloads are cached on disk, and the
+most recent ones also in memory, so repeated runs over a property do not
+decode and re-encode its photos again.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from embedding_store import content_hash
+
+
+MIME_TYPES = {
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+
+def detail_target_size(width: int, height: int, detail: str) -> Tuple[int, int]:
+    """
+    Size the API would downscale an image to for a detail tier.
+    "low" fits into 512x512; "high" fits into 2048x2048, then scales the
+    shorter side down to 768. Images are never upscaled.
+    """
+    if detail == "low":
+        scale = min(1.0, 512 / max(width, height))
+    else:
+        scale = min(1.0, 2048 / max(width, height))
+        short_side = min(width, height) * scale
+        if short_side > 768:
+            scale *= 768 / short_side
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class ImagePayload:
+    """An encoded image ready to send, with size and preparation time."""
+
+    def __init__(self, data: bytes, mime_type: str, source_bytes: int, prep_seconds: float, cached: bool):
+        self.data = data
+        self.mime_type = mime_type
+        self.source_bytes = source_bytes
+        self.prep_seconds = prep_seconds
+        self.cached = cached
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('utf-8')}"
+
+    @property
+    def num_bytes(self) -> int:
+        return len(self.data)
+
+
+class UploadPreparer:
+    """Resize and re-encode images for a detail tier, caching the results."""
+
+    def __init__(
+        self,
+        detail: str = "low",
+        image_format: str = "jpeg",
+        quality: int = 85,
+        cache_dir: Optional[str] = "cache/upload_payloads",
+        max_memory_items: int = 256
+    ):
+        """
+        Initialize the preparer.
+
+        Args:
+            detail: API detail tier ("low" or "high") the images are sent with
+            image_format: Upload encoding ("jpeg" or "webp")
+            quality: Encoder quality (1-100)
+            cache_dir: Directory for encoded payloads, or None for in-memory caching only
+            max_memory_items: Payloads kept in memory (least recently used are dropped)
+        """
+        if image_format not in MIME_TYPES:
+            raise ValueError(f"Unsupported upload format: {image_format}")
+
+        self.detail = detail
+        self.image_format = image_format
+        self.quality = quality
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.stats = {'hits': 0, 'misses': 0}
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.image_format]
+
+    def _key(self, image_path: str) -> str:
+        source = content_hash(image_path) or str(image_path)
+        settings = f"{source}:{self.detail}:{self.image_format}:{self.quality}"
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Resize an image for the detail tier and encode it."""
+        image = image.convert('RGB')
+        size = detail_target_size(image.width, image.height, self.detail)
+        if size != image.size:
+            image = image.resize(size, Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format=self.image_format.upper(), quality=self.quality)
+        return buffer.getvalue()
+
+    def prepare(self, image_path: str) -> ImagePayload:
+        """Encoded payload for an image, from cache when available."""
+        start_time = time.time()
+        source_bytes = Path(image_path).stat().st_size
+        key = self._key(image_path)
+        cache_path = self.cache_dir / f"{key}.{self.image_format}" if self.cache_dir else None
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is None and cache_path is not None and cache_path.exists():
+            data = cache_path.read_bytes()
+
+        cached = data is not None
+        if not cached:
+            with Image.open(image_path) as image:
+                data = self.encode(image)
+            if cache_path is not None:
+                cache_path.write_bytes(data)
+
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+            self.stats['hits' if cached else 'misses'] += 1
+
+        return ImagePayload(data, self.mime_type, source_bytes, time.time() - start_time, cached)
+
+
+def upload_preparer_from_config(section: Dict, detail: str) -> UploadPreparer:
+    """Preparer for a detail tier as configured by an `upload` section."""
+    return UploadPreparer(
+        detail=detail,
+        image_format=section.get('format', 'jpeg'),
+        quality=section.get('quality', 85),
+        cache_dir=section.get('cache_dir', 'cache/upload_payloads'),
+        max_memory_items=section.get('memory_items', 256)
+    )
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = Path(tmp) / "listing.jpg"
+        Image.new('RGB', (4032, 3024), color=(180, 160, 140)).save(image_path, quality=95)
+
+        for detail in ["low", "high"]:
+            preparer = UploadPreparer(detail=detail, cache_dir=str(Path(tmp) / "payloads"))
+            first = preparer.prepare(str(image_path))
+            second = preparer.prepare(str(image_path))
+            with Image.open(BytesIO(first.data)) as encoded:
+                print(
+                    f"{detail}: {first.source_bytes / 1024:.0f} KB -> {first.num_bytes / 1024:.0f} KB "
+                    f"{encoded.size}, {first.prep_seconds * 1000:.0f} ms, "
+                    f"cached re-prepare {second.prep_seconds * 1000:.1f} ms"
+                )